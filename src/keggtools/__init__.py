@@ -17,9 +17,11 @@ from keggtools.const import (
     XENOBIOTICS_BIODEGRADATION_AND_METABOLISM,
 )
 from keggtools.models import Component, Entry, Graphics, Pathway, Relation, Subtype
+from keggtools.organism import Organism, OrganismIndex
 from keggtools.render import Renderer, render_overlay_image
-from keggtools.resolver import Resolver
-from keggtools.storage import Storage
+from keggtools.resolver import AsyncResolver, Resolver
+from keggtools.storage import BaseStorage, SQLiteStorage, Storage
+from keggtools.transport import HTTPTransport, LocalTransport, RecordingTransport, Transport
 from keggtools.utils import ColorGradient, msig_to_kegg_id
 
 __all__ = [
@@ -46,9 +48,18 @@ __all__ = [
     "Pathway",
     "Relation",
     "Subtype",
+    "Organism",
+    "OrganismIndex",
     "Renderer",
     "Resolver",
+    "AsyncResolver",
+    "BaseStorage",
     "Storage",
+    "SQLiteStorage",
+    "Transport",
+    "HTTPTransport",
+    "LocalTransport",
+    "RecordingTransport",
     "ColorGradient",
     "msig_to_kegg_id",
     "plot_enrichment_result",
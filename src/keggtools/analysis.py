@@ -4,7 +4,7 @@ import math
 import os
 from csv import DictWriter
 from io import IOBase
-from typing import Any
+from typing import Any, NamedTuple
 
 import matplotlib.pyplot as plt
 from matplotlib.axes import Axes
@@ -108,6 +108,16 @@ class EnrichmentResult:
         ]
 
 
+class _GeneSet(NamedTuple):
+    """Genes of a pathway to test for enrichment."""
+
+    org: str
+    pathway_id: str
+    pathway_name: str
+    pathway_title: str | None
+    genes: list[str]
+
+
 class Enrichment:
     """KEGG pathway enrichment analysis."""
 
@@ -125,6 +135,41 @@ class Enrichment:
         # Create pathway list
         self.all_pathways: list[Pathway] = pathways
 
+        # Genes of pathways without KGML pathways. If None, genes are listed from `all_pathways`.
+        self._gene_sets: list[_GeneSet] | None = None
+
+    @classmethod
+    def from_gene_sets(
+        cls,
+        org: str,
+        gene_sets: dict[str, list[str]],
+        titles: dict[str, str] | None = None,
+    ) -> "Enrichment":
+        """Init KEGG pathway enrichment analysis from genes of pathways without KGML pathways.
+
+        :param str org: Organism identifier used by KEGG database (3 letter code, e.g. "mmu" for mus musculus).
+        :param typing.Dict[str, typing.List[str]] gene_sets: Dict of pathway number to gene ids, e.g. from \
+            `keggtools.resolver.Resolver.get_pathway_gene_sets`.
+        :param typing.Optional[typing.Dict[str, str]] titles: Titles of pathways by pathway name \
+            ("path:<org><number>"), e.g. from `keggtools.resolver.Resolver.get_pathway_list`.
+        :return: Enrichment analysis instance.
+        :rtype: Enrichment
+        """
+        enrichment: Enrichment = cls(pathways=[])
+
+        enrichment._gene_sets = [
+            _GeneSet(
+                org=org,
+                pathway_id=pathway_id,
+                pathway_name=f"path:{org}{pathway_id}",
+                pathway_title=titles.get(f"path:{org}{pathway_id}") if titles is not None else None,
+                genes=list(dict.fromkeys(genes)),
+            )
+            for pathway_id, genes in gene_sets.items()
+        ]
+
+        return enrichment
+
     def _check_analysis_result_exist(self) -> None:
         """Check if summary exists."""
         if not self.result or len(self.result) == 0:
@@ -161,25 +206,38 @@ class Enrichment:
         all_found_genes: int = 0
         absolute_pathway_genes: int = 0
         study_n: int = len(gene_list)
+        study_genes: set[str] = set(gene_list)
+
+        gene_sets: list[_GeneSet] = (
+            self._gene_sets
+            if self._gene_sets is not None
+            else [
+                _GeneSet(
+                    org=pathway.org,
+                    pathway_id=pathway.number,
+                    pathway_name=pathway.name,
+                    pathway_title=pathway.title,
+                    genes=list(pathway.get_genes()),
+                )
+                for pathway in self.all_pathways
+            ]
+        )
 
-        for pathway in self.all_pathways:
-            genes_found: list[str] = []
-            all_pathways_genes = pathway.get_genes()
+        for gene_set in gene_sets:
+            all_pathways_genes = gene_set.genes
             absolute_pathway_genes += len(all_pathways_genes)
 
             # Check for intersection between gene list and genes in pathway
-            for gene_id in all_pathways_genes:
-                if gene_id in gene_list:
-                    genes_found.append(gene_id)
+            genes_found: list[str] = [gene_id for gene_id in all_pathways_genes if gene_id in study_genes]
 
             all_found_genes += len(genes_found)
 
             # Create analysis results instance and append to list of results
             pathway_result: EnrichmentResult = EnrichmentResult(
-                org=pathway.org,
-                pathway_id=pathway.number,
-                pathway_name=pathway.name,
-                pathway_title=pathway.title,
+                org=gene_set.org,
+                pathway_id=gene_set.pathway_id,
+                pathway_name=gene_set.pathway_name,
+                pathway_title=gene_set.pathway_title,
                 found_genes=genes_found,
                 pathway_genes=all_pathways_genes,
             )
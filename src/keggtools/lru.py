@@ -0,0 +1,108 @@
+"""In-memory least recently used cache."""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any, Generic, TypeVar
+
+_V = TypeVar("_V")
+
+
+class LRUCache(Generic[_V]):
+    """Thread-safe bounded cache that evicts the least recently used item.
+
+    Each item is stored with a version, e.g. the time of modification of the file the item was parsed from. Lookups
+    with another version are misses and drop the outdated item.
+    """
+
+    def __init__(self, maxsize: int = 128) -> None:
+        """Init LRUCache instance.
+
+        :param int maxsize: Maximal number of items in cache. Set to 0 to disable the cache.
+        """
+        if maxsize < 0:
+            raise ValueError("Size of cache must not be negative.")
+
+        self.maxsize: int = maxsize
+
+        self._items: OrderedDict[Hashable, tuple[Any, _V]] = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+
+        # Counters of cache usage
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def __len__(self) -> int:
+        """Get number of items in cache."""
+        return len(self._items)
+
+    def get(self, key: Hashable, version: Any = None) -> _V | None:
+        """Get item from cache and mark it as recently used.
+
+        :param typing.Hashable key: Key of item.
+        :param typing.Any version: Expected version of item.
+        :return: Cached item or None if item is missing or outdated.
+        :rtype: typing.Optional[typing.Any]
+        """
+        with self._lock:
+            cached: tuple[Any, _V] | None = self._items.get(key)
+
+            if cached is None or cached[0] != version:
+                if cached is not None:
+                    del self._items[key]
+                self.misses += 1
+                return None
+
+            self._items.move_to_end(key)
+            self.hits += 1
+            return cached[1]
+
+    def put(self, key: Hashable, value: _V, version: Any = None) -> None:
+        """Add item to cache. Least recently used items are evicted if cache is full.
+
+        :param typing.Hashable key: Key of item.
+        :param typing.Any value: Item to cache.
+        :param typing.Any version: Version of item.
+        """
+        if self.maxsize == 0:
+            return
+
+        with self._lock:
+            self._items[key] = (version, value)
+            self._items.move_to_end(key)
+
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """Remove item from cache.
+
+        :param typing.Hashable key: Key of item.
+        """
+        with self._lock:
+            self._items.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all items from cache and reset counters."""
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> dict[str, int]:
+        """Get counters of cache usage.
+
+        :return: Dict with number of hits, misses, evictions, current size and maximal size of cache.
+        :rtype: typing.Dict[str, int]
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._items),
+                "maxsize": self.maxsize,
+            }
@@ -1,5 +1,12 @@
 """KEGG pathway models to parse object relational."""
 
+import io
+from collections.abc import Callable, Mapping
+from functools import lru_cache
+from typing import Any, Literal, NamedTuple, TypeVar
+from xml.etree import ElementTree
+
+from pydantic import PrivateAttr
 from pydantic_xml import BaseXmlModel, attr
 from pydantic_xml.element.element import SearchMode
 
@@ -11,6 +18,145 @@ from keggtools._types import (
     RelationTypeAlias,
 )
 
+_IndexT = TypeVar("_IndexT")
+
+
+class _IndexCache:
+    """Holder of lazily built lookup indexes of a model.
+
+    Indexes are derived from the fields of the model. All holders compare equal, so indexes do not affect equality of
+    models, and copies and pickles of a model start with an empty holder.
+    """
+
+    __slots__ = ("_state",)
+
+    def __init__(self) -> None:
+        """Init _IndexCache instance."""
+        # Key and index are replaced together, so concurrent readers never see a mismatching pair
+        self._state: tuple[Any, Any] | None = None
+
+    def __eq__(self, other: object) -> bool:
+        """Compare holders. Holders are always equal."""
+        return isinstance(other, _IndexCache)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __reduce__(self) -> tuple[type["_IndexCache"], tuple[()]]:
+        """Pickle and copy holder without indexes."""
+        return (_IndexCache, ())
+
+    def get(self, key: Any, build: Callable[[], _IndexT]) -> _IndexT:
+        """Get index. Index is built if it was not built yet or was built for another key.
+
+        :param typing.Any key: Key of current state of model, e.g. identity and version of indexed lists.
+        :param typing.Callable build: Function to build index.
+        :return: Index.
+        :rtype: typing.Any
+        """
+        state: tuple[Any, Any] | None = self._state
+
+        if state is not None and state[0] == key:
+            return state[1]
+
+        index: _IndexT = build()
+        self._state = (key, index)
+        return index
+
+    def clear(self) -> None:
+        """Drop built indexes."""
+        self._state = None
+
+
+class _VersionedList(list):
+    """List that counts its modifications.
+
+    Indexes built from the items of the list are checked against identity and version of the list in constant time.
+    Changes of attributes of the items are not counted.
+    """
+
+    __slots__ = ("version",)
+
+    def __init__(self, *args: Any) -> None:
+        """Init _VersionedList instance."""
+        super().__init__(*args)
+        self.version: int = 0
+
+    def _modified(self) -> None:
+        """Count modification of list."""
+        # Unpickled and copied lists are restored without init
+        self.version = getattr(self, "version", 0) + 1
+
+    def __setitem__(self, *args: Any) -> None:
+        """Set item and count modification."""
+        self._modified()
+        super().__setitem__(*args)
+
+    def __delitem__(self, *args: Any) -> None:
+        """Delete item and count modification."""
+        self._modified()
+        super().__delitem__(*args)
+
+    def __iadd__(self, *args: Any) -> Any:
+        """Extend list and count modification."""
+        self._modified()
+        return super().__iadd__(*args)
+
+    def __imul__(self, *args: Any) -> Any:
+        """Repeat list and count modification."""
+        self._modified()
+        return super().__imul__(*args)
+
+    def append(self, *args: Any) -> None:
+        """Append item and count modification."""
+        self._modified()
+        super().append(*args)
+
+    def extend(self, *args: Any) -> None:
+        """Extend list and count modification."""
+        self._modified()
+        super().extend(*args)
+
+    def insert(self, *args: Any) -> None:
+        """Insert item and count modification."""
+        self._modified()
+        super().insert(*args)
+
+    def pop(self, *args: Any) -> Any:
+        """Pop item and count modification."""
+        self._modified()
+        return super().pop(*args)
+
+    def remove(self, *args: Any) -> None:
+        """Remove item and count modification."""
+        self._modified()
+        super().remove(*args)
+
+    def clear(self) -> None:
+        """Clear list and count modification."""
+        self._modified()
+        super().clear()
+
+    def sort(self, *args: Any, **kwargs: Any) -> None:
+        """Sort list and count modification."""
+        self._modified()
+        super().sort(*args, **kwargs)
+
+    def reverse(self) -> None:
+        """Reverse list and count modification."""
+        self._modified()
+        super().reverse()
+
+
+@lru_cache(maxsize=8192)
+def _split_gene_ids(name: str) -> tuple[str, ...]:
+    """Split space separated KEGG identifiers of entry name into ids without database prefix.
+
+    :param str name: Name of entry, e.g. "mmu:12345 mmu:12346".
+    :return: Ids, e.g. ("12345", "12346").
+    :rtype: typing.Tuple[str, ...]
+    """
+    return tuple(value.split(":")[1] for value in name.split(" "))
+
 
 class Subtype(BaseXmlModel, tag="subtype"):
     """Subtype model class."""
@@ -78,7 +224,8 @@ class Entry(BaseXmlModel, tag="entry", search_mode=SearchMode.UNORDERED):
         """
         # TODO: validate return valid !!
         # r"^([a-z]){3}([0-9]){5}$"
-        return [value.split(":")[1] for value in self.name.split(" ")]
+        # Names are split once, entries of the same gene share the split ids
+        return list(_split_gene_ids(self.name))
 
 
 class Alt(BaseXmlModel, tag="alt"):
@@ -103,6 +250,9 @@ class Substrate(BaseXmlModel, tag="substrate"):
     alt: Alt | None = None
 
 
+_CompoundT = TypeVar("_CompoundT", Product, Substrate)
+
+
 class Reaction(BaseXmlModel, tag="reaction", search_mode=SearchMode.UNORDERED):
     """Reaction model."""
 
@@ -114,10 +264,26 @@ class Reaction(BaseXmlModel, tag="reaction", search_mode=SearchMode.UNORDERED):
     substrates: list[Substrate] = []
 
 
+class _PathwayIndex(NamedTuple):
+    """Lookup indexes of pathway."""
+
+    entries_by_id: dict[str, Entry]
+    entries_by_gene: dict[str, tuple[Entry, ...]]
+    outgoing: dict[str, tuple[Relation, ...]]
+    incoming: dict[str, tuple[Relation, ...]]
+
+    # Ids of entries by entry type, filled on first request
+    genes_by_type: dict[str, tuple[str, ...]]
+
+
 class Pathway(BaseXmlModel, tag="pathway", search_mode=SearchMode.UNORDERED):
     """KEGG Pathway object.
 
     The KEGG pathway object stores graphics information and related objects.
+
+    Lookups of entries and relations use indexes that are built on first use. Lists of entries and relations count
+    their modifications, so indexes are rebuilt after items are added, removed or replaced or after the lists are
+    replaced. Call `invalidate_indexes` after attributes of entries or relations were modified in place.
     """
 
     name: str = attr(name="name")
@@ -132,6 +298,69 @@ class Pathway(BaseXmlModel, tag="pathway", search_mode=SearchMode.UNORDERED):
     entries: list[Entry] = []
     reactions: list[Reaction] = []
 
+    _index: _IndexCache = PrivateAttr(default_factory=_IndexCache)
+
+    def _track_lists(self) -> None:
+        """Copy plain lists of entries and relations into lists that count their modifications."""
+        for name in ("entries", "relations"):
+            if not isinstance(self.__dict__[name], _VersionedList):
+                self.__dict__[name] = _VersionedList(self.__dict__[name])
+
+    def model_post_init(self, context: Any, /) -> None:
+        """Track modifications of indexed lists after init."""
+        self._track_lists()
+
+    def model_copy(self, *, update: Mapping[str, Any] | None = None, deep: bool = False) -> "Pathway":
+        """Copy pathway. Updated lists of entries and relations are copied to track their modifications.
+
+        :param typing.Optional[typing.Mapping[str, typing.Any]] update: Values to change in the copy.
+        :param bool deep: Create a deep copy.
+        :return: Copy of pathway.
+        :rtype: keggtools.models.Pathway
+        """
+        # Updated values are written to the copy without init or validation
+        copied: Pathway = super().model_copy(update=update, deep=deep)
+        copied._track_lists()
+        return copied
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Set attribute. Assigned lists of entries and relations are copied to track their modifications."""
+        if name in ("entries", "relations") and not isinstance(value, _VersionedList):
+            value = _VersionedList(value)
+        super().__setattr__(name, value)
+
+    @classmethod
+    def from_xml(
+        cls,
+        source: str | bytes,
+        context: dict[str, Any] | None = None,
+        empty_as_string: bool = False,
+        *,
+        engine: Literal["pydantic", "fast"] = "pydantic",
+        **kwargs: Any,
+    ) -> "Pathway":
+        """Parse KGML pathway.
+
+        The "fast" engine builds the models without validation while the document is parsed with ElementTree
+        iterparse. Output is identical to the "pydantic" engine for valid KGML files, but invalid values (like unknown
+        entry types) are not rejected. Use it for trusted data, e.g. files cached from the KEGG API.
+
+        :param typing.Union[str, bytes] source: KGML document.
+        :param typing.Optional[typing.Dict[str, typing.Any]] context: Validation context of pydantic-xml engine.
+        :param bool empty_as_string: Parse empty elements as empty strings with pydantic-xml engine.
+        :param str engine: Parser engine ("pydantic" or "fast").
+        :param typing.Any kwargs: Other arguments to pydantic-xml engine.
+        :return: Parsed Pathway instance.
+        :rtype: Pathway
+        """
+        if engine == "fast":
+            return _construct_pathway(source)
+
+        if engine != "pydantic":
+            raise ValueError(f"Parser engine must be 'pydantic' or 'fast'. Got '{engine}'.")
+
+        return super().from_xml(source, context=context, empty_as_string=empty_as_string, **kwargs)
+
     def get_entry_by_id(self, entry_id: str) -> Entry | None:
         """Get pathway Entry object by id.
 
@@ -139,39 +368,123 @@ class Pathway(BaseXmlModel, tag="pathway", search_mode=SearchMode.UNORDERED):
         :return: Returns Entry instance if id is found in Pathway. Otherwise returns None.
         :rtype: typing.Optional[Entry]
         """
-        for item in self.entries:
-            if item.id == entry_id:
-                return item
-        return None
+        return self._get_index().entries_by_id.get(entry_id)
 
-    def get_genes(self) -> list[str]:
-        """List all genes from pathway.
+    def get_entries_by_gene(self, gene_id: str) -> tuple[Entry, ...]:
+        """Get gene entries that contain gene.
+
+        :param str gene_id: KEGG id of gene without organism prefix, e.g. "19697".
+        :return: Entries of type gene in order of pathway.
+        :rtype: typing.Tuple[Entry, ...]
+        """
+        return self._get_index().entries_by_gene.get(gene_id, ())
 
-        :return: List of entry ids with type gene.
-        :rtype: typing.List[str]
+    def get_outgoing_relations(self, entry_id: str) -> tuple[Relation, ...]:
+        """Get relations that start at entry.
+
+        :param str entry_id: Id of Entry.
+        :return: Relations with `entry1` set to entry id in order of pathway.
+        :rtype: typing.Tuple[Relation, ...]
+        """
+        return self._get_index().outgoing.get(entry_id, ())
+
+    def get_incoming_relations(self, entry_id: str) -> tuple[Relation, ...]:
+        """Get relations that end at entry.
+
+        :param str entry_id: Id of Entry.
+        :return: Relations with `entry2` set to entry id in order of pathway.
+        :rtype: typing.Tuple[Relation, ...]
+        """
+        return self._get_index().incoming.get(entry_id, ())
+
+    def invalidate_indexes(self) -> None:
+        """Drop lookup indexes, e.g. after attributes of entries or relations were modified in place."""
+        self._index.clear()
+
+    def _get_index(self) -> _PathwayIndex:
+        """Get lookup indexes of entries and relations.
+
+        :return: Indexes of current entries and relations.
+        :rtype: _PathwayIndex
+        """
+        # Holder is read from storage of private attributes, which skips the slow attribute lookup of pydantic.
+        # Identity and modification count of lists are checked in constant time on every lookup.
+        index: _IndexCache = self.__pydantic_private__["_index"]  # ty: ignore[not-subscriptable]
+        entries: list[Entry] = self.__dict__["entries"]
+        relations: list[Relation] = self.__dict__["relations"]
+
+        # Lists set without init or assignment, e.g. by direct writes to the fields of the model
+        if not isinstance(entries, _VersionedList) or not isinstance(relations, _VersionedList):
+            self._track_lists()
+            entries = self.__dict__["entries"]
+            relations = self.__dict__["relations"]
+
+        return index.get(
+            key=(id(entries), entries.version, id(relations), relations.version),
+            build=self._build_index,
+        )
+
+    def _build_index(self) -> _PathwayIndex:
+        """Build lookup indexes of entries and relations.
+
+        :return: Indexes of current entries and relations.
+        :rtype: _PathwayIndex
         """
-        result: list[str] = []
+        entries_by_id: dict[str, Entry] = {}
+        entries_by_gene: dict[str, list[Entry]] = {}
+        outgoing: dict[str, list[Relation]] = {}
+        incoming: dict[str, list[Relation]] = {}
 
-        # Iterate of entries and get all gene type
-        # Keep list of genes unique
         for entry in self.entries:
-            if entry.type == "gene":
-                # Get name of entry (KEGG identifier)
-                # if " " in entry.name:
-                #     # Check if name contains a space, which indicates list of multiple identifier
-                #     splitted_entries: List[str] = entry.name.split(" ")
-                #     for single_entry in splitted_entries:
-                #         if single_entry not in result:
-                #             result.append(single_entry)
+            # First entry wins if ids are not unique
+            entries_by_id.setdefault(entry.id, entry)
 
-                # elif entry.name not in result:
-                #     result.append(entry.name)
+            if entry.type == "gene":
+                for gene_id in _split_gene_ids(entry.name):
+                    entries_by_gene.setdefault(gene_id, []).append(entry)
+
+        for relation in self.relations:
+            outgoing.setdefault(relation.entry1, []).append(relation)
+            incoming.setdefault(relation.entry2, []).append(relation)
+
+        return _PathwayIndex(
+            entries_by_id=entries_by_id,
+            entries_by_gene={key: tuple(value) for key, value in entries_by_gene.items()},
+            outgoing={key: tuple(value) for key, value in outgoing.items()},
+            incoming={key: tuple(value) for key, value in incoming.items()},
+            genes_by_type={},
+        )
+
+    def get_genes(self, entry_type: Literal["gene", "ortholog", "enzyme"] = "gene") -> tuple[str, ...]:
+        """List all genes from pathway.
 
-                for gene_id in entry.get_gene_id():
-                    if gene_id not in result:
-                        result.append(gene_id)
+        Ids are unique and in order of first occurrence. The result is cached until entries are changed (see
+        `invalidate_indexes`).
 
-        return result
+        :param str entry_type: Type of entries to list ids of, "gene" for organism specific pathways, "ortholog" for \
+            KO pathways and "enzyme" for EC pathways.
+        :return: Ids of entries with given type without database prefix, e.g. "19697", "K04345" or "2.7.11.1".
+        :rtype: typing.Tuple[str, ...]
+        """
+        if entry_type not in ("gene", "ortholog", "enzyme"):
+            raise ValueError(f"Entry type must be 'gene', 'ortholog' or 'enzyme'. Got '{entry_type}'.")
+
+        genes_by_type: dict[str, tuple[str, ...]] = self._get_index().genes_by_type
+        genes: tuple[str, ...] | None = genes_by_type.get(entry_type)
+
+        if genes is None:
+            # Keys of dict keep order of insertion and make ids unique in linear time
+            genes = tuple(
+                dict.fromkeys(
+                    gene_id
+                    for entry in self.entries
+                    if entry.type == entry_type
+                    for gene_id in _split_gene_ids(entry.name)
+                )
+            )
+            genes_by_type[entry_type] = genes
+
+        return genes
 
     # TODO: has to be implemented
     # def merge(self) -> "Pathway":
@@ -192,3 +505,197 @@ class Pathway(BaseXmlModel, tag="pathway", search_mode=SearchMode.UNORDERED):
     #     # TODO find duplicate entries in pathway
 
     #     return merged_pathway
+
+
+# Fast construction of models from trusted KGML. Fields are set like pydantic-xml sets them: attributes that are
+# present, the first matching child element of single sub-models and all matching child elements of lists.
+
+_GRAPHICS_INT_ATTRS: tuple[str, ...] = ("x", "y", "width", "height")
+
+
+def _attributes(element: ElementTree.Element) -> dict[str, Any]:
+    """Get copy of attributes of element as keyword arguments of a model.
+
+    :param xml.etree.ElementTree.Element element: Element.
+    :return: Attributes of element.
+    :rtype: typing.Dict[str, typing.Any]
+    """
+    return dict(element.attrib)
+
+
+def _unordered_children(children: list[tuple[str, Any]], fields: tuple[tuple[str, bool], ...]) -> list[list[Any]]:
+    """Find children of fields like the unordered search mode of pydantic-xml.
+
+    pydantic-xml searches the children of each field in order of the fields and swaps each match to the front of the
+    unsearched children. Matches are returned in the same order, so parsed lists are identical to pydantic-xml.
+
+    :param typing.List[typing.Tuple[str, typing.Any]] children: Tag and item (e.g. element or built model) of each \
+        child element in document order. List is reordered.
+    :param typing.Tuple[typing.Tuple[str, bool], ...] fields: Tag of each field and True if field is a list.
+    :return: Items of matching children per field.
+    :rtype: typing.List[typing.List[typing.Any]]
+    """
+    cursor: int = 0
+    result: list[list[Any]] = []
+
+    for tag, many in fields:
+        matches: list[Any] = []
+        index: int = cursor
+
+        while index < len(children):
+            if children[index][0] == tag:
+                # Element at cursor is not a match and takes the place of the match
+                children[cursor], children[index] = children[index], children[cursor]
+                matches.append(children[cursor][1])
+                cursor += 1
+
+                if many is False:
+                    break
+
+            index += 1
+
+        result.append(matches)
+
+    return result
+
+
+def _construct_graphics(element: ElementTree.Element) -> Graphics:
+    """Build Graphics model from element without validation.
+
+    :param xml.etree.ElementTree.Element element: Graphics element.
+    :return: Graphics instance.
+    :rtype: Graphics
+    """
+    values: dict[str, Any] = _attributes(element)
+
+    for key in _GRAPHICS_INT_ATTRS:
+        if key in values:
+            values[key] = int(values[key])
+
+    return Graphics.model_construct(**values)
+
+
+def _construct_entry(element: ElementTree.Element) -> Entry:
+    """Build Entry model from element without validation.
+
+    :param xml.etree.ElementTree.Element element: Entry element.
+    :return: Entry instance.
+    :rtype: Entry
+    """
+    values: dict[str, Any] = _attributes(element)
+    graphics, components = _unordered_children(
+        [(child.tag, child) for child in element], (("graphics", False), ("component", True))
+    )
+
+    if len(graphics) > 0:
+        values["graphics"] = _construct_graphics(graphics[0])
+    if len(components) > 0:
+        values["components"] = [Component.model_construct(**_attributes(child)) for child in components]
+
+    return Entry.model_construct(**values)
+
+
+def _construct_relation(element: ElementTree.Element) -> Relation:
+    """Build Relation model from element without validation.
+
+    :param xml.etree.ElementTree.Element element: Relation element.
+    :return: Relation instance.
+    :rtype: Relation
+    """
+    values: dict[str, Any] = _attributes(element)
+    subtypes: list[Subtype] = [Subtype.model_construct(**_attributes(child)) for child in element.iterfind("subtype")]
+
+    if len(subtypes) > 0:
+        values["subtypes"] = subtypes
+
+    return Relation.model_construct(**values)
+
+
+def _construct_compound(element: ElementTree.Element, model: type[_CompoundT]) -> _CompoundT:
+    """Build Product or Substrate model from element without validation.
+
+    :param xml.etree.ElementTree.Element element: Product or substrate element.
+    :param type model: Model class to build.
+    :return: Model instance.
+    :rtype: typing.Union[Product, Substrate]
+    """
+    values: dict[str, Any] = _attributes(element)
+    alt: ElementTree.Element | None = element.find("alt")
+
+    if alt is not None:
+        values["alt"] = Alt.model_construct(**_attributes(alt))
+
+    return model.model_construct(**values)
+
+
+def _construct_reaction(element: ElementTree.Element) -> Reaction:
+    """Build Reaction model from element without validation.
+
+    :param xml.etree.ElementTree.Element element: Reaction element.
+    :return: Reaction instance.
+    :rtype: Reaction
+    """
+    values: dict[str, Any] = _attributes(element)
+    products, substrates = _unordered_children(
+        [(child.tag, child) for child in element], (("product", True), ("substrate", True))
+    )
+
+    if len(products) > 0:
+        values["products"] = [_construct_compound(child, Product) for child in products]
+    if len(substrates) > 0:
+        values["substrates"] = [_construct_compound(child, Substrate) for child in substrates]
+
+    return Reaction.model_construct(**values)
+
+
+# Builders of models of child elements of pathway
+_PATHWAY_CHILDREN: dict[str, Callable[[ElementTree.Element], Any]] = {
+    "relation": _construct_relation,
+    "entry": _construct_entry,
+    "reaction": _construct_reaction,
+}
+
+
+def _construct_pathway(source: str | bytes) -> Pathway:
+    """Build Pathway model from KGML document without validation.
+
+    The document is parsed incrementally. Models of relations, entries and reactions are built when their element is
+    complete and the element is cleared, so the element tree of the document is never held as a whole.
+
+    :param typing.Union[str, bytes] source: KGML document.
+    :return: Pathway instance.
+    :rtype: Pathway
+    """
+    data: bytes = source.encode(encoding="utf-8") if isinstance(source, str) else source
+
+    values: dict[str, Any] = {}
+    children: list[tuple[str, Any]] = []
+    depth: int = 0
+
+    for event, element in ElementTree.iterparse(io.BytesIO(data), events=("start", "end")):
+        if event == "start":
+            if depth == 0:
+                values = _attributes(element)
+            depth += 1
+            continue
+
+        depth -= 1
+
+        # Child of pathway element is complete
+        if depth == 1:
+            build: Callable[[ElementTree.Element], Any] | None = _PATHWAY_CHILDREN.get(element.tag)
+            children.append((element.tag, build(element) if build is not None else None))
+            element.clear()
+
+    relations, entries, reactions = _unordered_children(
+        children, (("relation", True), ("entry", True), ("reaction", True))
+    )
+
+    if len(relations) > 0:
+        values["relations"] = relations
+    if len(entries) > 0:
+        values["entries"] = entries
+    if len(reactions) > 0:
+        values["reactions"] = reactions
+
+    return Pathway.model_construct(**values)
@@ -0,0 +1,138 @@
+"""Index of KEGG organisms."""
+
+import csv
+import re
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator
+from typing import NamedTuple
+
+
+class Organism(NamedTuple):
+    """KEGG organism entry of organism list."""
+
+    tnumber: str
+    code: str
+    name: str
+    lineage: str = ""
+
+
+def _normalize_name(name: str) -> str:
+    """Normalize organism name for lookups. Common names in brackets are removed and case is ignored.
+
+    :param str name: Name of organism, e.g. "Homo sapiens (human)".
+    :return: Normalized name, e.g. "homo sapiens".
+    :rtype: str
+    """
+    return re.sub(pattern=r"\s*\(.*\)\s*$", repl="", string=name).strip().lower()
+
+
+class OrganismIndex:
+    """Parsed list of KEGG organisms with lookups by T number, organism code and name.
+
+    The index is built once from the organism list (e.g. `organism.tsv` of the KEGG API) and is immutable. All lookups
+    are dict lookups, prefix searches are binary searches over sorted keys.
+    """
+
+    def __init__(self, organisms: Iterable[Organism]) -> None:
+        """Init OrganismIndex instance.
+
+        :param typing.Iterable[Organism] organisms: Organisms to index.
+        """
+        self._by_code: dict[str, Organism] = {}
+        self._by_tnumber: dict[str, Organism] = {}
+        self._by_name: dict[str, Organism] = {}
+
+        for organism in organisms:
+            self._by_code[organism.code] = organism
+            self._by_tnumber[organism.tnumber] = organism
+            self._by_name.setdefault(organism.name.lower(), organism)
+            self._by_name.setdefault(_normalize_name(organism.name), organism)
+
+        # Sorted keys for prefix search
+        self._sorted_codes: list[str] = sorted(self._by_code)
+        self._sorted_names: list[str] = sorted(self._by_name)
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str]) -> "OrganismIndex":
+        """Build index from lines of organism list with columns T number, code, name and lineage.
+
+        :param typing.Iterable[str] lines: Lines of tsv file, e.g. an open file object.
+        :return: Index of organisms.
+        :rtype: OrganismIndex
+        """
+        return cls(
+            Organism(tnumber=row[0], code=row[1], name=row[2], lineage=row[3] if len(row) > 3 else "")
+            for row in csv.reader(lines, delimiter="\t")
+            if len(row) >= 3 and row[1] != ""
+        )
+
+    def __len__(self) -> int:
+        """Get number of organisms."""
+        return len(self._by_code)
+
+    def __iter__(self) -> Iterator[Organism]:
+        """Iterate over organisms in order of organism list."""
+        return iter(self._by_code.values())
+
+    def __contains__(self, code: object) -> bool:
+        """Check if organism code exists."""
+        return code in self._by_code
+
+    def get(self, code: str) -> Organism | None:
+        """Get organism by organism code.
+
+        :param str code: 3 or 4 letter organism code, e.g. "hsa".
+        :return: Organism or None if code does not exist.
+        :rtype: typing.Optional[Organism]
+        """
+        return self._by_code.get(code)
+
+    def get_by_tnumber(self, tnumber: str) -> Organism | None:
+        """Get organism by T number.
+
+        :param str tnumber: T number of organism, e.g. "T01001".
+        :return: Organism or None if T number does not exist.
+        :rtype: typing.Optional[Organism]
+        """
+        return self._by_tnumber.get(tnumber)
+
+    def get_by_name(self, name: str) -> Organism | None:
+        """Get organism by name. Case and common names in brackets are ignored.
+
+        :param str name: Name of organism, e.g. "Homo sapiens" or "Homo sapiens (human)".
+        :return: Organism or None if name does not exist.
+        :rtype: typing.Optional[Organism]
+        """
+        return self._by_name.get(name.lower(), self._by_name.get(_normalize_name(name)))
+
+    @staticmethod
+    def _prefixed(keys: list[str], prefix: str) -> Iterator[str]:
+        """Iterate over sorted keys that start with prefix.
+
+        :param typing.List[str] keys: Sorted keys.
+        :param str prefix: Prefix to search.
+        :return: Iterator over matching keys.
+        :rtype: typing.Iterator[str]
+        """
+        for index in range(bisect_left(keys, prefix), len(keys)):
+            if not keys[index].startswith(prefix):
+                break
+            yield keys[index]
+
+    def search(self, prefix: str) -> list[Organism]:
+        """Search organisms by prefix of organism code or name. Case is ignored for names.
+
+        :param str prefix: Prefix of organism code or name, e.g. "hs" or "homo".
+        :return: Matching organisms, organisms with matching code first.
+        :rtype: typing.List[Organism]
+        """
+        result: dict[str, Organism] = {}
+
+        for code in self._prefixed(self._sorted_codes, prefix):
+            result[code] = self._by_code[code]
+
+        for name in self._prefixed(self._sorted_names, prefix.lower()):
+            organism: Organism = self._by_name[name]
+            result.setdefault(organism.code, organism)
+
+        return list(result.values())
@@ -0,0 +1,265 @@
+"""Rate limiting of requests to KEGG API."""
+
+import os
+import struct
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Generator
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    # Advisory file locks are not available on Windows. Shared rate limiters are only shared across threads.
+    fcntl = None  # type: ignore[assignment]
+
+# HTTP status codes the KEGG API responds with, if too many requests are sent
+THROTTLE_STATUS_CODES: tuple[int, ...] = (403, 429, 503)
+
+# Binary layout of state file of shared rate limiter: tokens, time of last update and current rate
+_STATE_FORMAT: str = "<ddd"
+
+
+class RateLimiter:
+    """Thread-safe token bucket rate limiter.
+
+    The rate adapts to the responses of the server (additive increase, multiplicative decrease). Each throttled
+    response reduces the rate by `decrease`, each successful response raises the rate by `increase` up to the
+    configured maximal rate.
+    """
+
+    # Clock of token bucket
+    _clock: Callable[[], float] = staticmethod(time.monotonic)
+
+    def __init__(
+        self,
+        rate: float = 3.0,
+        capacity: float | None = None,
+        min_rate: float = 0.1,
+        increase: float = 0.1,
+        decrease: float = 0.5,
+    ) -> None:
+        """Init RateLimiter instance.
+
+        :param float rate: Maximal number of requests per second.
+        :param typing.Optional[float] capacity: Size of token bucket, which is the maximal burst of requests. \
+            Defaults to `rate`.
+        :param float min_rate: Lower bound of the rate when throttled.
+        :param float increase: Requests per second to add to the rate after each successful request.
+        :param float decrease: Factor to multiply the rate with after each throttled request.
+        """
+        if rate <= 0 or min_rate <= 0:
+            raise ValueError("Rate must be a positive number.")
+
+        self.max_rate: float = rate
+        self.min_rate: float = min(min_rate, rate)
+        self.rate: float = rate
+        self.capacity: float = capacity if capacity is not None else max(1.0, rate)
+        self.increase: float = increase
+        self.decrease: float = decrease
+
+        self._tokens: float = self.capacity
+        self._updated: float = self._clock()
+        self._lock: threading.Lock = threading.Lock()
+
+        # Statistics of time waited for tokens
+        self._acquired: int = 0
+        self._delayed: int = 0
+        self._total_wait: float = 0.0
+        self._max_wait: float = 0.0
+
+    def _refill(self, now: float) -> None:
+        """Add tokens for the time passed since the last update. Lock must be held by caller.
+
+        :param float now: Current time of clock.
+        """
+        self._tokens = min(self.capacity, self._tokens + max(0.0, now - self._updated) * self.rate)
+        self._updated = now
+
+    def _try_acquire(self) -> float:
+        """Consume a token if available.
+
+        :return: 0 if a token was consumed, otherwise time in seconds until the next token is available.
+        :rtype: float
+        """
+        with self._lock:
+            self._refill(self._clock())
+
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return 0.0
+
+            return (1.0 - self._tokens) / self.rate
+
+    def acquire(self) -> float:
+        """Block until a token is available and consume it.
+
+        :return: Time waited for the token in seconds.
+        :rtype: float
+        """
+        waited: float = 0.0
+
+        while True:
+            delay: float = self._try_acquire()
+
+            if delay <= 0.0:
+                break
+
+            time.sleep(delay)
+            waited += delay
+
+        with self._lock:
+            self._acquired += 1
+            self._total_wait += waited
+            self._max_wait = max(self._max_wait, waited)
+            if waited > 0.0:
+                self._delayed += 1
+
+        return waited
+
+    def stats(self) -> dict[str, float]:
+        """Get statistics of time waited for tokens by this instance, e.g. to size pools of workers.
+
+        :return: Dict with number of acquired and delayed tokens, total, mean and maximal wait in seconds and the \
+            current rate.
+        :rtype: typing.Dict[str, float]
+        """
+        with self._lock:
+            return {
+                "acquired": self._acquired,
+                "delayed": self._delayed,
+                "total_wait": self._total_wait,
+                "mean_wait": self._total_wait / self._acquired if self._acquired > 0 else 0.0,
+                "max_wait": self._max_wait,
+                "rate": self.rate,
+            }
+
+    def on_success(self) -> None:
+        """Increase rate after a successful request."""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self) -> None:
+        """Decrease rate and drop burst tokens after a throttled request."""
+        with self._lock:
+            self._refill(self._clock())
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            self._tokens = min(self._tokens, 0.0)
+
+    def feedback(self, status_code: int) -> None:
+        """Adapt rate to status code of a response.
+
+        :param int status_code: HTTP status code of response.
+        """
+        if status_code in THROTTLE_STATUS_CODES:
+            self.on_throttle()
+        elif status_code < 400:
+            self.on_success()
+
+
+class SharedRateLimiter(RateLimiter):
+    """Token bucket rate limiter shared by all processes on a machine that use the same host.
+
+    The token bucket and the adaptive rate are stored in a small state file in `directory`, which is locked with an
+    advisory file lock for each update. All processes with a limiter of the same host share the request limit, e.g.
+    many worker processes with their own `Resolver`. Statistics of `stats` are collected per instance.
+    """
+
+    # Wall clock time is comparable across processes
+    _clock: Callable[[], float] = staticmethod(time.time)
+
+    def __init__(
+        self,
+        rate: float = 3.0,
+        host: str = "kegg.jp",
+        directory: str | None = None,
+        **kwargs: float,
+    ) -> None:
+        """Init SharedRateLimiter instance.
+
+        :param float rate: Maximal number of requests per second of all processes together.
+        :param str host: Host to limit requests to. Limiters of the same host and directory share the limit.
+        :param typing.Optional[str] directory: Folder of state file. Defaults to the temporary folder of the system.
+        :param float kwargs: Other arguments to `RateLimiter`, like `capacity`, `min_rate`, `increase` or `decrease`.
+        """
+        super().__init__(rate=rate, **kwargs)
+
+        self.host: str = host
+        self.path: str = os.path.join(
+            directory if directory is not None else tempfile.gettempdir(), f"keggtools_ratelimit_{host}.state"
+        )
+
+    @contextmanager
+    def _shared_state(self) -> Generator[None, None, None]:
+        """Lock state file and load shared state into instance. Changed state is written back on exit."""
+        with open(self.path, "a+b") as state_file:
+            if fcntl is not None:
+                fcntl.flock(state_file.fileno(), fcntl.LOCK_EX)
+
+            try:
+                state_file.seek(0)
+                data: bytes = state_file.read()
+
+                if len(data) == struct.calcsize(_STATE_FORMAT):
+                    self._tokens, self._updated, self.rate = struct.unpack(_STATE_FORMAT, data)
+                else:
+                    # New or corrupt state file starts with a full bucket
+                    self._tokens, self._updated, self.rate = self.capacity, self._clock(), self.max_rate
+
+                yield
+
+                state_file.seek(0)
+                state_file.truncate()
+                state_file.write(struct.pack(_STATE_FORMAT, self._tokens, self._updated, self.rate))
+                state_file.flush()
+
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(state_file.fileno(), fcntl.LOCK_UN)
+
+    def _try_acquire(self) -> float:
+        """Consume a token of the shared bucket if available.
+
+        :return: 0 if a token was consumed, otherwise time in seconds until the next token is available.
+        :rtype: float
+        """
+        with self._shared_state():
+            return super()._try_acquire()
+
+    def on_success(self) -> None:
+        """Increase shared rate after a successful request."""
+        with self._shared_state():
+            super().on_success()
+
+    def on_throttle(self) -> None:
+        """Decrease shared rate and drop burst tokens after a throttled request."""
+        with self._shared_state():
+            super().on_throttle()
+
+
+# Rate limiter of resolvers that are created without a rate limiter
+_default_rate_limiter: RateLimiter | None = None
+
+
+def set_default_rate_limiter(rate_limiter: RateLimiter | None) -> None:
+    """Set rate limiter of all resolvers that are created without a rate limiter, e.g. a `SharedRateLimiter`.
+
+    :param typing.Optional[RateLimiter] rate_limiter: Rate limiter to share. Set to None to give each resolver its \
+        own limiter of 3 requests per second.
+    """
+    global _default_rate_limiter
+    _default_rate_limiter = rate_limiter
+
+
+def get_default_rate_limiter() -> RateLimiter:
+    """Get rate limiter for resolvers that are created without a rate limiter.
+
+    :return: Rate limiter set by `set_default_rate_limiter` or a new limiter of 3 requests per second, which is the \
+        limit of the KEGG API.
+    :rtype: RateLimiter
+    """
+    if _default_rate_limiter is not None:
+        return _default_rate_limiter
+
+    return RateLimiter(rate=3.0)
@@ -5,18 +5,17 @@ import math
 from functools import lru_cache
 from io import BytesIO
 from typing import TYPE_CHECKING, Any
-from warnings import warn
 from xml.etree import ElementTree
 from xml.etree.ElementTree import Element, SubElement
 
-import requests
 from matplotlib import colormaps
 from matplotlib.colors import Colormap, Normalize, to_hex
 from pydot import Dot, Edge, Node
 
 from keggtools.models import Entry, Pathway
+from keggtools.ratelimit import RateLimiter
 from keggtools.resolver import Resolver
-from keggtools.storage import Storage
+from keggtools.storage import BaseStorage
 from keggtools.utils import ColorGradient
 
 if TYPE_CHECKING:
@@ -82,7 +81,7 @@ class Renderer:
         self,
         kegg_pathway: Pathway,
         gene_dict: dict[str, float] | None = None,
-        cache_or_resolver: Storage | str | Resolver | None = None,
+        cache_or_resolver: BaseStorage | str | Resolver | None = None,
         # resolve_compounds: bool = True # TODO: Specify if renderer should resolver compounds in human readable text
         upper_color: tuple[int, int, int] = (255, 0, 0),
         lower_color: tuple[int, int, int] = (0, 0, 255),
@@ -92,7 +91,7 @@ class Renderer:
         :param Pathway kegg_pathway: Pathway instance to render.
         :param typing.Optional[typing.Dict[str, float]] gene_dict: Dict to specify overlay color \
             gradient to rendered entries.
-        :param typing.Optional[typing.Union[Storage, str, cache_or_resolver]] cache: \
+        :param typing.Optional[typing.Union[BaseStorage, str, Resolver]] cache: \
             Specify cache for resolver instance or pass resolver. Resolver is needed to get compound data needed for \
             rendering.
         :param typing.Tuple[int, int, int] upper_color: Color for upper bound of color gradient.
@@ -128,7 +127,7 @@ class Renderer:
         # Init resolver instance from pathway org code.
         resolver_buffer: Resolver | None = None
 
-        if isinstance(cache_or_resolver, str | Storage) or cache_or_resolver is None:
+        if isinstance(cache_or_resolver, str | BaseStorage) or cache_or_resolver is None:
             resolver_buffer = Resolver(cache=cache_or_resolver)
         elif isinstance(cache_or_resolver, Resolver):
             resolver_buffer = cache_or_resolver
@@ -249,8 +248,8 @@ class Renderer:
         #     resolved_gene_names = self.resolve_missing_gene_names(truncate_gene_list=truncate_gene_list)
 
         # add all nodes and edges
-        related_entries = [int(p.entry1) for p in self.pathway.relations]
-        related_entries.extend([int(p.entry2) for p in self.pathway.relations])
+        related_entries: set[int] = {int(p.entry1) for p in self.pathway.relations}
+        related_entries.update(int(p.entry2) for p in self.pathway.relations)
 
         for entry in self.pathway.entries:
             # Use entry id as default label
@@ -521,42 +520,15 @@ def render_overlay_image(
     ignore_group: bool = True,
     overlay_dict: dict[str, float] | None = None,
     cmap: Colormap | str | None = None,
-    cache: Storage | str | None = None,
+    cache: BaseStorage | str | None = None,
+    rate_limiter: RateLimiter | None = None,
 ) -> "Image.Image":
     """Create overlay based on kegg prerendered image files."""
     from PIL import Image, ImageDraw
 
-    if isinstance(cache, str):
-        cache = Storage(cachedir=cache)
-    if cache is None:
-        cache = Storage()
-
-    # Check for file in cache
-    image_filename = f"{pathway.name.split(':')[1]}_image.png"
-
-    img_memory: BytesIO
-
-    if cache.exist(image_filename) is True:
-        img_memory = BytesIO(cache.load_dump(image_filename))
-
-    else:
-        # HTTP request to fetch pathway image
-        assert pathway.image is not None
-        response = requests.get(url=pathway.image)
-        response.raise_for_status()
-        response_content_type = response.headers["Content-Type"]
-        if response_content_type != "image/png":
-            warn(
-                message=f"Unexpected Content-Type of {response_content_type}. Possible unsupported.",
-                category=UserWarning,
-                stacklevel=1,
-            )
-
-        # Save to cache
-        cache.save_dump(image_filename, response.content)
-
-        # Generate in-memory image file
-        img_memory = BytesIO(response.content)
+    # Load image from cache or request from KEGG
+    with Resolver(cache=cache, rate_limiter=rate_limiter) as resolver:
+        img_memory: BytesIO = BytesIO(resolver.get_pathway_image(pathway=pathway))
 
     # Generate image from bytes
     img = Image.open(img_memory)
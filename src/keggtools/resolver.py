@@ -1,24 +1,154 @@
 """Resolve requests to KEGG data Api."""
 
-from typing import Any
+import asyncio
+import csv
+import hashlib
+import itertools
+import json
+import threading
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from datetime import UTC, datetime
+from functools import partial
+from typing import IO, Any, Literal, TypeVar
+from warnings import warn
+from weakref import WeakKeyDictionary
+from xml.etree import ElementTree
 
+import pandas as pd
 import requests
 
+from keggtools._version import __version__
+from keggtools.lru import LRUCache
 from keggtools.models import Pathway
-from keggtools.storage import Storage
-from keggtools.utils import parse_tsv_to_dict
+from keggtools.organism import OrganismIndex
+from keggtools.ratelimit import RateLimiter, get_default_rate_limiter
+from keggtools.storage import BaseStorage, Storage, resource_class
+from keggtools.transport import HTTPTransport, Transport
+from keggtools.utils import is_valid_pathway_org, iter_tsv_pairs, parse_tsv_to_dict
 
+_T = TypeVar("_T")
 
-def _request(url: str, **kwargs: Any) -> str:
+# HTTP status codes of transient errors that are worth a retry
+RETRY_STATUS_CODES: tuple[int, ...] = (429, 500, 502, 503, 504)
+
+# Size of chunks to stream downloads to disk
+DOWNLOAD_CHUNK_SIZE: int = 64 * 1024
+
+# Signature at start of every PNG image
+PNG_SIGNATURE: bytes = b"\x89PNG\r\n\x1a\n"
+
+
+def _retry_delay(attempt: int, backoff_factor: float, response: requests.Response | None = None) -> float:
+    """Compute delay before next retry with exponential backoff. Honours "Retry-After" header of response.
+
+    :param int attempt: Number of failed attempts so far (0-index).
+    :param float backoff_factor: Base delay in seconds.
+    :param typing.Optional[requests.Response] response: Response of failed attempt.
+    :return: Delay in seconds.
+    :rtype: float
+    """
+    if response is not None:
+        retry_after: str | None = response.headers.get("Retry-After")
+        if retry_after is not None and retry_after.isdigit():
+            return float(retry_after)
+
+    return backoff_factor * (2**attempt)
+
+
+def _get(
+    url: str,
+    session: requests.Session | Transport | None = None,
+    retries: int = 0,
+    backoff_factor: float = 0.5,
+    rate_limiter: RateLimiter | None = None,
+    **kwargs: Any,
+) -> requests.Response:
+    """Send GET request and retry with exponential backoff on connection errors and transient status codes.
+
+    :param str url: Url to request from.
+    :param typing.Optional[typing.Union[requests.Session, Transport]] session: Session or transport to send request \
+        with. Uses `requests.get` if None.
+    :param int retries: Maximal number of retries after the first attempt.
+    :param float backoff_factor: Base delay in seconds. Delay doubles with every retry.
+    :param typing.Optional[RateLimiter] rate_limiter: Rate limiter to acquire a token from before each attempt. The \
+        status code of each response is reported back to the rate limiter.
+    :param typing.Any kwargs: other arguments to `requests.get`.
+    :return: Successful response.
+    :rtype: requests.Response
+    :raises requests.HTTPError: If last response has an error status code.
+    """
+    attempt: int = 0
+
+    while True:
+        response: requests.Response | None = None
+
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+
+        try:
+            if session is not None:
+                response = session.get(url=url, **kwargs)
+            else:
+                response = requests.get(url=url, **kwargs)
+
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt >= retries:
+                raise
+
+        else:
+            if rate_limiter is not None:
+                rate_limiter.feedback(status_code=response.status_code)
+
+            if response.status_code not in RETRY_STATUS_CODES or attempt >= retries:
+                try:
+                    response.raise_for_status()
+                except requests.HTTPError:
+                    # Release connection of streamed response, blocking pools would run out of connections
+                    response.close()
+                    raise
+
+                return response
+
+        delay: float = _retry_delay(attempt=attempt, backoff_factor=backoff_factor, response=response)
+
+        # Release connection of failed (streamed) response before retry
+        if response is not None:
+            response.close()
+
+        time.sleep(delay)
+        attempt += 1
+
+
+def _request(
+    url: str,
+    session: requests.Session | Transport | None = None,
+    retries: int = 0,
+    backoff_factor: float = 0.5,
+    rate_limiter: RateLimiter | None = None,
+    **kwargs: Any,
+) -> str:
     """Url request helper function.
 
     :param str url: Url to request from.
+    :param typing.Optional[typing.Union[requests.Session, Transport]] session: Session or transport to send request \
+        with. Uses `requests.get` if None.
+    :param int retries: Maximal number of retries after the first attempt.
+    :param float backoff_factor: Base delay in seconds. Delay doubles with every retry.
+    :param typing.Optional[RateLimiter] rate_limiter: Rate limiter to acquire a token from before each attempt.
     :param typing.Any kwargs: other arguments to `requests.get`.
     :return: Payload decoded to string.
     :rtype: str
     """
-    response = requests.get(url=url, **kwargs)
-    response.raise_for_status()
+    response = _get(
+        url=url,
+        session=session,
+        retries=retries,
+        backoff_factor=backoff_factor,
+        rate_limiter=rate_limiter,
+        **kwargs,
+    )
     return response.content.decode(encoding="utf-8")
 
 
@@ -33,30 +163,51 @@ def _request_to_dict(
     :param str url: Url to request.
     :param int col_keys: Number of column representing keys of dict.
     :param int col_values: Number of column representing values of dict.
-    :param typing.Any kwargs: other arguments to `requests.get`.
+    :param typing.Any kwargs: other arguments to `_request`.
     :return: TSV parsed to dict.
     :rtype: typing.Dict[str, str]
     """
     return parse_tsv_to_dict(data=_request(url=url, **kwargs), col_keys=col_keys, col_values=col_values)
 
 
-def get_gene_names(genes: list[str], max_genes: int = 50) -> dict[str, str]:
+def _request_gene_names(genes: list[str], **kwargs: Any) -> dict[str, str]:
+    """Resolve a single chunk of KEGG gene identifer to name.
+
+    :param typing.List[str] genes: List of gene identifer in format "<organism>:<code>"
+    :param typing.Any kwargs: other arguments to `_request`.
+    :return: Dict of gene idenifier to gene name.
+    :rtype: typing.Dict[str, str]
+    """
+    # Build query string
+    query_string: str = "+".join(genes)
+
+    # Request without cache
+    resolve_dict: dict[str, str] = _request_to_dict(url=f"http://rest.kegg.jp/list/{query_string}", **kwargs)
+
+    # Sanitize dict by splitting first entry of gene name
+    return {key: value.split(", ")[0] for key, value in resolve_dict.items()}
+
+
+def get_gene_names(genes: list[str], max_genes: int = 50, workers: int = 1, **kwargs: Any) -> dict[str, str]:
     """Resolve KEGG gene identifer to name using to KEGG database REST Api.
 
     Function is implemented outside the resolver instance, because requests are not cached and only gene identifier
-    are used.
+    are used. Use `Resolver.get_gene_names` to cache the names and to send the request with the session of a resolver.
+
+    Long lists of genes are split into chunks of `max_genes` identifier, which are requested concurrently.
 
     :param typing.List[str] genes: List of gene identifer in format "<organism>:<code>"
+    :param int max_genes: Maximal number of genes per request.
+    :param int workers: Number of threads to request chunks with.
+    :param typing.Any kwargs: other arguments to `_request`, like `session`, `rate_limiter` or `timeout`. Requests \
+        share the default rate limiter unless another `rate_limiter` is passed.
     :return: Dict of gene idenifier to gene name.
     :rtype: typing.Dict[str, str]
     """
     if len(genes) == 0:
         raise ValueError("No items to request.")
 
-    # Check maximum number of entries requests
-    # TODO: build fallback to make multiple requests from long lists (iterate over list chunks)
-    if len(genes) > max_genes:
-        raise ValueError(f"Too many entries are requested at once ({len(genes)}/50).")
+    kwargs.setdefault("rate_limiter", get_default_rate_limiter())
 
     # TODO check if pattern of identifer is correct
     # for item in genes:
@@ -66,17 +217,22 @@ def get_gene_names(genes: list[str], max_genes: int = 50) -> dict[str, str]:
     #             "Identifier must be 3 letter organism code with 5 digit KEGG gene id."
     #         )
 
-    # Build query string
-    query_string: str = "+".join(genes)
+    # Remove duplicates and split into chunks the KEGG API accepts
+    unique_genes: list[str] = list(dict.fromkeys(genes))
+    chunks: list[list[str]] = [
+        unique_genes[index : index + max_genes] for index in range(0, len(unique_genes), max_genes)
+    ]
 
-    # Request without cache
-    resolve_dict: dict[str, str] = _request_to_dict(url=f"http://rest.kegg.jp/list/{query_string}")
-
-    # Sanitize dict by splitting first entry of gene name
     result_dict: dict[str, str] = {}
 
-    for key, value in resolve_dict.items():
-        result_dict[key] = value.split(", ")[0]
+    if workers > 1 and len(chunks) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for chunk_result in executor.map(lambda chunk: _request_gene_names(genes=chunk, **kwargs), chunks):
+                result_dict.update(chunk_result)
+
+    else:
+        for chunk in chunks:
+            result_dict.update(_request_gene_names(genes=chunk, **kwargs))
 
     # Check if all genes are in dict
     # for item in genes:
@@ -89,32 +245,310 @@ def get_gene_names(genes: list[str], max_genes: int = 50) -> dict[str, str]:
     return result_dict
 
 
+def _warn_failed_pathways(organism: str, failed: dict[str, str]) -> None:
+    """Warn about pathways that were skipped, because they could not be loaded.
+
+    :param str organism: 3 letter organism code used by KEGG database.
+    :param typing.Dict[str, str] failed: Dict of pathway code to reason.
+    """
+    warn(
+        message=f"Failed to load {len(failed)} pathways of '{organism}': "
+        + ", ".join(f"{code} ({reason})" for code, reason in failed.items()),
+        category=UserWarning,
+        stacklevel=3,
+    )
+
+
 class Resolver:
     """KEGG pathway resolver class.
 
     Request interface for KEGG API endpoint.
     """
 
-    def __init__(self, cache: Storage | str | None = None) -> None:
+    def __init__(
+        self,
+        cache: BaseStorage | str | None = None,
+        session: requests.Session | None = None,
+        transport: Transport | None = None,
+        retries: int = 3,
+        backoff_factor: float = 0.5,
+        timeout: float | None = 30.0,
+        pool_maxsize: int = 10,
+        rate_limiter: RateLimiter | None = None,
+        ttl: dict[str, float | None] | None = None,
+        negative_ttl: float | None = 300.0,
+        pathway_cache_size: int = 128,
+        kgml_engine: Literal["pydantic", "fast"] = "pydantic",
+        pathway_snapshots: bool = False,
+    ) -> None:
         """Init Resolver instance.
 
-        :param typing.Optional[typing.Union[Storage, str]] cache: Directory to use as cache storage or Storage instance.
+        :param typing.Optional[typing.Union[BaseStorage, str]] cache: Directory to use as cache storage or storage \
+            instance, e.g. `SQLiteStorage`.
+        :param typing.Optional[requests.Session] session: HTTP session used for all requests. If None, a session \
+            with a keep-alive connection pool is created.
+        :param typing.Optional[Transport] transport: Transport to send all requests with, e.g. `LocalTransport` to \
+            serve requests from a local directory. Defaults to `HTTPTransport` with `session`.
+        :param int retries: Number of retries on connection errors and transient status codes (429, 5xx).
+        :param float backoff_factor: Base delay in seconds between retries. Delay doubles with every retry.
+        :param typing.Optional[float] timeout: Default timeout of requests in seconds. Set to None to wait forever.
+        :param int pool_maxsize: Maximal number of connections per host in the pool of the generated session.
+        :param typing.Optional[RateLimiter] rate_limiter: Rate limiter for all requests of the resolver. Defaults to \
+            the limiter of `keggtools.ratelimit.set_default_rate_limiter` or 3 requests per second, which is the \
+            limit of the KEGG API.
+        :param typing.Optional[typing.Dict[str, typing.Optional[float]]] ttl: Time to live of cached files in seconds \
+            per resource class ("list", "kgml" or "image"). Expired files are revalidated with a conditional request. \
+            Files of classes without ttl never expire.
+        :param typing.Optional[float] negative_ttl: Time in seconds to remember that a resource does not exist (404). \
+            Set to None to disable caching of missing resources.
+        :param int pathway_cache_size: Number of parsed pathways to keep in memory. Set to 0 to parse pathways on \
+            every call.
+        :param str kgml_engine: Parser engine of KGML pathways (see `keggtools.models.Pathway.from_xml`). The "fast" \
+            engine skips validation of cached files.
+        :param bool pathway_snapshots: Keep snapshot of each parsed pathway next to its KGML file in storage. Other \
+            processes load the snapshot instead of parsing the KGML file again. Snapshots are about the size of the \
+            KGML file and count towards the byte budget of the storage.
         """
         # Handle different types of argument for cache
 
-        _store: Storage | None = None
+        _store: BaseStorage | None = None
 
         if isinstance(cache, str):
             _store = Storage(cachedir=cache)
 
-        elif isinstance(cache, Storage):
+        elif isinstance(cache, BaseStorage):
             _store = cache
         else:
             # Fallback to default storage with hard coded folder name
             _store = Storage()
 
         # Internal storage instance
-        self.storage: Storage = _store
+        self.storage: BaseStorage = _store
+
+        # Transport is only closed by the resolver if it was created by the resolver
+        self._owns_transport: bool = transport is None
+        self.transport: Transport = (
+            transport if transport is not None else HTTPTransport(session=session, pool_maxsize=pool_maxsize)
+        )
+
+        self.retries: int = retries
+        self.backoff_factor: float = backoff_factor
+        self.timeout: float | None = timeout
+        self.rate_limiter: RateLimiter = rate_limiter if rate_limiter is not None else get_default_rate_limiter()
+
+        self.ttl: dict[str, float | None] = ttl if ttl is not None else {}
+        self.negative_ttl: float | None = negative_ttl
+
+        # Parsed pathways by filename. Pathways are parsed again if their cached file was changed.
+        self.pathway_cache: LRUCache[Pathway] = LRUCache(maxsize=pathway_cache_size)
+        self.kgml_engine: Literal["pydantic", "fast"] = kgml_engine
+        self.pathway_snapshots: bool = pathway_snapshots
+
+        # Parsed organism list. Index is built again if the cached file was changed.
+        self._organism_index: LRUCache[OrganismIndex] = LRUCache(maxsize=1)
+
+        # Parsed id conversion tables by filename
+        self._tables: LRUCache[pd.DataFrame] = LRUCache(maxsize=8)
+
+    @property
+    def session(self) -> requests.Session:
+        """HTTP session of resolver.
+
+        :raises TypeError: If resolver does not use a HTTP transport.
+        """
+        if not isinstance(self.transport, HTTPTransport):
+            raise TypeError("Resolver does not use a HTTP transport.")
+
+        return self.transport.session
+
+    def close(self) -> None:
+        """Close connection pool of resolver transport."""
+        if self._owns_transport is True:
+            self.transport.close()
+
+    def __enter__(self) -> "Resolver":
+        """Enter context of resolver."""
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        """Close resolver on exit of context."""
+        self.close()
+
+    def _fetch(self, url: str, **kwargs: Any) -> requests.Response:
+        """Request url with transport, retries, rate limiter and timeout of resolver instance.
+
+        :param str url: Url to request from.
+        :param typing.Any kwargs: other arguments to `Transport.get`.
+        :return: Successful response.
+        :rtype: requests.Response
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        return _get(
+            url=url,
+            session=self.transport,
+            retries=self.retries,
+            backoff_factor=self.backoff_factor,
+            rate_limiter=self.rate_limiter,
+            **kwargs,
+        )
+
+    def _request(self, url: str, **kwargs: Any) -> str:
+        """Request url with transport, retries, rate limiter and timeout of resolver instance.
+
+        :param str url: Url to request from.
+        :param typing.Any kwargs: other arguments to `Transport.get`.
+        :return: Payload decoded to string.
+        :rtype: str
+        """
+        return self._fetch(url=url, **kwargs).content.decode(encoding="utf-8")
+
+    def _is_fresh(self, filename: str, meta: dict[str, Any] | None = None) -> bool:
+        """Check if cached file is within time to live of its resource class.
+
+        :param str filename: Filename of cached file.
+        :param typing.Optional[typing.Dict[str, typing.Any]] meta: Metadata of cached file. Loaded from storage if None.
+        :return: Returns True if file does not expire or is not expired yet.
+        :rtype: bool
+        """
+        ttl: float | None = self.ttl.get(resource_class(filename=filename))
+
+        if ttl is None:
+            return True
+
+        if meta is None:
+            meta = self.storage.load_meta(filename=filename)
+
+        # Fallback to time of modification for files without metadata
+        fetched_at: float = meta["fetched_at"] if meta is not None else self.storage.mtime(filename=filename)
+
+        return time.time() - fetched_at < ttl
+
+    def _raise_if_missing(self, filename: str, url: str, meta: dict[str, Any] | None) -> None:
+        """Raise error if resource was recently found to not exist.
+
+        :param str filename: Filename of resource.
+        :param str url: Url of resource.
+        :param typing.Optional[typing.Dict[str, typing.Any]] meta: Metadata of resource.
+        :raises requests.HTTPError: If a 404 response of resource is cached.
+        """
+        if (
+            self.negative_ttl is not None
+            and meta is not None
+            and meta.get("status") == 404
+            and time.time() - meta["fetched_at"] < self.negative_ttl
+        ):
+            raise requests.HTTPError(f"404 Client Error: Not Found for url: {url} (cached response for '{filename}')")
+
+    def _cached(
+        self,
+        filename: str,
+        url: str,
+        load: Callable[[str], _T],
+        save: Callable[[str, requests.Response], _T],
+        **kwargs: Any,
+    ) -> _T:
+        """Load file from cache folder or request from url if file is missing or expired.
+
+        Expired files are revalidated with a conditional request and are not downloaded again, if the server responds
+        with "304 Not Modified". Concurrent calls for the same file are coalesced, so a missing file is requested once.
+
+        :param str filename: Filename to store in cache folder.
+        :param str url: Url to online resource.
+        :param typing.Callable load: Function to load file from storage.
+        :param typing.Callable save: Function to save response to storage and return loaded content.
+        :param typing.Any kwargs: Other arguments to `requests.get`.
+        :return: Loaded content of file.
+        """
+        if self.storage.exist(filename=filename):
+            try:
+                if self._is_fresh(filename=filename):
+                    return load(filename)
+
+            # File was removed by another process after the lookup and is requested again
+            except FileNotFoundError:
+                pass
+        else:
+            self._raise_if_missing(filename=filename, url=url, meta=self.storage.load_meta(filename=filename))
+
+        # Only one thread or process requests the file, concurrent callers wait for the lock and load the file from
+        # cache.
+        with self.storage.lock(filename=filename):
+            meta: dict[str, Any] | None = self.storage.load_meta(filename=filename)
+            exists: bool = self.storage.exist(filename=filename)
+
+            if exists:
+                try:
+                    if self._is_fresh(filename=filename, meta=meta):
+                        return load(filename)
+                except FileNotFoundError:
+                    exists = False
+
+            headers: dict[str, str] = dict(kwargs.pop("headers", None) or {})
+
+            if exists and meta is not None:
+                # Conditional request of expired file
+                if meta.get("etag") is not None:
+                    headers["If-None-Match"] = meta["etag"]
+                if meta.get("last_modified") is not None:
+                    headers["If-Modified-Since"] = meta["last_modified"]
+
+            elif not exists:
+                self._raise_if_missing(filename=filename, url=url, meta=meta)
+
+            try:
+                response: requests.Response = self._fetch(url=url, headers=headers, **kwargs)
+
+            except requests.RequestException as error:
+                # Expired file is served, if it could not be revalidated
+                if exists:
+                    return self._load_stale(filename=filename, load=load, error=error)
+
+                if isinstance(error, requests.HTTPError) and error.response is not None:
+                    if error.response.status_code == 404:
+                        self.storage.save_meta(
+                            filename=filename, meta={"url": url, "fetched_at": time.time(), "status": 404}
+                        )
+                raise
+
+            new_meta: dict[str, Any] = {
+                "url": url,
+                "fetched_at": time.time(),
+                "status": response.status_code,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            }
+
+            if response.status_code == 304 and exists:
+                # Cached file is still valid, response has no payload
+                response.close()
+
+                if meta is not None:
+                    new_meta = {**meta, "fetched_at": new_meta["fetched_at"]}
+                self.storage.save_meta(filename=filename, meta=new_meta)
+                return load(filename)
+
+            result: _T = save(filename, response)
+            self.storage.save_meta(filename=filename, meta=new_meta)
+
+        return result
+
+    @staticmethod
+    def _load_stale(filename: str, load: Callable[[str], _T], error: requests.RequestException) -> _T:
+        """Load expired file from cache, if it could not be revalidated.
+
+        Metadata is kept, so the file is revalidated again by the next call.
+
+        :param str filename: Filename of expired file.
+        :param typing.Callable load: Function to load file from storage.
+        :param requests.RequestException error: Error of failed revalidation.
+        :return: Loaded content of expired file.
+        """
+        warn(
+            message=f"Failed to revalidate '{filename}', using expired cached copy: {error}",
+            category=UserWarning,
+            stacklevel=4,
+        )
+        return load(filename)
 
     def _cache_or_request(
         self,
@@ -122,7 +556,7 @@ class Resolver:
         url: str,
         **kwargs: Any,
     ) -> str:
-        """Load file from cache folder. If file does not exist, request from given url.
+        """Load file from cache folder. If file does not exist or is expired, request from given url.
 
         :param str filename: Filename to store in cache folder.
         :param str url: Url to online resource to request if file is not present in cache folder.
@@ -130,21 +564,91 @@ class Resolver:
         :return: Returns content of file as string.
         :rtype: str
         """
-        file_data: str | None = None
+        return self._cache_or_load(filename=filename, url=url, load=self.storage.load, **kwargs)
 
-        if self.storage.exist(filename=filename):
-            # return pathway list dump
-            file_data = self.storage.load(filename=filename)
+    def _cache_or_download(
+        self,
+        filename: str,
+        url: str,
+        **kwargs: Any,
+    ) -> None:
+        """Make sure file is in cache folder. If file does not exist or is expired, stream download to disk.
 
-        else:
-            # Data not found in cache. Request from REST api
+        The response is written to disk in chunks and never held in memory as a whole.
 
-            file_data = _request(url=url, **kwargs)
+        :param str filename: Filename to store in cache folder.
+        :param str url: Url to online resource to request if file is not present in cache folder.
+        :param typing.Any kwargs: Other arguments to requests.get
+        """
+
+        def save(filename: str, response: requests.Response) -> None:
+            with response:
+                self.storage.save_stream(
+                    filename=filename, chunks=response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE)
+                )
+
+        kwargs.setdefault("stream", True)
+        self._cached(filename=filename, url=url, load=lambda filename: None, save=save, **kwargs)
+
+    def _cache_or_load(self, filename: str, url: str, load: Callable[[str], _T], **kwargs: Any) -> _T:
+        """Make sure file is in cache folder and load it. If file does not exist or is expired, stream download to disk.
+
+        Files removed by another process between download and load (e.g. evicted files) are downloaded again.
+
+        :param str filename: Filename to store in cache folder.
+        :param str url: Url to online resource to request if file is not present in cache folder.
+        :param typing.Callable load: Function to load file from storage.
+        :param typing.Any kwargs: Other arguments to requests.get
+        :return: Loaded content of file.
+        """
+        self._cache_or_download(filename=filename, url=url, **kwargs)
 
-            # Save in storage
-            self.storage.save(filename=filename, data=file_data)
+        try:
+            return load(filename)
+        except FileNotFoundError:
+            # Storage dropped the missing file from its manifest, so the file is requested again
+            self._cache_or_download(filename=filename, url=url, **kwargs)
+            return load(filename)
+
+    def _iter_lines(self, filename: str) -> Iterator[str]:
+        """Iterate over lines of cached file. File is opened before the first line is requested.
+
+        :param str filename: Filename of file in cache folder.
+        :return: Iterator over lines of file.
+        :rtype: typing.Iterator[str]
+        :raises FileNotFoundError: If file does not exist.
+        """
+        lines: Iterator[str] = self.storage.iter_lines(filename=filename)
 
-        return file_data
+        # Reading the first line opens the file, so missing files raise here and not while iterating
+        first: str | None = next(lines, None)
+        return lines if first is None else itertools.chain((first,), lines)
+
+    def _cache_or_iter(
+        self,
+        filename: str,
+        url: str,
+        col_keys: int = 0,
+        col_values: int = 1,
+        **kwargs: Any,
+    ) -> Iterator[tuple[str, str]]:
+        """Load TSV file from cache folder and iterate over pairs of two columns line by line.
+
+        If file does not exist, the file is streamed to disk first.
+
+        :param str filename: Filename to store in cache folder.
+        :param str url: Url to online resource to request if file is not present in cache folder.
+        :param int col_keys: Number of colum to parse as keys (0-index).
+        :param int col_values: Number of colum to parse as values (0-index).
+        :param typing.Any kwargs: Other arguments to `requests.get`.
+        :return: Iterator over tuples of two tsv columns.
+        :rtype: typing.Iterator[typing.Tuple[str, str]]
+        """
+        return iter_tsv_pairs(
+            lines=self._cache_or_load(filename=filename, url=url, load=self._iter_lines, **kwargs),
+            col_keys=col_keys,
+            col_values=col_values,
+        )
 
     def _cache_or_request_to_dict(
         self,
@@ -164,11 +668,8 @@ class Resolver:
         :return: Dict of two tsv columns.
         :rtype: typing.Dict[str, str]
         """
-        # Load data
-        tsv_data: str = self._cache_or_request(filename=filename, url=url, **kwargs)
-
-        # Parse tsv data to dict
-        return parse_tsv_to_dict(data=tsv_data, col_keys=col_keys, col_values=col_values)
+        # Parse tsv data to dict line by line
+        return dict(self._cache_or_iter(filename=filename, url=url, col_keys=col_keys, col_values=col_values, **kwargs))
 
     def get_pathway_list(self, organism: str, **kwargs: Any) -> dict[str, str]:
         """Request list of pathways linked to organism.
@@ -180,7 +681,7 @@ class Resolver:
         """
         # TODO: return as list of pathway identifier ?
 
-        # TODO: verify org code
+        self._validate_organism(organism=organism)
 
         # path:mmu00010	Glycolysis / Gluconeogenesis - Mus musculus (mouse)
         # path:<org><code>\t<name> - <org>
@@ -191,25 +692,467 @@ class Resolver:
             **kwargs,
         )
 
+    def iter_pathway_list(self, organism: str, **kwargs: Any) -> Iterator[tuple[str, str]]:
+        """Iterate over list of pathways linked to organism. File is parsed line by line.
+
+        :param str organism: 3 letter organism code used by KEGG database.
+        :param typing.Any kwargs: other arguments to `requests.get`.
+        :return: Iterator over tuples of pathway id and name.
+        :rtype: typing.Iterator[typing.Tuple[str, str]]
+        """
+        self._validate_organism(organism=organism)
+
+        return self._cache_or_iter(
+            filename=f"pathway_list_{organism}.tsv",
+            url=f"http://rest.kegg.jp/list/pathway/{organism}",
+            **kwargs,
+        )
+
     def get_pathway(self, organism: str, code: str, **kwargs: Any) -> Pathway:
         """Load and parse KGML pathway by identifier.
 
+        Parsed pathways are kept in memory (see `pathway_cache`) and are shared between calls. Copy a pathway before
+        modifying it. Other resolvers on the same storage load the snapshot of the parsed pathway (see
+        `pathway_snapshots`).
+
         :param str organism: 3 letter organism code used by KEGG database.
         :param str code: Pathway identify used by KEGG database.
         :param typing.Any kwargs: other arguments to `requests.get`.
         :return: Returns parsed Pathway instance.
         :rtype: keggtools.models.Pathway
         """
-        # TODO: verify org code
+        self._validate_organism(organism=organism)
+
+        filename: str = f"{organism}_path{code}.kgml"
+
+        def load(filename: str) -> Pathway:
+            # Cached file is only parsed again if it was changed since it was parsed the last time
+            version: float = self.storage.mtime(filename=filename)
+            pathway: Pathway | None = self.pathway_cache.get(key=filename, version=version)
 
-        data: str = self._cache_or_request(
-            filename=f"{organism}_path{code}.kgml",
+            if pathway is None:
+                pathway = self._parse_pathway(filename=filename)
+                self.pathway_cache.put(key=filename, value=pathway, version=version)
+
+            return pathway
+
+        return self._cache_or_load(
+            filename=filename,
             url=f"http://rest.kegg.jp/get/{organism}{code}/kgml",
+            load=load,
             **kwargs,
         )
 
-        # Parse string
-        return Pathway.from_xml(data)
+    def _load_snapshot(self, filename: str, header: list[str]) -> Pathway | None:
+        """Load parsed pathway from snapshot.
+
+        Snapshots are stored as JSON and are validated while loaded, so snapshots of a shared cache folder can not run
+        code or inject invalid values.
+
+        :param str filename: Filename of snapshot.
+        :param typing.List[str] header: Expected keggtools version and checksum of KGML file.
+        :return: Pathway of snapshot or None if snapshot is missing, outdated or unreadable.
+        :rtype: typing.Optional[keggtools.models.Pathway]
+        """
+        if not self.storage.exist(filename=filename):
+            return None
+
+        try:
+            with self.storage.open(filename=filename) as f_obj:
+                # Header is read first, pathway is only loaded if snapshot is up to date
+                if json.loads(f_obj.readline()) != header:
+                    return None
+
+                return Pathway.model_validate_json(f_obj.read())
+
+        # Snapshot may be removed concurrently or may be written by a version with other models
+        except (OSError, ValueError):
+            return None
+
+    def _parse_pathway(self, filename: str) -> Pathway:
+        """Parse cached KGML file.
+
+        If `pathway_snapshots` is enabled, the parsed pathway is stored as JSON snapshot "<filename>.snapshot". The
+        snapshot is versioned by keggtools version and SHA-256 checksum of the KGML file and is loaded instead of
+        parsing the KGML file again.
+
+        :param str filename: Filename of KGML file.
+        :return: Parsed Pathway instance.
+        :rtype: keggtools.models.Pathway
+        """
+        data: bytes = self.storage.load_bytes(filename=filename)
+
+        if self.pathway_snapshots is False:
+            return Pathway.from_xml(data, engine=self.kgml_engine)
+
+        snapshot: str = f"{filename}.snapshot"
+        header: list[str] = [__version__, hashlib.sha256(data).hexdigest()]
+        pathway: Pathway | None = self._load_snapshot(filename=snapshot, header=header)
+
+        if pathway is None:
+            pathway = Pathway.from_xml(data, engine=self.kgml_engine)
+            self.storage.save_bytes(
+                filename=snapshot,
+                data=json.dumps(header).encode(encoding="utf-8") + b"\n" + pathway.model_dump_json().encode(),
+            )
+
+        return pathway
+
+    def get_pathways(
+        self,
+        organism: str,
+        codes: list[str] | None = None,
+        workers: int = 4,
+        errors: Literal["raise", "skip"] = "raise",
+        **kwargs: Any,
+    ) -> list[Pathway]:
+        """Load and parse many KGML pathways on a thread pool.
+
+        Pathways missing in cache are submitted first, so their requests run while cached pathways are parsed. All
+        requests share the rate limiter of the resolver.
+
+        :param str organism: 3 letter organism code used by KEGG database.
+        :param typing.Optional[typing.List[str]] codes: Pathway identifiers. If None, all pathways of organism are \
+            loaded.
+        :param int workers: Number of threads to request and parse pathways with.
+        :param str errors: "raise" to raise the error of the first failing pathway in order of `codes` and cancel \
+            pending pathways, "skip" to leave out failing pathways and report their codes in a `UserWarning`.
+        :param typing.Any kwargs: other arguments to `requests.get`.
+        :return: List of parsed Pathway instances in order of `codes`.
+        :rtype: typing.List[keggtools.models.Pathway]
+        """
+        if errors not in ("raise", "skip"):
+            raise ValueError(f"Errors must be 'raise' or 'skip'. Got '{errors}'.")
+
+        if codes is None:
+            codes = [key.removeprefix(f"path:{organism}") for key in self.get_pathway_list(organism=organism, **kwargs)]
+
+        cached: dict[str, bool] = self.storage.exist_many(filenames=[f"{organism}_path{code}.kgml" for code in codes])
+
+        result: list[Pathway] = []
+        failed: dict[str, str] = {}
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # Sort is stable, so pathways are submitted in order of codes within missing and cached pathways
+            futures: dict[str, Future[Pathway]] = {
+                code: executor.submit(self.get_pathway, organism=organism, code=code, **kwargs)
+                for code in sorted(codes, key=lambda code: cached[f"{organism}_path{code}.kgml"])
+            }
+
+            for code in codes:
+                try:
+                    result.append(futures[code].result())
+
+                except (OSError, ValueError, SyntaxError) as error:
+                    if errors == "raise":
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        raise
+
+                    failed[code] = str(error)
+
+        if len(failed) > 0:
+            _warn_failed_pathways(organism=organism, failed=failed)
+
+        return result
+
+    def get_pathway_gene_sets(self, organism: str, **kwargs: Any) -> dict[str, list[str]]:
+        """Get genes of all pathways of an organism from the KEGG link table.
+
+        All gene to pathway links of the organism are loaded with a single request, so no KGML pathway needs to be
+        downloaded or parsed. Use `keggtools.analysis.Enrichment.from_gene_sets` to run an enrichment analysis.
+
+        :param str organism: 3 letter organism code used by KEGG database.
+        :param typing.Any kwargs: other arguments to `requests.get`.
+        :return: Dict with format {<pathway number>: [<gene id>, ...]}. Gene ids have no organism prefix, like the \
+            ids of `keggtools.models.Pathway.get_genes`.
+        :rtype: typing.Dict[str, typing.List[str]]
+        """
+        gene_sets: dict[str, list[str]] = {}
+
+        # Rows have format "<org>:<gene id>\tpath:<org><pathway number>"
+        for gene, pathway in self._cache_or_iter(
+            filename=f"pathway_genes_{organism}.tsv",
+            url=f"http://rest.kegg.jp/link/pathway/{organism}",
+            **kwargs,
+        ):
+            gene_sets.setdefault(pathway.removeprefix(f"path:{organism}"), []).append(gene.split(":", 1)[-1])
+
+        return gene_sets
+
+    def _load_image(self, filename: str) -> bytes:
+        """Load PNG image from cache.
+
+        :param str filename: Filename of image.
+        :return: Content of PNG image.
+        :rtype: bytes
+        """
+        return self.storage.load_bytes(filename=filename)
+
+    def _discard_invalid_image(self, filename: str) -> None:
+        """Remove cached image that is not a PNG image, e.g. pickled bytes of older versions.
+
+        Removed images are requested again. Pickles are never loaded, so code in pickles of a shared cache is not run.
+
+        :param str filename: Filename of image.
+        """
+        with self.storage.lock(filename=filename):
+            if not self.storage.exist(filename=filename):
+                return
+
+            with self.storage.open(filename=filename) as f_obj:
+                signature: bytes = f_obj.read(len(PNG_SIGNATURE))
+
+            if signature != PNG_SIGNATURE:
+                self.storage.remove(filename=filename)
+
+    def _read_image_url(self, filename: str) -> str | None:
+        """Read url of prerendered image from cached KGML file. Only the root element of the file is parsed.
+
+        :param str filename: Filename of KGML file.
+        :return: Url of image or None if pathway has no image url.
+        :rtype: typing.Optional[str]
+        """
+        with self.storage.open(filename=filename) as f_obj:
+            _, element = next(ElementTree.iterparse(f_obj, events=("start",)))
+            return element.get("image")
+
+    def _save_image(self, filename: str, response: requests.Response) -> bytes:
+        """Save PNG image of response to cache.
+
+        :param str filename: Filename of image.
+        :param requests.Response response: Response of image request.
+        :return: Content of PNG image.
+        :rtype: bytes
+        """
+        response_content_type: str | None = response.headers.get("Content-Type")
+        if response_content_type != "image/png":
+            warn(
+                message=f"Unexpected Content-Type of {response_content_type}. Possible unsupported.",
+                category=UserWarning,
+                stacklevel=3,
+            )
+
+        # Images are already compressed and are stored raw
+        self.storage.save_bytes(filename=filename, data=response.content, raw=True)
+        return response.content
+
+    def get_pathway_image(self, pathway: Pathway, **kwargs: Any) -> bytes:
+        """Load prerendered PNG image of pathway. Request image from KEGG if not in cache.
+
+        :param keggtools.models.Pathway pathway: Pathway to load image of.
+        :param typing.Any kwargs: other arguments to `requests.get`.
+        :return: Content of PNG image.
+        :rtype: bytes
+        :raises ValueError: If pathway has no image url.
+        """
+        image_filename: str = f"{pathway.name.split(':')[1]}_image.png"
+        self._discard_invalid_image(filename=image_filename)
+
+        if pathway.image is None:
+            if self.storage.exist(filename=image_filename):
+                return self._load_image(filename=image_filename)
+
+            raise ValueError(f"Pathway '{pathway.name}' has no image url.")
+
+        return self._cached(
+            filename=image_filename, url=pathway.image, load=self._load_image, save=self._save_image, **kwargs
+        )
+
+    def prefetch(
+        self,
+        organism: str,
+        include_images: bool = False,
+        workers: int = 4,
+        resume: bool = True,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """Download all resources of an organism into the cache, e.g. to use the cache on nodes without internet access.
+
+        Downloads the pathway list, every KGML pathway, the gene to pathway links, the compound and organism lists and
+        optionally the prerendered pathway images. Each completed download is recorded in the journal file
+        `prefetch_<org>.journal`, so an interrupted run continues where it stopped. Cached files without a journal
+        record are kept if they match the checksum recorded by the storage when they were written (e.g. files of a
+        warm cache) and are downloaded again otherwise (e.g. files truncated by an interrupted run). A summary of all
+        files is written to `prefetch_<org>_manifest.json`.
+
+        :param str organism: 3 letter organism code used by KEGG database.
+        :param bool include_images: Also download the prerendered PNG image of each pathway.
+        :param int workers: Number of threads to request pathways with. All requests share the rate limiter of the \
+            resolver.
+        :param bool resume: Skip files recorded in the journal of a previous run and valid cached files. Set to \
+            `False` to download everything again.
+        :param typing.Any kwargs: other arguments to `requests.get`.
+        :return: Manifest dict with the size of each fetched file and the list of failed downloads.
+        :rtype: typing.Dict[str, typing.Any]
+        """
+        journal_filename: str = f"prefetch_{organism}.journal"
+        journal_lock: threading.Lock = threading.Lock()
+
+        completed: set[str] = set()
+        if resume is True and self.storage.exist(filename=journal_filename):
+            completed = set(self.storage.load(filename=journal_filename).splitlines())
+        else:
+            self.storage.save(filename=journal_filename, data="")
+
+        failed: dict[str, str] = {}
+
+        def adopt(filenames: list[str]) -> None:
+            """Record cached files without journal record that match their recorded checksum."""
+            if resume is False:
+                return
+
+            existing: dict[str, bool] = self.storage.exist_many(
+                filenames=[filename for filename in filenames if filename not in completed]
+            )
+            candidates: list[str] = [filename for filename, exists in existing.items() if exists]
+
+            if len(candidates) == 0:
+                return
+
+            # Files without recorded checksum may be incomplete and are downloaded again
+            report: dict[str, Any] = self.storage.verify(workers=workers, filenames=candidates)
+            invalid: set[str] = set(report["corrupt"]) | set(report["unverified"])
+            valid: list[str] = [filename for filename in candidates if filename not in invalid]
+
+            if len(valid) > 0:
+                self.storage.append(filename=journal_filename, data="".join(f"{filename}\n" for filename in valid))
+                completed.update(valid)
+
+        def fetch(filename: str, url: str, image_of: str | None = None) -> None:
+            """Download resource if not recorded in journal and record completed download."""
+            if filename in completed and self.storage.exist(filename=filename):
+                return
+
+            try:
+                with self.storage.lock(filename=filename):
+                    # Remove files of interrupted runs before request
+                    if filename not in completed and self.storage.exist(filename=filename):
+                        self.storage.remove(filename=filename)
+
+                    if image_of is not None:
+                        image_url: str | None = self._read_image_url(filename=image_of)
+
+                        if not image_url:
+                            raise ValueError(f"Pathway of '{image_of}' has no image url.")
+
+                        self._cached(
+                            filename=filename,
+                            url=image_url,
+                            load=lambda filename: None,
+                            save=self._save_image,
+                            **kwargs,
+                        )
+                    else:
+                        self._cache_or_download(filename=filename, url=url, **kwargs)
+
+            except (requests.RequestException, ValueError, ElementTree.ParseError) as error:
+                with journal_lock:
+                    failed[filename] = str(error)
+                return
+
+            with journal_lock:
+                self.storage.append(filename=journal_filename, data=f"{filename}\n")
+                completed.add(filename)
+
+        # Lists
+        lists: list[tuple[str, str]] = [
+            (f"pathway_list_{organism}.tsv", f"http://rest.kegg.jp/list/pathway/{organism}"),
+            ("compound.tsv", "http://rest.kegg.jp/list/compound"),
+            ("organism.tsv", "http://rest.kegg.jp/list/organism"),
+            (f"pathway_genes_{organism}.tsv", f"http://rest.kegg.jp/link/pathway/{organism}"),
+        ]
+        adopt(filenames=[filename for filename, _ in lists])
+
+        for filename, url in lists:
+            fetch(filename=filename, url=url)
+
+        codes: list[str] = [
+            key.removeprefix(f"path:{organism}") for key in self.get_pathway_list(organism=organism, **kwargs)
+        ]
+
+        # KGML pathways
+        adopt(filenames=[f"{organism}_path{code}.kgml" for code in codes])
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(
+                executor.map(
+                    lambda code: fetch(
+                        filename=f"{organism}_path{code}.kgml",
+                        url=f"http://rest.kegg.jp/get/{organism}{code}/kgml",
+                    ),
+                    codes,
+                )
+            )
+
+            # Prerendered images. Image url is parsed from KGML pathway.
+            if include_images is True:
+                adopt(filenames=[f"{organism}{code}_image.png" for code in codes])
+
+                list(
+                    executor.map(
+                        lambda code: fetch(
+                            filename=f"{organism}{code}_image.png",
+                            url="",
+                            image_of=f"{organism}_path{code}.kgml",
+                        ),
+                        [code for code in codes if f"{organism}_path{code}.kgml" in completed],
+                    )
+                )
+
+        existing: dict[str, bool] = self.storage.exist_many(filenames=sorted(completed))
+
+        manifest: dict[str, Any] = {
+            "organism": organism,
+            "keggtools_version": __version__,
+            "created": datetime.now(tz=UTC).isoformat(),
+            "files": {
+                filename: self.storage.size(filename=filename) for filename, exists in existing.items() if exists
+            },
+            "failed": failed,
+        }
+
+        self.storage.save(filename=f"prefetch_{organism}_manifest.json", data=json.dumps(manifest, indent=2))
+
+        return manifest
+
+    def repair(self, workers: int | None = None, **kwargs: Any) -> dict[str, Any]:
+        """Verify cached files and request corrupt files again, e.g. as pre-flight check before batch jobs.
+
+        Corrupt files (truncated or damaged after they were written) are quarantined by `BaseStorage.verify` and are
+        requested again from the url recorded in their metadata.
+
+        :param typing.Optional[int] workers: Number of threads to hash files with.
+        :param typing.Any kwargs: other arguments to `requests.get`.
+        :return: Report of `BaseStorage.verify` with list of requested files and dict of files that could not be \
+            requested to reason.
+        :rtype: typing.Dict[str, typing.Any]
+        """
+        report: dict[str, Any] = self.storage.verify(workers=workers, quarantine=True)
+        refetched: list[str] = []
+        failed: dict[str, str] = {}
+
+        for filename in report["quarantined"]:
+            meta: dict[str, Any] | None = self.storage.load_meta(filename=filename)
+
+            if meta is None or meta.get("url") is None:
+                failed[filename] = "Url of file is unknown."
+                continue
+
+            try:
+                if resource_class(filename=filename) == "image":
+                    self._cached(
+                        filename=filename, url=meta["url"], load=self._load_image, save=self._save_image, **kwargs
+                    )
+                else:
+                    self._cache_or_download(filename=filename, url=meta["url"], **kwargs)
+
+            except requests.RequestException as error:
+                failed[filename] = str(error)
+                continue
+
+            refetched.append(filename)
+
+        return {**report, "refetched": refetched, "failed": failed}
 
     def get_compounds(self, **kwargs: Any) -> dict[str, str]:
         """Get dict of components. Request from KEGG API if not in cache.
@@ -224,6 +1167,19 @@ class Resolver:
             **kwargs,
         )
 
+    def iter_compounds(self, **kwargs: Any) -> Iterator[tuple[str, str]]:
+        """Iterate over compounds. File is parsed line by line. Request from KEGG API if not in cache.
+
+        :param typing.Any kwargs: other arguments to `requests.get`.
+        :return: Iterator over tuples of compound identifier and compound name.
+        :rtype: typing.Iterator[typing.Tuple[str, str]]
+        """
+        return self._cache_or_iter(
+            filename="compound.tsv",
+            url="http://rest.kegg.jp/list/compound",
+            **kwargs,
+        )
+
     def get_organism_list(self, **kwargs: Any) -> dict[str, str]:
         """Get organism codes from file or KEGG API.
 
@@ -239,6 +1195,44 @@ class Resolver:
             **kwargs,
         )
 
+    def iter_organism_list(self, **kwargs: Any) -> Iterator[tuple[str, str]]:
+        """Iterate over organism codes. File is parsed line by line. Request from KEGG API if not in cache.
+
+        :param typing.Any kwargs: other arguments to `requests.get`.
+        :return: Iterator over tuples of organism code and name.
+        :rtype: typing.Iterator[typing.Tuple[str, str]]
+        """
+        return self._cache_or_iter(
+            filename="organism.tsv",
+            url="http://rest.kegg.jp/list/organism",
+            col_keys=1,
+            col_values=2,
+            **kwargs,
+        )
+
+    def get_organism_index(self, **kwargs: Any) -> OrganismIndex:
+        """Get index of organisms to look up organisms by code, T number or name.
+
+        The organism list is parsed once and kept in memory until the cached file is changed.
+
+        :param typing.Any kwargs: other arguments to `requests.get`.
+        :return: Index of organism list.
+        :rtype: keggtools.organism.OrganismIndex
+        """
+        filename: str = "organism.tsv"
+
+        def load(filename: str) -> OrganismIndex:
+            version: float = self.storage.mtime(filename=filename)
+            index: OrganismIndex | None = self._organism_index.get(key=filename, version=version)
+
+            if index is None:
+                index = OrganismIndex.from_lines(self.storage.iter_lines(filename=filename))
+                self._organism_index.put(key=filename, value=index, version=version)
+
+            return index
+
+        return self._cache_or_load(filename=filename, url="http://rest.kegg.jp/list/organism", load=load, **kwargs)
+
     def check_organism(self, organism: str) -> bool:
         """Check if organism code exist.
 
@@ -246,5 +1240,384 @@ class Resolver:
         :return: Returns True if organism code is found in list of valid organisms.
         :rtype: bool
         """
-        organism_list = self.get_organism_list()
-        return organism_list.get(organism) is not None
+        return organism in self.get_organism_index()
+
+    def _validate_organism(self, organism: str) -> None:
+        """Check organism code of request against the organism list, if the list is cached.
+
+        The organism list is not requested for the check, so lookups of a new cache do not request the list of all
+        organisms first.
+
+        :param str organism: 3 letter organism code used by KEGG database.
+        :raises ValueError: If organism code is not in cached organism list.
+        """
+        if not self.storage.exist(filename="organism.tsv"):
+            return
+
+        if not is_valid_pathway_org(value=organism, organisms=self.get_organism_index()):
+            raise ValueError(f"Organism code '{organism}' is not in the list of KEGG organisms.")
+
+    def _cache_or_read_table(
+        self,
+        filename: str,
+        url: str,
+        parse: Callable[[IO[bytes]], pd.DataFrame],
+        **kwargs: Any,
+    ) -> pd.DataFrame:
+        """Load table from cache folder or request from url. Parsed tables are kept in memory until the file changes.
+
+        :param str filename: Filename to store in cache folder.
+        :param str url: Url to online resource.
+        :param typing.Callable parse: Function to parse table from binary file object of cached file.
+        :param typing.Any kwargs: Other arguments to `requests.get`.
+        :return: Parsed table.
+        :rtype: pandas.DataFrame
+        """
+
+        def load(filename: str) -> pd.DataFrame:
+            version: float = self.storage.mtime(filename=filename)
+            table: pd.DataFrame | None = self._tables.get(key=filename, version=version)
+
+            if table is None:
+                with self.storage.open(filename=filename) as f_obj:
+                    table = parse(f_obj)
+                self._tables.put(key=filename, value=table, version=version)
+
+            return table
+
+        return self._cache_or_load(filename=filename, url=url, load=load, **kwargs)
+
+    def get_conversion_table(self, organism: str, target: str = "ncbi-geneid", **kwargs: Any) -> pd.DataFrame:
+        """Get table to convert KEGG gene ids of an organism to ids of another database.
+
+        The table is downloaded once from the KEGG conv endpoint and stored in the cache folder.
+
+        :param str organism: 3 letter organism code used by KEGG database.
+        :param str target: Target database, e.g. "ncbi-geneid", "ncbi-proteinid" or "uniprot".
+        :param typing.Any kwargs: other arguments to `requests.get`.
+        :return: Table with columns "kegg" and `target`. Ids have no database prefix, e.g. "3605" for "hsa:3605".
+        :rtype: pandas.DataFrame
+        """
+
+        def parse(f_obj: IO[bytes]) -> pd.DataFrame:
+            """Parse rows of source id and target id, both with database prefix."""
+            table: pd.DataFrame = pd.read_csv(f_obj, sep="\t", header=None, usecols=[0, 1], dtype=str)
+
+            # Column of KEGG gene ids is found by organism prefix, so files of both orders of columns are parsed
+            kegg_column: int = 1 if len(table) > 0 and not table[0].iloc[0].startswith(f"{organism}:") else 0
+
+            return pd.DataFrame(
+                {
+                    "kegg": table[kegg_column].str.partition(":")[2],
+                    target: table[1 - kegg_column].str.partition(":")[2],
+                }
+            )
+
+        # Rows of "/conv/<target db>/<source db>" start with id of source database
+        return self._cache_or_read_table(
+            filename=f"conv_{organism}_{target}.tsv",
+            url=f"http://rest.kegg.jp/conv/{target}/{organism}",
+            parse=parse,
+            **kwargs,
+        )
+
+    def get_gene_symbols(self, organism: str, **kwargs: Any) -> pd.DataFrame:
+        """Get table of gene symbols of all genes of an organism.
+
+        The gene list is downloaded once from KEGG and stored in the cache folder. Genes without symbol are skipped.
+
+        :param str organism: 3 letter organism code used by KEGG database.
+        :param typing.Any kwargs: other arguments to `requests.get`.
+        :return: Table with columns "kegg" and "symbol". Gene ids have no organism prefix.
+        :rtype: pandas.DataFrame
+        """
+
+        def parse(f_obj: IO[bytes]) -> pd.DataFrame:
+            """Parse gene list. Last column has format "<symbol>, <alias>, ...; <description>"."""
+            table: pd.DataFrame = pd.read_csv(f_obj, sep="\t", header=None, dtype=str, quoting=csv.QUOTE_NONE)
+            description: pd.Series = table.iloc[:, -1].fillna("")
+
+            symbols: pd.DataFrame = pd.DataFrame(
+                {
+                    "kegg": table.iloc[:, 0].str.partition(":")[2],
+                    "symbol": description.str.partition(";")[0].str.partition(",")[0].str.strip(),
+                }
+            )
+            return symbols[description.str.contains(";", regex=False)].reset_index(drop=True)
+
+        return self._cache_or_read_table(
+            filename=f"gene_list_{organism}.tsv",
+            url=f"http://rest.kegg.jp/list/{organism}",
+            parse=parse,
+            **kwargs,
+        )
+
+    def _load_gene_names(self, filename: str) -> dict[str, str]:
+        """Load cached gene names of an organism.
+
+        :param str filename: Name of file with cached names.
+        :return: Dict of gene idenifier to gene name. Empty if no names are cached.
+        :rtype: typing.Dict[str, str]
+        """
+        if not self.storage.exist(filename=filename):
+            return {}
+
+        return parse_tsv_to_dict(data=self.storage.load(filename=filename))
+
+    def get_gene_names(
+        self,
+        genes: list[str],
+        max_genes: int = 50,
+        workers: int = 4,
+        **kwargs: Any,
+    ) -> dict[str, str]:
+        """Resolve KEGG gene identifer to name.
+
+        Resolved names are cached per organism, so only unknown genes are requested.
+
+        :param typing.List[str] genes: List of gene identifer in format "<organism>:<code>"
+        :param int max_genes: Maximal number of genes per request.
+        :param int workers: Number of threads to request chunks with. All requests share the rate limiter of the \
+            resolver.
+        :param typing.Any kwargs: other arguments to `Transport.get`.
+        :return: Dict of gene idenifier to gene name.
+        :rtype: typing.Dict[str, str]
+        """
+        if len(genes) == 0:
+            raise ValueError("No items to request.")
+
+        organisms: set[str] = {gene.split(":")[0] for gene in genes}
+
+        # Load cached names of all organisms in request
+        cached: dict[str, dict[str, str]] = {
+            organism: self._load_gene_names(filename=f"gene_names_{organism}.tsv") for organism in organisms
+        }
+
+        missing: list[str] = [gene for gene in genes if gene not in cached[gene.split(":")[0]]]
+
+        if len(missing) > 0:
+            # Names are requested without holding locks, so other threads and processes can read the cache meanwhile
+            kwargs.setdefault("timeout", self.timeout)
+            resolved: dict[str, str] = get_gene_names(
+                genes=missing,
+                max_genes=max_genes,
+                workers=workers,
+                session=self.transport,
+                retries=self.retries,
+                backoff_factor=self.backoff_factor,
+                rate_limiter=self.rate_limiter,
+                **kwargs,
+            )
+
+            # Genes unknown to KEGG are cached with an empty name to avoid repeated requests
+            for organism in sorted({gene.split(":")[0] for gene in missing}):
+                filename: str = f"gene_names_{organism}.tsv"
+
+                # Names cached by others since loading are merged with read-modify-write under the lock of the file
+                with self.storage.lock(filename=filename):
+                    merged: dict[str, str] = self._load_gene_names(filename=filename)
+                    for gene in missing:
+                        if gene.split(":")[0] == organism:
+                            merged.setdefault(gene, resolved.get(gene, ""))
+
+                    self.storage.save(
+                        filename=filename,
+                        data="".join(f"{key}\t{value}\n" for key, value in merged.items()),
+                    )
+
+                cached[organism] = merged
+
+        result: dict[str, str] = {}
+        for gene in genes:
+            name: str = cached[gene.split(":")[0]].get(gene, "")
+            if name != "":
+                result[gene] = name
+
+        return result
+
+
+class AsyncResolver:
+    """Asyncio interface for KEGG API endpoint.
+
+    Requests, cache access and KGML parsing of the wrapped `Resolver` run in an executor, so the event loop is never
+    blocked. The number of concurrently running calls is bounded by a semaphore.
+    """
+
+    def __init__(
+        self,
+        cache: BaseStorage | str | None = None,
+        resolver: Resolver | None = None,
+        max_concurrency: int = 4,
+        executor: Executor | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Init AsyncResolver instance.
+
+        :param typing.Optional[typing.Union[BaseStorage, str]] cache: Directory to use as cache storage or storage \
+            instance, e.g. `SQLiteStorage`.
+        :param typing.Optional[Resolver] resolver: Resolver to wrap. If None, a resolver is created from `cache`. \
+            Passed resolvers are not closed by `close`.
+        :param int max_concurrency: Maximal number of concurrent requests and parsing jobs.
+        :param typing.Optional[concurrent.futures.Executor] executor: Executor to run blocking calls in. If None, a \
+            thread pool with `max_concurrency` workers is created.
+        :param typing.Any kwargs: Other arguments to `Resolver`, if no resolver is passed.
+        """
+        self._owns_resolver: bool = resolver is None
+
+        if resolver is None:
+            kwargs.setdefault("pool_maxsize", max_concurrency)
+            resolver = Resolver(cache=cache, **kwargs)
+
+        # Wrapped resolver shares the cache semantics of the synchronous interface
+        self.resolver: Resolver = resolver
+        self.storage: BaseStorage = resolver.storage
+
+        self.max_concurrency: int = max_concurrency
+
+        self._owns_executor: bool = executor is None
+        self._executor: Executor = executor if executor is not None else ThreadPoolExecutor(max_workers=max_concurrency)
+
+        # Semaphores are bound to the event loop they are used in
+        self._semaphores: WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = WeakKeyDictionary()
+
+    async def _run(self, func: Callable[..., _T], *args: Any, **kwargs: Any) -> _T:
+        """Run blocking function in executor, bounded by the concurrency limit.
+
+        :param typing.Callable func: Function to run.
+        :param typing.Any args: Positional arguments to function.
+        :param typing.Any kwargs: Keyword arguments to function.
+        :return: Return value of function.
+        """
+        loop = asyncio.get_running_loop()
+
+        if loop not in self._semaphores:
+            self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+
+        async with self._semaphores[loop]:
+            return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+
+    def close(self) -> None:
+        """Shutdown executor and close wrapped resolver. Executor and resolver passed by the caller are not closed.
+
+        Waits for running calls to finish. Use `aclose` inside of an event loop.
+        """
+        if self._owns_executor is True:
+            self._executor.shutdown(wait=True)
+        if self._owns_resolver is True:
+            self.resolver.close()
+
+    async def aclose(self) -> None:
+        """Shutdown executor and close wrapped resolver without blocking the event loop."""
+        # Shutdown waits for running calls, so it runs in a thread outside of the executor to shut down
+        await asyncio.to_thread(self.close)
+
+    async def __aenter__(self) -> "AsyncResolver":
+        """Enter async context of resolver."""
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        """Close resolver on exit of async context."""
+        await self.aclose()
+
+    async def get_pathway_list(self, organism: str, **kwargs: Any) -> dict[str, str]:
+        """Request list of pathways linked to organism.
+
+        :param str organism: 3 letter organism code used by KEGG database.
+        :param typing.Any kwargs: other arguments to `requests.get`.
+        :return: Dict in format {<pathway-id>: <name>}.
+        :rtype: typing.Dict[str, str]
+        """
+        return await self._run(self.resolver.get_pathway_list, organism=organism, **kwargs)
+
+    async def get_pathway(self, organism: str, code: str, **kwargs: Any) -> Pathway:
+        """Load and parse KGML pathway by identifier. Parsing runs in the executor.
+
+        :param str organism: 3 letter organism code used by KEGG database.
+        :param str code: Pathway identify used by KEGG database.
+        :param typing.Any kwargs: other arguments to `requests.get`.
+        :return: Returns parsed Pathway instance.
+        :rtype: keggtools.models.Pathway
+        """
+        return await self._run(self.resolver.get_pathway, organism=organism, code=code, **kwargs)
+
+    async def get_pathways(
+        self,
+        organism: str,
+        codes: list[str] | None = None,
+        errors: Literal["raise", "skip"] = "raise",
+        **kwargs: Any,
+    ) -> list[Pathway]:
+        """Load and parse many KGML pathways concurrently.
+
+        :param str organism: 3 letter organism code used by KEGG database.
+        :param typing.Optional[typing.List[str]] codes: Pathway identifiers. If None, all pathways of organism are \
+            loaded.
+        :param str errors: "raise" to raise the error of the first failing pathway in order of `codes`, "skip" to \
+            leave out failing pathways and report their codes in a `UserWarning`.
+        :param typing.Any kwargs: other arguments to `requests.get`.
+        :return: List of parsed Pathway instances in order of `codes`.
+        :rtype: typing.List[keggtools.models.Pathway]
+        """
+        if errors not in ("raise", "skip"):
+            raise ValueError(f"Errors must be 'raise' or 'skip'. Got '{errors}'.")
+
+        if codes is None:
+            pathway_list: dict[str, str] = await self.get_pathway_list(organism=organism, **kwargs)
+            codes = [key.removeprefix(f"path:{organism}") for key in pathway_list]
+
+        results: list[Pathway | BaseException] = await asyncio.gather(
+            *[self.get_pathway(organism=organism, code=code, **kwargs) for code in codes], return_exceptions=True
+        )
+
+        pathways: list[Pathway] = []
+        failed: dict[str, str] = {}
+
+        for code, item in zip(codes, results, strict=True):
+            if isinstance(item, Pathway):
+                pathways.append(item)
+            elif errors == "raise" or not isinstance(item, (OSError, ValueError, SyntaxError)):
+                raise item
+            else:
+                failed[code] = str(item)
+
+        if len(failed) > 0:
+            _warn_failed_pathways(organism=organism, failed=failed)
+
+        return pathways
+
+    async def get_pathway_gene_sets(self, organism: str, **kwargs: Any) -> dict[str, list[str]]:
+        """Get genes of all pathways of an organism from the KEGG link table.
+
+        :param str organism: 3 letter organism code used by KEGG database.
+        :param typing.Any kwargs: other arguments to `requests.get`.
+        :return: Dict with format {<pathway number>: [<gene id>, ...]}.
+        :rtype: typing.Dict[str, typing.List[str]]
+        """
+        return await self._run(self.resolver.get_pathway_gene_sets, organism=organism, **kwargs)
+
+    async def get_compounds(self, **kwargs: Any) -> dict[str, str]:
+        """Get dict of components. Request from KEGG API if not in cache.
+
+        :param typing.Any kwargs: other arguments to `requests.get`.
+        :return: Dict of compound identifier to compound name.
+        :rtype: typing.Dict[str, str]
+        """
+        return await self._run(self.resolver.get_compounds, **kwargs)
+
+    async def get_organism_list(self, **kwargs: Any) -> dict[str, str]:
+        """Get organism codes from file or KEGG API.
+
+        :param typing.Any kwargs: other arguments to `requests.get`.
+        :return: Dict with format {<org>: <org-name>}
+        :rtype: typing.Dict[str, str]
+        """
+        return await self._run(self.resolver.get_organism_list, **kwargs)
+
+    async def check_organism(self, organism: str) -> bool:
+        """Check if organism code exist.
+
+        :param str organism: 3 letter organism code used by KEGG database.
+        :return: Returns True if organism code is found in list of valid organisms.
+        :rtype: bool
+        """
+        return await self._run(self.resolver.check_organism, organism=organism)
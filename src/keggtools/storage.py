@@ -1,18 +1,963 @@
 """Storage of KEGG data. Caching downloaded files from API to local file system."""
 
+import fnmatch
+import gzip
+import hashlib
+import io
+import itertools
+import json
+import mmap
 import os
 import pickle
-from typing import Any
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from abc import ABC, abstractmethod
+from collections.abc import Generator, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import IO, Any, Literal, cast
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    # Advisory file locks are not available on Windows. Locks are only shared across threads.
+    fcntl = None  # type: ignore[assignment]
 
-class Storage:
-    """Storage handler class."""
+# Resource classes of cached files by file extension. Other files belong to class "other".
+RESOURCE_CLASSES: dict[str, str] = {
+    ".tsv": "list",
+    ".kgml": "kgml",
+    ".png": "image",
+}
 
-    def __init__(self, cachedir: str | None = None) -> None:
+# Files derived from cached files by resource class, e.g. snapshots of parsed pathways. Derived files are removed
+# together with the file they were derived from.
+DERIVED_SUFFIXES: dict[str, tuple[str, ...]] = {
+    "kgml": (".snapshot",),
+}
+
+# Journals of checksums of files in cache folder. Files are mapped to journals "<prefix>.<n>" by hash.
+CHECKSUM_JOURNAL: str = ".checksums"
+
+# Files that are never evicted from size-capped storage
+DEFAULT_PINNED: tuple[str, ...] = ("organism.tsv", "compound.tsv", "pathway_list_*", "prefetch_*")
+
+# Supported compression formats of cached files by magic number
+COMPRESSIONS: dict[str, bytes] = {
+    "gzip": b"\x1f\x8b",
+    "zstd": b"\x28\xb5\x2f\xfd",
+}
+
+
+def _import_zstd() -> Any:
+    """Import zstd module. Python 3.14 ships zstd, older versions require the optional `zstandard` package.
+
+    :return: Module `compression.zstd` or `zstandard`.
+    :rtype: typing.Any
+    """
+    try:
+        from compression import zstd  # ty: ignore[unresolved-import]
+
+        return zstd
+    except ImportError:
+        pass
+
+    try:
+        import zstandard
+    except ImportError as error:
+        raise ImportError("Compression 'zstd' requires Python 3.14 or the 'zstandard' package.") from error
+
+    return zstandard
+
+
+def detect_compression(head: bytes) -> str | None:
+    """Detect compression format of file by its first bytes.
+
+    :param bytes head: First 4 bytes of file.
+    :return: Name of compression format or None if file is not compressed.
+    :rtype: typing.Optional[str]
+    """
+    for compression, magic in COMPRESSIONS.items():
+        if head.startswith(magic):
+            return compression
+
+    return None
+
+
+def compress(data: bytes, compression: str | None) -> bytes:
+    """Compress data.
+
+    :param bytes data: Data to compress.
+    :param typing.Optional[str] compression: Compression format ("gzip" or "zstd"). Data is returned unchanged if None.
+    :return: Compressed data.
+    :rtype: bytes
+    """
+    if compression is None:
+        return data
+
+    if compression == "gzip":
+        return gzip.compress(data, mtime=0)
+
+    return _import_zstd().compress(data)
+
+
+def _compressed_writer(f_obj: IO[bytes], compression: str | None) -> IO[bytes]:
+    """Wrap binary file object to compress written data. Wrapper must be closed before file object.
+
+    :param typing.IO[bytes] f_obj: File object to write compressed data to.
+    :param typing.Optional[str] compression: Compression format. File object is returned unchanged if None.
+    :return: File object to write uncompressed data to.
+    :rtype: typing.IO[bytes]
+    """
+    if compression is None:
+        return f_obj
+
+    if compression == "gzip":
+        return cast(IO[bytes], gzip.GzipFile(fileobj=f_obj, mode="wb", mtime=0))
+
+    zstd: Any = _import_zstd()
+
+    if hasattr(zstd, "ZstdFile"):
+        return zstd.ZstdFile(f_obj, mode="wb")
+
+    return zstd.ZstdCompressor().stream_writer(f_obj, closefd=False)
+
+
+def _decompressed_reader(f_obj: IO[bytes]) -> IO[bytes]:
+    """Wrap binary file object to decompress read data. Compression format is detected by magic number.
+
+    :param typing.IO[bytes] f_obj: Seekable file object of compressed or uncompressed data.
+    :return: File object to read uncompressed data from.
+    :rtype: typing.IO[bytes]
+    """
+    compression: str | None = detect_compression(f_obj.read(4))
+    f_obj.seek(0)
+
+    if compression is None:
+        return f_obj
+
+    if compression == "gzip":
+        return cast(IO[bytes], gzip.GzipFile(fileobj=f_obj, mode="rb"))
+
+    zstd: Any = _import_zstd()
+
+    if hasattr(zstd, "ZstdFile"):
+        return zstd.ZstdFile(f_obj, mode="rb")
+
+    # Appended data is stored as additional frame
+    return io.BufferedReader(zstd.ZstdDecompressor().stream_reader(f_obj, read_across_frames=True, closefd=False))
+
+
+def _decompress(data: bytes) -> bytes:
+    """Decompress data. Compression format is detected by magic number.
+
+    :param bytes data: Compressed or uncompressed data.
+    :return: Uncompressed data.
+    :rtype: bytes
+    """
+    if detect_compression(data[:4]) is None:
+        return data
+
+    with _decompressed_reader(io.BytesIO(data)) as reader:
+        return reader.read()
+
+
+class _HashingWriter(io.RawIOBase):
+    """Binary writer that computes size and SHA-256 checksum of written data."""
+
+    def __init__(self, f_obj: IO[bytes]) -> None:
+        """Init _HashingWriter instance.
+
+        :param typing.IO[bytes] f_obj: File object to write data to.
+        """
+        super().__init__()
+        self.f_obj: IO[bytes] = f_obj
+        self.hash: Any = hashlib.sha256()
+        self.size: int = 0
+
+    def writable(self) -> bool:
+        """Writer is writable."""
+        return True
+
+    def write(self, data: Any) -> int:
+        """Write data to file object and update checksum.
+
+        :param typing.Any data: Bytes-like object to write.
+        :return: Number of written bytes.
+        :rtype: int
+        """
+        self.hash.update(data)
+        self.size += len(data)
+        return self.f_obj.write(data)
+
+
+def resource_class(filename: str) -> str:
+    """Get resource class of file by its file extension.
+
+    :param str filename: Filename of file.
+    :return: Resource class ("list", "kgml", "image" or "other").
+    :rtype: str
+    """
+    return RESOURCE_CLASSES.get(os.path.splitext(filename)[1], "other")
+
+
+class BaseStorage(ABC):
+    """Interface of storage backends to cache files of the KEGG API.
+
+    Files are addressed by filename. Backends implement the primitives `exist`, `_read`, `_write`, `remove`, `mtime`
+    and `size` and optionally a lock file shared across processes (see `_lock_path`). Writes of a backend are atomic, so readers never see a
+    partially written file and do not need a lock.
+
+    Files can be stored compressed with gzip or zstd. Compressed files are detected by their magic number and are
+    decompressed transparently on load, so a cache may contain compressed and uncompressed files.
+
+    Storage can be capped to a byte budget. If a write exceeds the budget, least recently used (or least frequently
+    used) files are evicted. Usage is tracked in memory from lookups and writes of this instance. The index is built
+    with a single scan of the storage on first use, so lookups and loads do not stat files.
+    """
+
+    def __init__(
+        self,
+        compression: str | None = None,
+        max_size: int | dict[str, int] | None = None,
+        eviction: Literal["lru", "lfu"] = "lru",
+        pinned: Iterable[str] = DEFAULT_PINNED,
+    ) -> None:
+        """Init storage backend.
+
+        :param typing.Optional[str] compression: Compression format of saved files ("gzip" or "zstd"). zstd requires \
+            Python 3.14 or the `zstandard` package. If None, files are saved uncompressed.
+        :param typing.Optional[typing.Union[int, typing.Dict[str, int]]] max_size: Byte budget of storage or dict of \
+            byte budget per resource class ("list", "kgml", "image" or "other"). Classes without budget are not \
+            capped. If None, storage grows without bound.
+        :param str eviction: Eviction policy if budget is exceeded. "lru" evicts least recently used files first, \
+            "lfu" evicts least frequently used files first.
+        :param typing.Iterable[str] pinned: Filename patterns (like "organism.tsv" or "prefetch_*") of files that \
+            are never evicted.
+        """
+        if compression is not None and compression not in COMPRESSIONS:
+            raise ValueError(f"Compression must be one of {', '.join(COMPRESSIONS)}. Got '{compression}'.")
+
+        if eviction not in ("lru", "lfu"):
+            raise ValueError(f"Eviction policy must be 'lru' or 'lfu'. Got '{eviction}'.")
+
+        self.compression: str | None = compression
+        self.max_size: int | dict[str, int] | None = max_size
+        self.eviction: Literal["lru", "lfu"] = eviction
+        self.pinned: tuple[str, ...] = tuple(pinned)
+
+        # Usage index of filename to [size, time of last access, number of accesses]. Built on first use.
+        self._usage_lock: threading.Lock = threading.Lock()
+        self._entries: dict[str, list[int]] | None = None
+        self._class_sizes: dict[str, int] = {}
+        self._ticks: Iterator[int] = itertools.count()
+
+        # Counters of cache usage
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+        # Per-key thread locks and nesting depth of the process lock held by the owning thread
+        self._locks_guard: threading.Lock = threading.Lock()
+        self._locks: dict[str, threading.RLock] = {}
+        self._lock_depth: dict[str, int] = {}
+
+    def _lock_key(self, filename: str) -> str:
+        """Get key of lock that protects file.
+
+        :param str filename: Name of file to lock.
+        :return: Key of lock.
+        :rtype: str
+        """
+        return filename
+
+    def _lock_path(self, key: str) -> str | None:
+        """Get path of lock file that shares the lock across processes. Lock is not shared across processes by default.
+
+        :param str key: Key of lock.
+        :return: Path of lock file or None if lock is not shared across processes.
+        :rtype: typing.Optional[str]
+        """
+        return None
+
+    def _acquire_process_lock(self, key: str, blocking: bool = True) -> IO[str] | None:
+        """Acquire advisory lock on lock file of `_lock_path`.
+
+        :param str key: Key of lock.
+        :param bool blocking: Wait for lock. If False, `BlockingIOError` is raised if lock is held.
+        :return: Open lock file or None if lock is not shared across processes or file locks are not supported.
+        :rtype: typing.Optional[typing.IO[str]]
+        """
+        path: str | None = self._lock_path(key=key)
+
+        if path is None or fcntl is None:
+            return None
+
+        lock_file: IO[str] = open(path, "a")
+
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX if blocking is True else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            raise
+
+        return lock_file
+
+    def _release_process_lock(self, handle: IO[str] | None) -> None:
+        """Release advisory lock and close lock file.
+
+        :param typing.Optional[typing.IO[str]] handle: Open lock file.
+        """
+        if handle is not None and fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+            handle.close()
+
+    @contextmanager
+    def lock(self, filename: str) -> Generator[None, None, None]:
+        """Acquire exclusive lock for file.
+
+        The lock is shared across threads and, if supported by the backend, across processes. It is reentrant within
+        a thread. Writes of the storage take the lock of the file.
+
+        :param str filename: Name of file to lock.
+        """
+        with self._hold_lock(filename=filename, blocking=True):
+            yield
+
+    def _remove_derived(self, filename: str) -> None:
+        """Remove files derived from file, e.g. snapshots of a removed KGML file.
+
+        Derived files locked by other writers are skipped, so callers holding locks of other files never wait.
+
+        :param str filename: Filename of removed file.
+        """
+        for suffix in DERIVED_SUFFIXES.get(resource_class(filename), ()):
+            with self._hold_lock(filename=f"{filename}{suffix}", blocking=False) as locked:
+                if locked is True:
+                    self.remove(filename=f"{filename}{suffix}")
+
+    @contextmanager
+    def _hold_lock(self, filename: str, blocking: bool) -> Generator[bool, None, None]:
+        """Acquire exclusive lock for file.
+
+        :param str filename: Name of file to lock.
+        :param bool blocking: Wait for lock. If False, the lock is only acquired if it is free.
+        :return: Context manager of True if lock was acquired.
+        :rtype: typing.Generator[bool, None, None]
+        """
+        key: str = self._lock_key(filename=filename)
+
+        with self._locks_guard:
+            thread_lock: threading.RLock = self._locks.setdefault(key, threading.RLock())
+
+        if not thread_lock.acquire(blocking=blocking):
+            yield False
+            return
+
+        try:
+            depth: int = self._lock_depth.get(key, 0)
+            handle: Any = None
+
+            acquired: bool = True
+
+            if depth == 0:
+                try:
+                    handle = self._acquire_process_lock(key=key, blocking=blocking)
+                except BlockingIOError:
+                    # Lock is held by another process
+                    acquired = False
+
+            if acquired is False:
+                yield False
+                return
+
+            self._lock_depth[key] = depth + 1
+
+            try:
+                yield True
+
+            finally:
+                self._lock_depth[key] = depth
+
+                if depth == 0:
+                    self._release_process_lock(handle=handle)
+
+        finally:
+            thread_lock.release()
+
+    @abstractmethod
+    def _scan(self) -> Iterator[tuple[str, int, float]]:
+        """Iterate over stored files to build usage index. Hidden files like metadata are skipped.
+
+        :return: Iterator over filename, size and time of last modification.
+        :rtype: typing.Iterator[typing.Tuple[str, int, float]]
+        """
+
+    def _index(self) -> dict[str, list[int]]:
+        """Get usage index. Index is built on first use. Caller holds usage lock.
+
+        :return: Dict of filename to size, time of last access and number of accesses.
+        :rtype: typing.Dict[str, typing.List[int]]
+        """
+        if self._entries is None:
+            self._entries = {}
+
+            # Order of last access is initialized by time of modification
+            for filename, size, _ in sorted(self._scan(), key=lambda item: item[2]):
+                self._entries[filename] = [size, next(self._ticks), 0]
+                self._class_sizes[resource_class(filename)] = self._class_sizes.get(resource_class(filename), 0) + size
+
+        return self._entries
+
+    def _record_lookup(self, filename: str, found: bool) -> None:
+        """Record lookup of file as hit or miss.
+
+        :param str filename: Filename of file.
+        :param bool found: True if file exists.
+        """
+        if filename.startswith("."):
+            return
+
+        with self._usage_lock:
+            if found is True:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if found is True:
+            self._record_access(filename=filename)
+
+    def _record_access(self, filename: str) -> None:
+        """Record read of file for eviction order. Nothing is recorded before the usage index is built.
+
+        :param str filename: Filename of file.
+        """
+        with self._usage_lock:
+            entry: list[int] | None = self._entries.get(filename) if self._entries is not None else None
+
+            if entry is not None:
+                entry[1] = next(self._ticks)
+                entry[2] += 1
+
+    def _record_write(self, filename: str, size: int) -> None:
+        """Record size of written file and evict files if budget is exceeded.
+
+        :param str filename: Filename of file.
+        :param int size: Stored size of file in bytes.
+        """
+        if filename.startswith("."):
+            return
+
+        with self._usage_lock:
+            # Index is only maintained if storage is capped or statistics were requested
+            if self._entries is None and self.max_size is None:
+                return
+
+            entries: dict[str, list[int]] = self._index()
+            entry: list[int] | None = entries.get(filename)
+            file_class: str = resource_class(filename)
+
+            if entry is None:
+                entries[filename] = [size, next(self._ticks), 0]
+                self._class_sizes[file_class] = self._class_sizes.get(file_class, 0) + size
+            else:
+                self._class_sizes[file_class] += size - entry[0]
+                entry[0] = size
+                entry[1] = next(self._ticks)
+
+        self._evict(exclude=filename)
+
+    def _record_remove(self, filename: str) -> None:
+        """Remove file from usage index.
+
+        :param str filename: Filename of file.
+        """
+        with self._usage_lock:
+            entry: list[int] | None = self._entries.pop(filename, None) if self._entries is not None else None
+
+            if entry is not None:
+                self._class_sizes[resource_class(filename)] -= entry[0]
+
+    def _evict(self, exclude: str) -> None:
+        """Evict files until storage is within budget.
+
+        Files locked by other writers and pinned files are skipped, so eviction never waits for a lock.
+
+        :param str exclude: Filename of file that must not be evicted, e.g. the file just written.
+        """
+        if self.max_size is None:
+            return
+
+        budgets: dict[str | None, int] = (
+            {None: self.max_size} if isinstance(self.max_size, int) else dict(self.max_size.items())
+        )
+
+        for budget_class, budget in budgets.items():
+            with self._usage_lock:
+                used: int = (
+                    sum(self._class_sizes.values()) if budget_class is None else self._class_sizes.get(budget_class, 0)
+                )
+
+                if used <= budget:
+                    continue
+
+                candidates: list[tuple[str, list[int]]] = [
+                    (filename, entry)
+                    for filename, entry in self._index().items()
+                    if filename != exclude
+                    and (budget_class is None or resource_class(filename) == budget_class)
+                    and not any(fnmatch.fnmatchcase(filename, pattern) for pattern in self.pinned)
+                ]
+
+            # Least recently used first or least frequently used first with ties by last access
+            candidates.sort(
+                key=(lambda item: item[1][1]) if self.eviction == "lru" else (lambda item: (item[1][2], item[1][1]))
+            )
+
+            for filename, entry in candidates:
+                if used <= budget:
+                    break
+
+                with self._hold_lock(filename=filename, blocking=False) as locked:
+                    if locked is False:
+                        continue
+
+                    self.remove(filename=filename)
+
+                used -= entry[0]
+
+                with self._usage_lock:
+                    self.evictions += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Get statistics of storage usage. The usage index is built on first call by a scan of the storage.
+
+        :return: Dict with number of entries, stored bytes, hits, misses, hit rate and evictions, and number of \
+            entries and bytes per resource class.
+        :rtype: typing.Dict[str, typing.Any]
+        """
+        with self._usage_lock:
+            entries: dict[str, list[int]] = self._index()
+            lookups: int = self.hits + self.misses
+
+            classes: dict[str, dict[str, int]] = {}
+            for filename, entry in entries.items():
+                class_stats: dict[str, int] = classes.setdefault(resource_class(filename), {"entries": 0, "size": 0})
+                class_stats["entries"] += 1
+                class_stats["size"] += entry[0]
+
+            return {
+                "entries": len(entries),
+                "size": sum(self._class_sizes.values()),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups > 0 else 0.0,
+                "evictions": self.evictions,
+                "classes": classes,
+            }
+
+    @abstractmethod
+    def exist(self, filename: str) -> bool:
+        """Check if file exist in storage.
+
+        :param str filename: Filename to check.
+        :return: Returns True if file with given name exist in storage.
+        :rtype: bool
+        """
+
+    @abstractmethod
+    def _read(self, filename: str) -> bytes:
+        """Read stored bytes of file. Compressed files are not decompressed.
+
+        :param str filename: Filename of file to load.
+        :return: Stored bytes.
+        :rtype: bytes
+        :raises FileNotFoundError: If file does not exist.
+        """
+
+    @abstractmethod
+    def _write(self, filename: str, data: bytes) -> str:
+        """Store bytes of file atomically. Caller holds the lock of the file.
+
+        :param str filename: Filename to store file at.
+        :param bytes data: Bytes to store, compressed by caller.
+        :return: Location of stored file.
+        :rtype: str
+        """
+
+    @abstractmethod
+    def remove(self, filename: str) -> None:
+        """Remove file, its metadata and files derived from it from storage. Missing files are ignored.
+
+        :param str filename: Filename of file to remove.
+        """
+
+    @abstractmethod
+    def mtime(self, filename: str) -> float:
+        """Get time of last modification of file.
+
+        :param str filename: Filename of file.
+        :return: Time of last modification as unix timestamp.
+        :rtype: float
+        """
+
+    @abstractmethod
+    def size(self, filename: str) -> int:
+        """Get stored size of file in bytes.
+
+        :param str filename: Filename of file.
+        :return: Size of file. Size of compressed files is the compressed size.
+        :rtype: int
+        """
+
+    @abstractmethod
+    def _save_checksum(self, filename: str, size: int | None, digest: str | None) -> None:
+        """Record size and SHA-256 checksum of stored bytes of file at write time.
+
+        :param str filename: Filename of file.
+        :param typing.Optional[int] size: Stored size of file.
+        :param typing.Optional[str] digest: Hex digest of stored bytes. If None, the checksum of the file is dropped, \
+            e.g. after the file was removed or appended to.
+        """
+
+    @abstractmethod
+    def _load_checksums(self) -> dict[str, tuple[int, str]]:
+        """Load recorded checksums of all files.
+
+        :return: Dict of filename to stored size and hex digest.
+        :rtype: typing.Dict[str, typing.Tuple[int, str]]
+        """
+
+    def _digest(self, filename: str) -> str:
+        """Compute SHA-256 checksum of stored bytes of file.
+
+        :param str filename: Filename of file.
+        :return: Hex digest.
+        :rtype: str
+        """
+        return hashlib.sha256(self._read(filename=filename)).hexdigest()
+
+    @abstractmethod
+    def _quarantine(self, filename: str) -> None:
+        """Move corrupt file to hidden entry ".<filename>.corrupt". Caller holds the lock of the file.
+
+        Metadata of the file is kept, e.g. to request the file again from its url.
+
+        :param str filename: Filename of file.
+        """
+
+    def verify(
+        self, workers: int | None = None, quarantine: bool = False, filenames: Iterable[str] | None = None
+    ) -> dict[str, Any]:
+        """Verify size and checksum of files against the checksums recorded when the files were written.
+
+        Sizes are compared first, files of the recorded size are hashed in parallel on a thread pool. Hashing releases
+        the GIL, so all cores are used. Files without checksum, e.g. files written by older versions or appended
+        files like journals, are reported as unverified.
+
+        :param typing.Optional[int] workers: Number of threads to hash files with. Defaults to the number of threads \
+            of `concurrent.futures.ThreadPoolExecutor`.
+        :param bool quarantine: Move corrupt files to hidden entries ".<filename>.corrupt", so they are treated as \
+            missing and requested again.
+        :param typing.Optional[typing.Iterable[str]] filenames: Files to verify. If None, all files are verified.
+        :return: Dict with number of checked and valid files, dict of corrupt files to reason, list of unverified \
+            files and list of quarantined files.
+        :rtype: typing.Dict[str, typing.Any]
+        """
+        checksums: dict[str, tuple[int, str]] = self._load_checksums()
+        sizes: dict[str, int] = {filename: size for filename, size, _ in self._scan()}
+
+        if filenames is not None:
+            selected: set[str] = set(filenames)
+            sizes = {filename: size for filename, size in sizes.items() if filename in selected}
+
+        def check(filename: str, size: int, recorded: tuple[int, str]) -> str | None:
+            """Check file against recorded checksum and return reason if file is corrupt."""
+            if size != recorded[0]:
+                return f"Size {size} does not match recorded size {recorded[0]}."
+
+            try:
+                if self._digest(filename=filename) != recorded[1]:
+                    return "Checksum does not match recorded checksum."
+            except FileNotFoundError:
+                # File was removed while verifying
+                return None
+
+            return None
+
+        verifiable: list[str] = sorted(filename for filename in sizes if filename in checksums)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            reasons: list[str | None] = list(
+                executor.map(lambda filename: check(filename, sizes[filename], checksums[filename]), verifiable)
+            )
+
+        corrupt: dict[str, str] = {
+            filename: reason for filename, reason in zip(verifiable, reasons, strict=True) if reason is not None
+        }
+        quarantined: list[str] = []
+
+        if quarantine is True and len(corrupt) > 0:
+            # Files may have been written again while verifying. Checks are repeated under the lock of the file.
+            checksums = self._load_checksums()
+
+            for filename in corrupt:
+                with self.lock(filename=filename):
+                    if filename not in checksums or not self.exist(filename=filename):
+                        continue
+
+                    if check(filename, self.size(filename=filename), checksums[filename]) is not None:
+                        self._quarantine(filename=filename)
+                        self._remove_derived(filename=filename)
+                        quarantined.append(filename)
+
+        return {
+            "checked": len(verifiable),
+            "valid": len(verifiable) - len(corrupt),
+            "corrupt": corrupt,
+            "unverified": sorted(filename for filename in sizes if filename not in checksums),
+            "quarantined": quarantined,
+        }
+
+    @contextmanager
+    def open(self, filename: str) -> Generator[IO[bytes], None, None]:
+        """Open file for binary reading. Compressed files are decompressed while reading.
+
+        :param str filename: Filename of file to load.
+        :return: Context manager of binary file object.
+        :rtype: typing.Generator[typing.IO[bytes], None, None]
+        """
+        data: bytes = self._read(filename=filename)
+        self._record_access(filename=filename)
+
+        with _decompressed_reader(io.BytesIO(data)) as reader:
+            yield reader
+
+    def save(self, filename: str, data: str) -> str:
+        """Save string as file in storage.
+
+        :param str filename: Filename to store file at.
+        :param str data: String data to save.
+        :return: Location of stored file.
+        :rtype: str
+        """
+        with self.lock(filename=filename):
+            return self._write(filename=filename, data=compress(data.encode(encoding="utf-8"), self.compression))
+
+    def save_stream(self, filename: str, chunks: Iterable[bytes]) -> str:
+        """Save stream of binary chunks as file in storage, e.g. content of a streamed HTTP response.
+
+        The file is only stored when the stream is complete. Readers never see a partially written file.
+
+        :param str filename: Filename to store file at.
+        :param typing.Iterable[bytes] chunks: Chunks of file content.
+        :return: Location of stored file.
+        :rtype: str
+        """
+        data: bytes = compress(b"".join(chunks), compression=self.compression)
+
+        with self.lock(filename=filename):
+            return self._write(filename=filename, data=data)
+
+    def iter_lines(self, filename: str) -> Iterator[str]:
+        """Iterate over lines of file without loading the whole file into memory.
+
+        :param str filename: Filename of file to load.
+        :return: Iterator over lines of file. Line breaks are removed.
+        :rtype: typing.Iterator[str]
+        """
+        with self.open(filename=filename) as f_obj:
+            for line in f_obj:
+                yield line.decode(encoding="utf-8").rstrip("\r\n")
+
+    def append(self, filename: str, data: str) -> str:
+        """Append string to file in storage. File is created if it does not exist.
+
+        :param str filename: Filename to store file at.
+        :param str data: String data to append to file.
+        :return: Location of stored file.
+        :rtype: str
+        """
+        with self.lock(filename=filename):
+            try:
+                stored: bytes = self._read(filename=filename)
+            except FileNotFoundError:
+                stored = b""
+
+            # Keep compression of existing file. Compressed data is appended as additional gzip member or zstd frame.
+            compression: str | None = detect_compression(stored[:4]) if len(stored) > 0 else self.compression
+
+            return self._write(filename=filename, data=stored + compress(data.encode(encoding="utf-8"), compression))
+
+    def save_meta(self, filename: str, meta: dict[str, Any]) -> str:
+        """Save metadata of file, e.g. time of download or HTTP cache headers.
+
+        Metadata is stored as JSON in a hidden file ".<filename>.meta". The file itself does not need to exist.
+
+        :param str filename: Filename of file to store metadata of.
+        :param typing.Dict[str, typing.Any] meta: JSON serializable metadata.
+        :return: Location of metadata file.
+        :rtype: str
+        """
+        # Metadata is written under the lock of the file
+        with self.lock(filename=filename):
+            return self._write(
+                filename=f".{filename}.meta", data=compress(json.dumps(meta).encode(encoding="utf-8"), self.compression)
+            )
+
+    def load_meta(self, filename: str) -> dict[str, Any] | None:
+        """Load metadata of file.
+
+        :param str filename: Filename of file to load metadata of.
+        :return: Metadata dict or None if no metadata is stored.
+        :rtype: typing.Optional[typing.Dict[str, typing.Any]]
+        """
+        try:
+            return json.loads(self.load(filename=f".{filename}.meta"))
+        except FileNotFoundError:
+            return None
+
+    def save_dump(self, filename: str, data: Any) -> str:
+        """Save binary dump as file in storage.
+
+        :param str filename: Filename to store file at.
+        :param typing.Any data: Data to store to cache file. Can be any object.
+        :return: Location of stored file.
+        :rtype: str
+        """
+        with self.lock(filename=filename):
+            return self._write(filename=filename, data=compress(pickle.dumps(data), self.compression))
+
+    def load(self, filename: str) -> str:
+        """Load string from file.
+
+        :param str filename: Filename of file to load.
+        :return: File content string.
+        :rtype: str
+        """
+        with self.open(filename=filename) as f_obj:
+            return f_obj.read().decode(encoding="utf-8")
+
+    def load_dump(self, filename: str) -> Any:
+        """Load binary dump from file.
+
+        :param str filename: Filename of file to load.
+        :return: Object from file.
+        :rtype: typing.Any
+        """
+        with self.open(filename=filename) as input_file:
+            return pickle.load(input_file)
+
+    def save_bytes(self, filename: str, data: bytes, raw: bool = False) -> str:
+        """Save binary data as file in storage, e.g. a PNG image.
+
+        :param str filename: Filename to store file at.
+        :param bytes data: Binary data to save.
+        :param bool raw: Store data uncompressed regardless of the compression of the storage, e.g. for already \
+            compressed images. Uncompressed files can be memory-mapped by `open_buffer`.
+        :return: Location of stored file.
+        :rtype: str
+        """
+        with self.lock(filename=filename):
+            return self._write(filename=filename, data=data if raw is True else compress(data, self.compression))
+
+    def load_bytes(self, filename: str) -> bytes:
+        """Load binary data from file.
+
+        :param str filename: Filename of file to load.
+        :return: File content.
+        :rtype: bytes
+        """
+        with self.open(filename=filename) as f_obj:
+            return f_obj.read()
+
+    @contextmanager
+    def open_buffer(self, filename: str) -> Generator[memoryview, None, None]:
+        """Open read-only buffer of file content, e.g. to pass to parsers without copying.
+
+        :param str filename: Filename of file to load.
+        :return: Context manager of read-only memoryview. The view must not be used after the context exits.
+        :rtype: typing.Generator[memoryview, None, None]
+        """
+        yield memoryview(self.load_bytes(filename=filename))
+
+    def exist_many(self, filenames: Iterable[str]) -> dict[str, bool]:
+        """Check if files exist in storage.
+
+        :param typing.Iterable[str] filenames: Filenames to check.
+        :return: Dict of filename to True if file exists.
+        :rtype: typing.Dict[str, bool]
+        """
+        return {filename: self.exist(filename=filename) for filename in filenames}
+
+    def load_many(self, filenames: Iterable[str]) -> dict[str, str]:
+        """Load strings of many files. Missing files are skipped.
+
+        :param typing.Iterable[str] filenames: Filenames of files to load.
+        :return: Dict of filename to file content string.
+        :rtype: typing.Dict[str, str]
+        """
+        result: dict[str, str] = {}
+
+        for filename in filenames:
+            try:
+                result[filename] = self.load(filename=filename)
+            except FileNotFoundError:
+                continue
+
+        return result
+
+
+class Storage(BaseStorage):
+    """Storage handler class. Files are stored in a cache folder of the local file system.
+
+    Files are written to a temporary file under an advisory lock and moved into place atomically, so many threads
+    and processes can share a cache folder. Readers do not take locks and always see complete files.
+
+    Names and times of modification of files are kept in a manifest, which is loaded by a single scan of the cache
+    folder on first use and is updated on writes. Lookups of known files do not touch the file system, which saves
+    metadata round-trips on network file systems. Files unknown to the manifest are checked on disk, so files written
+    by other processes are found. Files removed by other processes are dropped from the manifest when they fail to
+    open. Time of modification is always read from disk, so changes of other processes are seen. Call `refresh` to
+    reload the manifest.
+
+    Checksums of written files are appended to a fixed number of journals ".checksums.<n>", so concurrent writers of
+    different files rarely wait for the same journal.
+
+    Writers are serialized with advisory locks on a fixed number of hidden lock files ".stripe-<n>.lock". Files are
+    mapped to lock files by hash, so files that share a lock file are serialized and the number of lock files and
+    locks held in memory does not grow with the number of cached files.
+    """
+
+    # Number of lock files
+    LOCK_STRIPES: int = 64
+
+    # Number of journals of checksums
+    CHECKSUM_STRIPES: int = 16
+
+    def __init__(
+        self, cachedir: str | None = None, compression: str | None = None, manifest: bool = True, **kwargs: Any
+    ) -> None:
         """Init KEGG data storage instance.
 
         :param typing.Optional[str] cachedir: Path to folder to use as cache.
+        :param typing.Optional[str] compression: Compression format of saved files ("gzip" or "zstd"). zstd requires \
+            Python 3.14 or the `zstandard` package. If None, files are saved uncompressed.
+        :param bool manifest: Keep manifest of cache folder in memory. If False, every lookup checks the file system.
+        :param typing.Any kwargs: Other arguments to `BaseStorage`, like `max_size`, `eviction` or `pinned`.
         """
+        super().__init__(compression=compression, **kwargs)
+
+        self.manifest: bool = manifest
+
+        # Filenames in cache folder
+        self._manifest_lock: threading.Lock = threading.Lock()
+        self._manifest: set[str] | None = None
+
         if cachedir is None:
             # Cachedir argument not given. Fallback to default cache directory
             cachedir = os.path.join(os.getcwd(), ".keggtools_cache")
@@ -25,6 +970,67 @@ class Storage:
 
         self.cachedir = cachedir
 
+    def _lock_key(self, filename: str) -> str:
+        """Get lock file that protects file.
+
+        Journals of checksums have their own lock files, because they are locked while the lock of a written file is
+        held. Sharing lock files with other files could deadlock writers that wait for each other's journal.
+
+        :param str filename: Name of file to lock.
+        :return: Name of lock file without hidden prefix and ".lock" suffix.
+        :rtype: str
+        """
+        if filename.startswith(f"{CHECKSUM_JOURNAL}."):
+            return filename
+
+        return f"stripe-{zlib.crc32(filename.encode(encoding='utf-8')) % self.LOCK_STRIPES}"
+
+    def _lock_path(self, key: str) -> str:
+        """Get path of hidden lock file ".<key>.lock" in cache folder.
+
+        :param str key: Name of lock file.
+        :return: Path of lock file.
+        :rtype: str
+        """
+        # Writes take a lock, so writes fail early if cache folder was removed
+        self.check_cache_dir()
+
+        return self.build_cache_path(filename=f".{key}.lock")
+
+    @contextmanager
+    def _atomic_writer(self, filename: str) -> Generator[IO[bytes], None, None]:
+        """Open temporary file for writing, which replaces the file when the context exits without error.
+
+        Readers never see a partially written file and failed writes do not leave a file behind. Size and checksum of
+        the written file are recorded. The checksum of a replaced file is dropped before the file is replaced, so an
+        interrupted write leaves the file unverified and never recorded with the checksum of other content. Caller
+        should hold the lock of the file to serialize writers.
+
+        :param str filename: Filename of file in cache folder.
+        :return: Context manager of binary file object.
+        :rtype: typing.Generator[typing.IO[bytes], None, None]
+        """
+        path: str = self.build_cache_path(filename=filename)
+        temp_path: str = self.build_cache_path(filename=f".{filename}.{uuid.uuid4().hex}.tmp")
+
+        try:
+            # Exclusive creation respects the umask, so files are readable by other users like files opened with "w"
+            with open(temp_path, "xb") as f_obj:
+                writer: _HashingWriter = _HashingWriter(f_obj)
+                yield cast(IO[bytes], writer)
+
+            if os.path.exists(path):
+                self._save_checksum(filename=filename, size=None, digest=None)
+
+            os.replace(temp_path, path)
+            self._manifest_update(filename=filename, exists=True)
+            self._save_checksum(filename=filename, size=writer.size, digest=writer.hash.hexdigest())
+
+        except BaseException:
+            if os.path.isfile(temp_path):
+                os.remove(temp_path)
+            raise
+
     def check_cache_dir(self) -> None:
         """Checks if cache dir exist. Raises "NotADirectoryError" of caching folder not found.
 
@@ -40,9 +1046,84 @@ class Storage:
         :return: Full filename with is inside cache folder.
         :rtype: str
         """
-        self.check_cache_dir()
         return os.path.join(self.cachedir, filename)
 
+    def _manifest_files(self) -> set[str]:
+        """Get manifest of cache folder. Manifest is loaded on first use. Caller holds manifest lock.
+
+        :return: Set of filenames.
+        :rtype: typing.Set[str]
+        """
+        if self._manifest is None:
+            self.check_cache_dir()
+
+            with os.scandir(self.cachedir) as entries:
+                self._manifest = {entry.name for entry in entries if entry.is_file()}
+
+        return self._manifest
+
+    def _manifest_update(self, filename: str, exists: bool) -> None:
+        """Update manifest after file was written or removed.
+
+        :param str filename: Filename of file.
+        :param bool exists: True if file was written, False if file was removed.
+        """
+        with self._manifest_lock:
+            if self._manifest is None:
+                return
+
+            if exists is True:
+                self._manifest.add(filename)
+            else:
+                self._manifest.discard(filename)
+
+    def refresh(self) -> None:
+        """Reload manifest of cache folder, e.g. after other processes changed or removed files."""
+        with self._manifest_lock:
+            self._manifest = None
+
+            if self.manifest is True:
+                self._manifest_files()
+
+    def _lookup(self, filename: str) -> bool:
+        """Check if file exists. Files in manifest are found without access to the file system.
+
+        :param str filename: Filename to check.
+        :return: True if file exists.
+        :rtype: bool
+        """
+        if self.manifest is True:
+            with self._manifest_lock:
+                if filename in self._manifest_files():
+                    return True
+
+        # File is unknown to manifest or was written by another process
+        found: bool = os.path.isfile(self.build_cache_path(filename=filename))
+
+        if found is True:
+            self._manifest_update(filename=filename, exists=True)
+
+        return found
+
+    def _open_file(self, filename: str) -> IO[bytes]:
+        """Open file in cache folder for binary reading.
+
+        :param str filename: Filename of file to open.
+        :return: Binary file object.
+        :rtype: typing.IO[bytes]
+        :raises FileNotFoundError: If file does not exist.
+        """
+        path: str = self.build_cache_path(filename=filename)
+
+        if self._lookup(filename=filename):
+            try:
+                return open(path, "rb")
+            except FileNotFoundError:
+                # File was removed by another process
+                self._manifest_update(filename=filename, exists=False)
+
+        raise FileNotFoundError(f"Can not load file. File at path '{path}' does not exist.")
+
     def exist(self, filename: str) -> bool:
         """Check if filename exist in caching dir.
 
@@ -50,71 +1131,685 @@ class Storage:
         :return: Returns True if file with given name exist in cachedir.
         :rtype: bool
         """
-        self.check_cache_dir()
-        return os.path.isfile(os.path.join(self.cachedir, filename))
+        found: bool = self._lookup(filename=filename)
+        self._record_lookup(filename=filename, found=found)
+        return found
 
-    def save(self, filename: str, data: str) -> str:
-        """Save string as file in local storage. Returns absolute filename of save file.
+    def _read(self, filename: str) -> bytes:
+        """Read stored bytes of file.
+
+        :param str filename: Filename of file to load from cache folder.
+        :return: Stored bytes.
+        :rtype: bytes
+        """
+        with self._open_file(filename=filename) as f_obj:
+            return f_obj.read()
+
+    def _write(self, filename: str, data: bytes) -> str:
+        """Write bytes to file atomically.
+
+        :param str filename: Filename to store file at.
+        :param bytes data: Bytes to store.
+        :return: Full filename to cached file.
+        :rtype: str
+        """
+        with self._atomic_writer(filename=filename) as f_obj:
+            f_obj.write(data)
+
+        self._record_write(filename=filename, size=len(data))
+        return self.build_cache_path(filename=filename)
+
+    def save_stream(self, filename: str, chunks: Iterable[bytes]) -> str:
+        """Save stream of binary chunks as file in local storage, e.g. content of a streamed HTTP response.
+
+        Chunks are written to a temporary file, which is moved into place when the stream is complete. Readers never
+        see a partially written file.
 
         :param str filename: Filename to storage file at.
-        :param str data: String data to save to cache file.
+        :param typing.Iterable[bytes] chunks: Chunks of file content.
         :return: Full filename to cached file.
         :rtype: str
         """
-        self.check_cache_dir()
-        path: str = self.build_cache_path(filename=filename)
+        with self.lock(filename=filename):
+            with self._atomic_writer(filename=filename) as f_obj, _compressed_writer(f_obj, self.compression) as writer:
+                for chunk in chunks:
+                    writer.write(chunk)
 
-        with open(path, "w", encoding="utf-8") as f_obj:
-            f_obj.write(data)
-            f_obj.close()
+            # Size is only known when the stream is complete
+            self._record_write(filename=filename, size=os.path.getsize(self.build_cache_path(filename=filename)))
 
-        return path
+        return self.build_cache_path(filename=filename)
 
-    def save_dump(self, filename: str, data: Any) -> str:
-        """Save binary dump as file in local storage. Returns absolute filename of save file.
+    @contextmanager
+    def open(self, filename: str) -> Generator[IO[bytes], None, None]:
+        """Open file for binary reading. Compressed files are decompressed while reading.
+
+        :param str filename: Filename of file to load from cache folder.
+        :return: Context manager of binary file object.
+        :rtype: typing.Generator[typing.IO[bytes], None, None]
+        """
+        f_obj: IO[bytes] = self._open_file(filename=filename)
+        self._record_access(filename=filename)
+
+        with f_obj, _decompressed_reader(f_obj) as reader:
+            yield reader
+
+    @contextmanager
+    def open_buffer(self, filename: str) -> Generator[memoryview, None, None]:
+        """Open read-only buffer of file content. Uncompressed files are memory-mapped, so content is not copied.
+
+        Files are replaced atomically by writers, so a mapped file is never modified while it is open.
+
+        :param str filename: Filename of file to load from cache folder.
+        :return: Context manager of read-only memoryview. The view must not be used after the context exits.
+        :rtype: typing.Generator[memoryview, None, None]
+        """
+        with self._open_file(filename=filename) as f_obj:
+            head: bytes = f_obj.read(4)
+
+            # Empty files can not be mapped, compressed files are decompressed to memory
+            if len(head) == 0 or detect_compression(head) is not None:
+                f_obj.seek(0)
+                self._record_access(filename=filename)
+
+                with _decompressed_reader(f_obj) as reader:
+                    yield memoryview(reader.read())
+                return
+
+            mapped: mmap.mmap = mmap.mmap(f_obj.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self._record_access(filename=filename)
+        view: memoryview = memoryview(mapped)
+
+        try:
+            yield view
+
+        finally:
+            try:
+                view.release()
+                mapped.close()
+            except BufferError:
+                # Views derived from the buffer are still alive. Mapping is closed when they are garbage collected.
+                pass
+
+    def append(self, filename: str, data: str) -> str:
+        """Append string to file in local storage. File is created if it does not exist.
 
         :param str filename: Filename to storage file at.
-        :param typing.Any data: Data to store to cache file. Can be any object.
+        :param str data: String data to append to cache file.
         :return: Full filename to cached file.
         :rtype: str
         """
-        self.check_cache_dir()
         path: str = self.build_cache_path(filename=filename)
 
-        with open(path, "wb") as output_file:
-            pickle.dump(data, output_file)
+        with self.lock(filename=filename):
+            with open(path, "a+b") as f_obj:
+                # Keep compression of existing file. Compressed data is appended as additional gzip member or zstd
+                # frame.
+                f_obj.seek(0)
+                head: bytes = f_obj.read(4)
+                compression: str | None = detect_compression(head) if len(head) > 0 else self.compression
+
+                f_obj.write(compress(data.encode(encoding="utf-8"), compression=compression))
+                size: int = f_obj.tell()
+
+            # Appended files are not verified
+            self._manifest_update(filename=filename, exists=True)
+            self._save_checksum(filename=filename, size=None, digest=None)
+            self._record_write(filename=filename, size=size)
 
         return path
 
-    def load(self, filename: str) -> str:
-        """Load string from file.
+    def remove(self, filename: str) -> None:
+        """Remove file, its metadata and derived files from local storage. Missing files are ignored.
 
-        :param str filename: Filename of file to load from cache folder.
-        :return: File content string.
+        :param str filename: Filename of file to remove from cache folder.
+        """
+        with self.lock(filename=filename):
+            for path in (
+                self.build_cache_path(filename=filename),
+                self.build_cache_path(filename=f".{filename}.meta"),
+            ):
+                if os.path.isfile(path):
+                    os.remove(path)
+
+            self._manifest_update(filename=filename, exists=False)
+            self._manifest_update(filename=f".{filename}.meta", exists=False)
+            self._save_checksum(filename=filename, size=None, digest=None)
+            self._record_remove(filename=filename)
+
+        self._remove_derived(filename=filename)
+
+    def _checksum_journal(self, filename: str) -> str:
+        """Get journal that records the checksum of file.
+
+        :param str filename: Filename of file.
+        :return: Filename of journal.
         :rtype: str
         """
-        path: str = self.build_cache_path(filename=filename)
+        return f"{CHECKSUM_JOURNAL}.{zlib.crc32(filename.encode(encoding='utf-8')) % self.CHECKSUM_STRIPES}"
+
+    def _save_checksum(self, filename: str, size: int | None, digest: str | None) -> None:
+        """Append size and checksum of file to its journal ".checksums.<n>" in cache folder. Last record of a file wins.
+
+        :param str filename: Filename of file.
+        :param typing.Optional[int] size: Stored size of file.
+        :param typing.Optional[str] digest: Hex digest of stored bytes. If None, the checksum of the file is dropped.
+        """
+        # Metadata, lock and temporary files are not verified
+        if filename.startswith("."):
+            return
+
+        line: str = f"{filename}\t{size}\t{digest}\n" if digest is not None else f"{filename}\t\t\n"
+        journal: str = self._checksum_journal(filename=filename)
+
+        with self.lock(filename=journal):
+            with open(self.build_cache_path(filename=journal), "a", encoding="utf-8") as f_obj:
+                f_obj.write(line)
+
+    def _load_journal(self, journal: str) -> dict[str, tuple[int, str]]:
+        """Load checksums from a journal in cache folder.
+
+        :param str journal: Filename of journal.
+        :return: Dict of filename to stored size and hex digest.
+        :rtype: typing.Dict[str, typing.Tuple[int, str]]
+        """
+        checksums: dict[str, tuple[int, str]] = {}
+        path: str = self.build_cache_path(filename=journal)
 
         if not os.path.isfile(path):
-            raise FileNotFoundError(f"Can not load file. File at path '{path}' does not exist.")
+            return checksums
 
         with open(path, encoding="utf-8") as f_obj:
-            data = f_obj.read()
-            f_obj.close()
+            for line in f_obj:
+                fields: list[str] = line.rstrip("\n").split("\t")
 
-        return data
+                # Skip lines truncated by interrupted writes
+                if len(fields) != 3 or not line.endswith("\n"):
+                    continue
 
-    def load_dump(self, filename: str) -> Any:
-        """Load binary dump from file.
+                if fields[2] == "":
+                    checksums.pop(fields[0], None)
+                else:
+                    checksums[fields[0]] = (int(fields[1]), fields[2])
 
-        :param str filename: Filename of file to load from cache folder.
-        :return: Object from file.
+        return checksums
+
+    def _load_checksums(self) -> dict[str, tuple[int, str]]:
+        """Load checksums from all journals ".checksums.<n>" in cache folder.
+
+        :return: Dict of filename to stored size and hex digest.
+        :rtype: typing.Dict[str, typing.Tuple[int, str]]
+        """
+        checksums: dict[str, tuple[int, str]] = {}
+
+        for stripe in range(self.CHECKSUM_STRIPES):
+            checksums.update(self._load_journal(journal=f"{CHECKSUM_JOURNAL}.{stripe}"))
+
+        return checksums
+
+    def _digest(self, filename: str) -> str:
+        """Compute SHA-256 checksum of file in chunks.
+
+        :param str filename: Filename of file in cache folder.
+        :return: Hex digest.
+        :rtype: str
+        """
+        with open(self.build_cache_path(filename=filename), "rb") as f_obj:
+            return hashlib.file_digest(f_obj, "sha256").hexdigest()
+
+    def _quarantine(self, filename: str) -> None:
+        """Move corrupt file to hidden file ".<filename>.corrupt" in cache folder.
+
+        :param str filename: Filename of file.
+        """
+        os.replace(self.build_cache_path(filename=filename), self.build_cache_path(filename=f".{filename}.corrupt"))
+
+        self._manifest_update(filename=filename, exists=False)
+        self._save_checksum(filename=filename, size=None, digest=None)
+        self._record_remove(filename=filename)
+
+    def verify(
+        self, workers: int | None = None, quarantine: bool = False, filenames: Iterable[str] | None = None
+    ) -> dict[str, Any]:
+        """Verify size and checksum of files in cache folder. Journals of checksums are compacted afterwards.
+
+        :param typing.Optional[int] workers: Number of threads to hash files with. Defaults to the number of threads \
+            of `concurrent.futures.ThreadPoolExecutor`.
+        :param bool quarantine: Move corrupt files to hidden files ".<filename>.corrupt", so they are treated as \
+            missing and requested again.
+        :param typing.Optional[typing.Iterable[str]] filenames: Files to verify. If None, all files are verified and \
+            the journals are compacted.
+        :return: Dict with number of checked and valid files, dict of corrupt files to reason, list of unverified \
+            files and list of quarantined files.
+        :rtype: typing.Dict[str, typing.Any]
+        """
+        report: dict[str, Any] = super().verify(workers=workers, quarantine=quarantine, filenames=filenames)
+
+        if filenames is not None:
+            return report
+
+        # Rewrite journals with one record per file
+        for stripe in range(self.CHECKSUM_STRIPES):
+            journal: str = f"{CHECKSUM_JOURNAL}.{stripe}"
+
+            if not os.path.isfile(self.build_cache_path(filename=journal)):
+                continue
+
+            with self.lock(filename=journal):
+                checksums: dict[str, tuple[int, str]] = self._load_journal(journal=journal)
+
+                with self._atomic_writer(filename=journal) as f_obj:
+                    for filename, (size, digest) in checksums.items():
+                        f_obj.write(f"{filename}\t{size}\t{digest}\n".encode())
+
+        return report
+
+    def _scan(self) -> Iterator[tuple[str, int, float]]:
+        """Iterate over files in cache folder. Hidden files like metadata, lock files and temporary files are skipped.
+
+        :return: Iterator over filename, size and time of last modification.
+        :rtype: typing.Iterator[typing.Tuple[str, int, float]]
+        """
+        self.check_cache_dir()
+
+        with os.scandir(self.cachedir) as entries:
+            for entry in entries:
+                if entry.name.startswith(".") or not entry.is_file():
+                    continue
+
+                stat: os.stat_result = entry.stat()
+                yield entry.name, stat.st_size, stat.st_mtime
+
+    def mtime(self, filename: str) -> float:
+        """Get time of last modification of file.
+
+        :param str filename: Filename of file in cache folder.
+        :return: Time of last modification as unix timestamp.
+        :rtype: float
+        """
+        # Time of modification versions parsed files, so it is always read from disk to see changes of other processes
+        try:
+            return os.path.getmtime(self.build_cache_path(filename=filename))
+        except FileNotFoundError:
+            self._manifest_update(filename=filename, exists=False)
+            raise
+
+    def size(self, filename: str) -> int:
+        """Get size of file in bytes.
+
+        :param str filename: Filename of file in cache folder.
+        :return: Size of file on disk.
+        :rtype: int
+        """
+        try:
+            return os.path.getsize(self.build_cache_path(filename=filename))
+        except FileNotFoundError:
+            self._manifest_update(filename=filename, exists=False)
+            raise
+
+    def migrate(self, compression: str | None = None) -> dict[str, int]:
+        """Convert all files in cache folder to compression format, e.g. to compress an existing cache.
+
+        Files are replaced atomically, so the cache can be used while it is migrated.
+
+        :param typing.Optional[str] compression: Target compression format ("gzip" or "zstd"). If None, files are \
+            decompressed.
+        :return: Dict with number of files, number of converted files and total size before and after migration.
+        :rtype: typing.Dict[str, int]
+        """
+        if compression is not None and compression not in COMPRESSIONS:
+            raise ValueError(f"Compression must be one of {', '.join(COMPRESSIONS)}. Got '{compression}'.")
+
+        self.check_cache_dir()
+        stats: dict[str, int] = {"files": 0, "migrated": 0, "size_before": 0, "size_after": 0}
+
+        for filename in sorted(os.listdir(self.cachedir)):
+            path: str = self.build_cache_path(filename=filename)
+
+            # Skip folders, lock files, incomplete downloads, quarantined files and journals of checksums
+            if (
+                not os.path.isfile(path)
+                or filename.endswith((".lock", ".tmp", ".corrupt"))
+                or filename.startswith(f"{CHECKSUM_JOURNAL}.")
+            ):
+                continue
+
+            # Metadata files are written under the lock of their file
+            owner: str = filename[1:-5] if filename.startswith(".") and filename.endswith(".meta") else filename
+
+            with self.lock(filename=owner):
+                with open(path, "rb") as f_obj:
+                    current: str | None = detect_compression(f_obj.read(4))
+
+                size: int = os.path.getsize(path)
+                stats["files"] += 1
+                stats["size_before"] += size
+
+                if current != compression:
+                    with self.open(filename=filename) as reader:
+                        data: bytes = reader.read()
+
+                    with self._atomic_writer(filename=filename) as f_obj:
+                        f_obj.write(compress(data, compression=compression))
+
+                    size = os.path.getsize(path)
+                    stats["migrated"] += 1
+
+                    with self._usage_lock:
+                        entry: list[int] | None = self._entries.get(filename) if self._entries is not None else None
+
+                        if entry is not None:
+                            self._class_sizes[resource_class(filename)] += size - entry[0]
+                            entry[0] = size
+
+                stats["size_after"] += size
+
+        return stats
+
+
+class SQLiteStorage(BaseStorage):
+    """Storage of all files in a single SQLite database.
+
+    The database is opened in WAL mode, so many readers can read while a writer writes. Each thread uses its own
+    connection. A single database file avoids the overhead of many small files of the local file system, e.g. of
+    thousands of cached KGML files.
+
+    Writers are serialized with advisory locks on a fixed number of lock files in the folder "<path>-locks". Files
+    are mapped to lock files by hash, so files that share a lock file are serialized.
+    """
+
+    # Number of lock files
+    LOCK_STRIPES: int = 64
+
+    # Maximal number of SQL parameters of bulk queries
+    _CHUNK_SIZE: int = 500
+
+    def __init__(
+        self, path: str | None = None, compression: str | None = None, timeout: float = 30.0, **kwargs: Any
+    ) -> None:
+        """Init SQLite storage instance.
+
+        :param typing.Optional[str] path: Path to database file. Database is created if it does not exist.
+        :param typing.Optional[str] compression: Compression format of saved files ("gzip" or "zstd"). zstd requires \
+            Python 3.14 or the `zstandard` package. If None, files are saved uncompressed.
+        :param float timeout: Time in seconds to wait for a locked database.
+        :param typing.Any kwargs: Other arguments to `BaseStorage`, like `max_size`, `eviction` or `pinned`.
+        """
+        super().__init__(compression=compression, **kwargs)
+
+        if path is None:
+            # Path argument not given. Fallback to default database in working directory
+            path = os.path.join(os.getcwd(), ".keggtools_cache.sqlite")
+
+        self.path: str = path
+        self.timeout: float = timeout
+
+        self._local: threading.local = threading.local()
+        self._connections_guard: threading.Lock = threading.Lock()
+        self._connections: list[sqlite3.Connection] = []
+
+        # Create tables on first use of database
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "name TEXT PRIMARY KEY, data BLOB NOT NULL, mtime REAL NOT NULL, size INTEGER NOT NULL)"
+        )
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS checksums (name TEXT PRIMARY KEY, size INTEGER NOT NULL, digest TEXT NOT NULL)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get connection of current thread. Connections are not shared with forked processes.
+
+        :return: Database connection in autocommit mode.
+        :rtype: sqlite3.Connection
+        """
+        connection: sqlite3.Connection | None = getattr(self._local, "connection", None)
+
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+
+            with self._connections_guard:
+                self._connections.append(connection)
+
+        return connection
+
+    @contextmanager
+    def _transaction(self) -> Generator[sqlite3.Connection, None, None]:
+        """Run statements in a single write transaction. Transaction is rolled back on error.
+
+        :return: Context manager of connection of current thread.
+        :rtype: typing.Generator[sqlite3.Connection, None, None]
+        """
+        connection: sqlite3.Connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+        connection.execute("COMMIT")
+
+    def close(self) -> None:
+        """Close connections of all threads. Connections are reopened on next use."""
+        with self._connections_guard:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+
+        self._local = threading.local()
+
+    def _lock_key(self, filename: str) -> str:
+        """Get lock file that protects file.
+
+        :param str filename: Name of file to lock.
+        :return: Number of lock file.
+        :rtype: str
+        """
+        return str(zlib.crc32(filename.encode(encoding="utf-8")) % self.LOCK_STRIPES)
+
+    def _lock_path(self, key: str) -> str:
+        """Get path of lock file in directory "<path>-locks" next to database.
+
+        :param str key: Number of lock file.
+        :return: Path of lock file.
+        :rtype: str
+        """
+        lock_dir: str = f"{self.path}-locks"
+        os.makedirs(lock_dir, exist_ok=True)
+
+        return os.path.join(lock_dir, f"{key}.lock")
+
+    def exist(self, filename: str) -> bool:
+        """Check if file exist in database.
+
+        :param str filename: Filename to check.
+        :return: Returns True if file with given name exist in database.
+        :rtype: bool
+        """
+        found: bool = (
+            self._connection().execute("SELECT 1 FROM files WHERE name = ?", (filename,)).fetchone() is not None
+        )
+        self._record_lookup(filename=filename, found=found)
+        return found
+
+    def _read(self, filename: str) -> bytes:
+        """Read stored bytes of file.
+
+        :param str filename: Filename of file to load.
+        :return: Stored bytes.
+        :rtype: bytes
+        """
+        row: tuple[bytes] | None = (
+            self._connection().execute("SELECT data FROM files WHERE name = ?", (filename,)).fetchone()
+        )
+
+        if row is None:
+            raise FileNotFoundError(f"Can not load file. File '{filename}' does not exist in database '{self.path}'.")
+
+        return row[0]
+
+    def _write(self, filename: str, data: bytes) -> str:
+        """Write bytes of file in a single transaction.
+
+        :param str filename: Filename to store file at.
+        :param bytes data: Bytes to store.
+        :return: Location of stored file as "<path>:<filename>".
+        :rtype: str
+        """
+        with self._transaction() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO files (name, data, mtime, size) VALUES (?, ?, ?, ?)",
+                (filename, data, time.time(), len(data)),
+            )
+
+            # Metadata is not verified
+            if not filename.startswith("."):
+                connection.execute(
+                    "INSERT OR REPLACE INTO checksums (name, size, digest) VALUES (?, ?, ?)",
+                    (filename, len(data), hashlib.sha256(data).hexdigest()),
+                )
+
+        self._record_write(filename=filename, size=len(data))
+        return f"{self.path}:{filename}"
+
+    def remove(self, filename: str) -> None:
+        """Remove file, its metadata and derived files from database. Missing files are ignored.
+
+        :param str filename: Filename of file to remove.
+        """
+        with self.lock(filename=filename), self._transaction() as connection:
+            connection.execute("DELETE FROM files WHERE name IN (?, ?)", (filename, f".{filename}.meta"))
+            connection.execute("DELETE FROM checksums WHERE name = ?", (filename,))
+            self._record_remove(filename=filename)
+
+        self._remove_derived(filename=filename)
+
+    def _save_checksum(self, filename: str, size: int | None, digest: str | None) -> None:
+        """Record size and checksum of file in table "checksums".
+
+        :param str filename: Filename of file.
+        :param typing.Optional[int] size: Stored size of file.
+        :param typing.Optional[str] digest: Hex digest of stored bytes. If None, the checksum of the file is dropped.
+        """
+        if digest is None:
+            self._connection().execute("DELETE FROM checksums WHERE name = ?", (filename,))
+        else:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO checksums (name, size, digest) VALUES (?, ?, ?)", (filename, size, digest)
+            )
+
+    def _load_checksums(self) -> dict[str, tuple[int, str]]:
+        """Load checksums from table "checksums".
+
+        :return: Dict of filename to stored size and hex digest.
+        :rtype: typing.Dict[str, typing.Tuple[int, str]]
+        """
+        return {name: (size, digest) for name, size, digest in self._connection().execute("SELECT * FROM checksums")}
+
+    def _quarantine(self, filename: str) -> None:
+        """Rename corrupt file to hidden entry ".<filename>.corrupt".
+
+        :param str filename: Filename of file.
+        """
+        with self._transaction() as connection:
+            connection.execute("DELETE FROM files WHERE name = ?", (f".{filename}.corrupt",))
+            connection.execute("UPDATE files SET name = ? WHERE name = ?", (f".{filename}.corrupt", filename))
+            connection.execute("DELETE FROM checksums WHERE name = ?", (filename,))
+
+        self._record_remove(filename=filename)
+
+    def _scan(self) -> Iterator[tuple[str, int, float]]:
+        """Iterate over files in database. Metadata entries are skipped.
+
+        :return: Iterator over filename, size and time of last write.
+        :rtype: typing.Iterator[typing.Tuple[str, int, float]]
+        """
+        yield from self._connection().execute("SELECT name, size, mtime FROM files WHERE name NOT LIKE '.%'")
+
+    def _stat(self, filename: str, column: str) -> Any:
+        """Get column of file entry.
+
+        :param str filename: Filename of file.
+        :param str column: Name of column.
+        :return: Value of column.
         :rtype: typing.Any
         """
-        path: str = self.build_cache_path(filename=filename)
+        row: tuple[Any] | None = (
+            self._connection().execute(f"SELECT {column} FROM files WHERE name = ?", (filename,)).fetchone()
+        )
 
-        if not os.path.isfile(path):
-            raise FileNotFoundError(f"Can not load file. File at path '{path}' does not exist.")
+        if row is None:
+            raise FileNotFoundError(f"File '{filename}' does not exist in database '{self.path}'.")
 
-        with open(path, "rb") as input_file:
-            return pickle.load(input_file)
+        return row[0]
+
+    def mtime(self, filename: str) -> float:
+        """Get time of last write of file.
+
+        :param str filename: Filename of file.
+        :return: Time of last write as unix timestamp.
+        :rtype: float
+        """
+        return self._stat(filename=filename, column="mtime")
+
+    def size(self, filename: str) -> int:
+        """Get stored size of file in bytes.
+
+        :param str filename: Filename of file.
+        :return: Size of file. Size of compressed files is the compressed size.
+        :rtype: int
+        """
+        return self._stat(filename=filename, column="size")
+
+    def _select_many(self, column: str, filenames: list[str]) -> Iterator[tuple[str, Any]]:
+        """Select column of many files in chunked queries.
+
+        :param str column: Name of column.
+        :param typing.List[str] filenames: Filenames of files.
+        :return: Iterator over filename and value of existing files.
+        :rtype: typing.Iterator[typing.Tuple[str, typing.Any]]
+        """
+        connection: sqlite3.Connection = self._connection()
+
+        for start in range(0, len(filenames), self._CHUNK_SIZE):
+            chunk: list[str] = filenames[start : start + self._CHUNK_SIZE]
+            yield from connection.execute(
+                f"SELECT name, {column} FROM files WHERE name IN ({', '.join('?' * len(chunk))})", chunk
+            )
+
+    def exist_many(self, filenames: Iterable[str]) -> dict[str, bool]:
+        """Check if files exist in database with one query per chunk of filenames.
+
+        :param typing.Iterable[str] filenames: Filenames to check.
+        :return: Dict of filename to True if file exists.
+        :rtype: typing.Dict[str, bool]
+        """
+        result: dict[str, bool] = dict.fromkeys(filenames, False)
+
+        for filename, _ in self._select_many(column="1", filenames=list(result)):
+            result[filename] = True
+
+        return result
+
+    def load_many(self, filenames: Iterable[str]) -> dict[str, str]:
+        """Load strings of many files with one query per chunk of filenames. Missing files are skipped.
+
+        :param typing.Iterable[str] filenames: Filenames of files to load.
+        :return: Dict of filename to file content string.
+        :rtype: typing.Dict[str, str]
+        """
+        result: dict[str, str] = {}
+
+        for filename, data in self._select_many(column="data", filenames=list(dict.fromkeys(filenames))):
+            result[filename] = _decompress(data).decode(encoding="utf-8")
+            self._record_access(filename=filename)
+
+        return result
@@ -0,0 +1,239 @@
+"""Transports to send requests to the KEGG API or to local stand-ins of the API."""
+
+import io
+import mimetypes
+import os
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from http import HTTPStatus
+from typing import Any
+from urllib.parse import quote, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+
+def build_session(pool_connections: int = 4, pool_maxsize: int = 10) -> requests.Session:
+    """Build HTTP session with a persistent keep-alive connection pool.
+
+    :param int pool_connections: Number of per-host connection pools to keep.
+    :param int pool_maxsize: Maximal number of open connections per host. Requests block until a connection is free.
+    :return: Session with connection pooling adapter mounted for http and https.
+    :rtype: requests.Session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=True)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def url_to_path(root: str, url: str) -> str:
+    """Build path of file in directory tree that is laid out like the url.
+
+    E.g. "http://rest.kegg.jp/get/mmu04064/kgml" is mapped to "<root>/rest.kegg.jp/get/mmu04064/kgml". Characters
+    that are not allowed in filenames on all platforms (like ":" in "/list/mmu:11797") are percent-encoded.
+
+    :param str root: Root directory of tree.
+    :param str url: Url to map.
+    :return: Path of file.
+    :rtype: str
+    """
+    parsed = urlparse(url)
+    parts: list[str] = [quote(part, safe="+-_.") for part in parsed.path.split("/") if part != ""]
+    return os.path.join(root, parsed.netloc, *parts)
+
+
+def build_response(
+    url: str,
+    status_code: int,
+    content: bytes = b"",
+    headers: dict[str, str] | None = None,
+) -> requests.Response:
+    """Build response object without sending a request.
+
+    :param str url: Url of response.
+    :param int status_code: HTTP status code.
+    :param bytes content: Payload of response.
+    :param typing.Optional[typing.Dict[str, str]] headers: Response headers.
+    :return: Response instance.
+    :rtype: requests.Response
+    """
+    response = requests.Response()
+    response.url = url
+    response.status_code = status_code
+    response.reason = HTTPStatus(status_code).phrase
+    response.headers = CaseInsensitiveDict(headers or {})
+    response.encoding = "utf-8"
+
+    # Streamed content is read from raw buffer, content is available without reading the buffer
+    response.raw = io.BytesIO(content)
+    response._content = content
+
+    return response
+
+
+class Transport(ABC):
+    """Base class of transports used by `Resolver` to send GET requests."""
+
+    @abstractmethod
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        """Send GET request.
+
+        :param str url: Url to request.
+        :param typing.Any kwargs: Other arguments of request, like `headers`, `timeout` or `stream`.
+        :return: Response of request.
+        :rtype: requests.Response
+        """
+
+    def close(self) -> None:  # noqa: B027
+        """Release resources of transport. Transports without resources do not override it."""
+
+
+class HTTPTransport(Transport):
+    """Transport to send requests via HTTP with a persistent connection pool."""
+
+    def __init__(self, session: requests.Session | None = None, pool_maxsize: int = 10) -> None:
+        """Init HTTPTransport instance.
+
+        :param typing.Optional[requests.Session] session: HTTP session to send requests with. If None, a session with \
+            a keep-alive connection pool is created.
+        :param int pool_maxsize: Maximal number of connections per host in the pool of the generated session.
+        """
+        # Session is only closed by the transport if it was created by the transport
+        self._owns_session: bool = session is None
+        self.session: requests.Session = session if session is not None else build_session(pool_maxsize=pool_maxsize)
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        """Send GET request with session.
+
+        :param str url: Url to request.
+        :param typing.Any kwargs: Other arguments to `requests.Session.get`.
+        :return: Response of request.
+        :rtype: requests.Response
+        """
+        return self.session.get(url=url, **kwargs)
+
+    def close(self) -> None:
+        """Close connection pool of session."""
+        if self._owns_session is True:
+            self.session.close()
+
+
+class LocalTransport(Transport):
+    """Transport to serve requests from a local directory tree that is laid out like the KEGG REST urls.
+
+    E.g. "http://rest.kegg.jp/list/organism" is served from "<root>/rest.kegg.jp/list/organism". Missing files are
+    answered with "404 Not Found". Latency and failures can be injected to benchmark bulk requests, retries and rate
+    limiting offline.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        latency: float = 0.0,
+        failure_rate: float = 0.0,
+        failure_status: int = 503,
+        seed: int | None = None,
+    ) -> None:
+        """Init LocalTransport instance.
+
+        :param str root: Root directory of tree.
+        :param float latency: Delay of each response in seconds.
+        :param float failure_rate: Probability of a request to fail with `failure_status` (0 to 1).
+        :param int failure_status: HTTP status code of injected failures.
+        :param typing.Optional[int] seed: Seed of random number generator for reproducible failures.
+        """
+        if not os.path.isdir(root):
+            raise NotADirectoryError(f"Directory '{root}' does not exist.")
+
+        self.root: str = root
+        self.latency: float = latency
+        self.failure_rate: float = failure_rate
+        self.failure_status: int = failure_status
+
+        self._random: random.Random = random.Random(seed)
+        self._lock: threading.Lock = threading.Lock()
+
+        # Number of handled requests
+        self.request_count: int = 0
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        """Load file of url from directory tree.
+
+        :param str url: Url to request.
+        :param typing.Any kwargs: Other arguments of request. Ignored.
+        :return: Response of request.
+        :rtype: requests.Response
+        """
+        with self._lock:
+            self.request_count += 1
+            failed: bool = self._random.random() < self.failure_rate
+
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+        if failed is True:
+            return build_response(url=url, status_code=self.failure_status)
+
+        path: str = url_to_path(root=self.root, url=url)
+
+        if not os.path.isfile(path):
+            return build_response(url=url, status_code=404)
+
+        with open(path, "rb") as file_obj:
+            content: bytes = file_obj.read()
+
+        content_type: str | None = mimetypes.guess_type(path)[0]
+
+        return build_response(
+            url=url,
+            status_code=200,
+            content=content,
+            headers={"Content-Type": content_type if content_type is not None else "text/plain"},
+        )
+
+
+class RecordingTransport(Transport):
+    """Transport that records successful responses of another transport to a directory tree.
+
+    The recorded tree can be replayed with `LocalTransport`.
+    """
+
+    def __init__(self, root: str, transport: Transport | None = None) -> None:
+        """Init RecordingTransport instance.
+
+        :param str root: Root directory of tree to record to. Directory is created if it does not exist.
+        :param typing.Optional[Transport] transport: Transport to send requests with. Defaults to `HTTPTransport`.
+        """
+        os.makedirs(root, exist_ok=True)
+
+        self.root: str = root
+        self.transport: Transport = transport if transport is not None else HTTPTransport()
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        """Send GET request with wrapped transport and record successful response.
+
+        :param str url: Url to request.
+        :param typing.Any kwargs: Other arguments of request.
+        :return: Response of request.
+        :rtype: requests.Response
+        """
+        response: requests.Response = self.transport.get(url=url, **kwargs)
+
+        if response.status_code == 200:
+            path: str = url_to_path(root=self.root, url=url)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+            # Reading content of a streamed response keeps content available for later iteration
+            with open(path, "wb") as file_obj:
+                file_obj.write(response.content)
+
+        return response
+
+    def close(self) -> None:
+        """Release resources of wrapped transport."""
+        self.transport.close()
@@ -3,7 +3,9 @@
 import csv
 import os
 import re
+from collections.abc import Container, Iterable, Iterator
 from io import StringIO
+from typing import Literal
 
 import pandas as pd
 
@@ -31,18 +33,28 @@ def parse_tsv_to_dict(
     :return: Dict of two tsv columns.
     :rtype: typing.Dict[str, str]
     """
-    list_data: list = parse_tsv(data=data)
+    return dict(iter_tsv_pairs(lines=StringIO(data), col_keys=col_keys, col_values=col_values))
 
-    result: dict[str, str] = {}
 
-    for row in list_data:
+def iter_tsv_pairs(
+    lines: Iterable[str],
+    col_keys: int = 0,
+    col_values: int = 1,
+) -> Iterator[tuple[str, str]]:
+    """Parse lines of .tsv file one by one and yield pairs of two columns. Other columns are ignored.
+
+    :param typing.Iterable[str] lines: Lines of tsv file, e.g. an open file object.
+    :param int col_keys: Number of colum to parse as keys (0-index).
+    :param int col_values: Number of colum to parse as values (0-index).
+    :return: Iterator over tuples of two tsv columns.
+    :rtype: typing.Iterator[typing.Tuple[str, str]]
+    """
+    for row in csv.reader(lines, delimiter="\t"):
         if len(row) >= 2 and row[col_keys] != "":
-            result[row[col_keys]] = row[col_values]
+            yield row[col_keys], row[col_values]
 
         # TODO: handle else cases or ignore silent ?
 
-    return result
-
 
 class ColorGradient:
     """Create color gradient."""
@@ -108,17 +120,24 @@ class ColorGradient:
         return tuple(int(item) for item in values)
 
 
-def is_valid_pathway_org(value: str) -> bool:
+def is_valid_pathway_org(value: str, organisms: Container[str] | None = None) -> bool:
     """Check if organism identifier is valid.
 
     :param str value: String value to check.
+    :param typing.Optional[typing.Container[str]] organisms: Known organism codes, e.g. \
+        `keggtools.resolver.Resolver.get_organism_index`. If None, only the format of the code is checked.
     :return: Returns True if value is a valid organism code.
     :rtype: bool
     """
-    # Organism must be 3 letter code
     # Identifier can also be KO or Enzyme identifer
-    # TODO: validate with KEGG organism list
-    return re.match(pattern=r"^(ko|ec|[a-z]{3})$", string=value) is not None
+    if value in ("ko", "ec"):
+        return True
+
+    if organisms is not None:
+        return value in organisms
+
+    # Organism must be 3 letter code
+    return re.match(pattern=r"^[a-z]{3}$", string=value) is not None
 
 
 def is_valid_pathway_number(value: str) -> bool:
@@ -173,6 +192,10 @@ def merge_entrez_geneid(
 ) -> pd.DataFrame:
     """Use pybiomart to merge entrez gene id to differential expression dataframe.
 
+    Sends a query to ensembl.org on every call. Use `merge_kegg_geneid` with the cached tables of
+    `keggtools.resolver.Resolver.get_gene_symbols` or `keggtools.resolver.Resolver.get_conversion_table` to convert
+    ids offline.
+
     :param pandas.DataFrame diffexp: Pandas dataframe containing to differential expression data.
     :param str gene_column: Name of column in differential expression dataframe that contains to gene symbol.
     :param str dataset_name: Biomart dataset to use for conversion.
@@ -203,6 +226,35 @@ def merge_entrez_geneid(
     return diffexp
 
 
+def merge_kegg_geneid(
+    diffexp: pd.DataFrame,
+    conversion: pd.DataFrame,
+    gene_column: str = "names",
+    on: str = "symbol",
+    how: Literal["inner", "left"] = "inner",
+) -> pd.DataFrame:
+    """Merge KEGG gene id to differential expression dataframe.
+
+    :param pandas.DataFrame diffexp: Pandas dataframe containing differential expression data.
+    :param pandas.DataFrame conversion: Table with column "kegg" and column `on`, e.g. from \
+        `keggtools.resolver.Resolver.get_gene_symbols` or `keggtools.resolver.Resolver.get_conversion_table`.
+    :param str gene_column: Name of column in differential expression dataframe that contains the gene id to convert.
+    :param str on: Name of column in conversion table to match `gene_column` with, e.g. "symbol" or "ncbi-geneid".
+    :param str how: Type of merge. "inner" removes genes without KEGG id, "left" keeps them.
+    :return: Returns differential expression dataframe with merged column "kegg".
+    :rtype: pandas.DataFrame
+    """
+    # Keep one KEGG id per gene, so rows of differential expression dataframe are not duplicated
+    right: pd.DataFrame = conversion[["kegg", on]].drop_duplicates(subset=on)
+
+    merged: pd.DataFrame = diffexp.merge(right=right, how=how, left_on=gene_column, right_on=on)
+
+    if on != gene_column and on not in diffexp.columns:
+        merged = merged.drop(columns=on)
+
+    return merged
+
+
 def msig_to_kegg_id() -> pd.DataFrame:
     """Load dataframe to map canonical pathway id of MSigDB to KEGG pathway id.
 
@@ -15,6 +15,22 @@ ORGANISM: str = "mmu"
 CACHEDIR: str = os.path.join(os.path.dirname(__file__), ".test_keggtools_cache")
 
 
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add option to run benchmarks."""
+    parser.addoption("--benchmark", action="store_true", default=False, help="run tests marked as benchmark")
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    """Skip benchmarks unless enabled. Timings depend on load of the machine and slow down the unit tests."""
+    if config.getoption("--benchmark"):
+        return
+
+    skip_benchmark: pytest.MarkDecorator = pytest.mark.skip(reason="benchmark, run with --benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip_benchmark)
+
+
 @pytest.fixture(scope="function")
 def storage() -> Generator[Storage, None, None]:
     """Generate storage instance. Fixtures helps cleanup cache dir after each function call."""
@@ -109,3 +109,24 @@ def test_enrichment(storage: Storage) -> None:
 
     # Raises no error if overwrite is set to true
     enrichment.to_csv(file_obj=csv_filename, overwrite=True)
+
+
+def test_enrichment_from_gene_sets(pathway: Pathway) -> None:
+    """Testing enrichment analysis from genes of pathways without KGML pathways."""
+    gene_list: list[str] = ["12043", "18035", "17874", "21937"]
+
+    enrichment: Enrichment = Enrichment.from_gene_sets(
+        org="mmu",
+        gene_sets={"04064": list(pathway.get_genes()), "99999": ["11111", "22222"]},
+        titles={"path:mmu04064": "NF-kappa B signaling pathway"},
+    )
+    results: list[EnrichmentResult] = enrichment.run_analysis(gene_list=gene_list)
+
+    # Results equal analysis of KGML pathway
+    expected: EnrichmentResult = Enrichment(pathways=[pathway]).run_analysis(gene_list=gene_list)[0]
+
+    assert results[0].pathway_name == expected.pathway_name
+    assert results[0].found_genes == expected.found_genes
+    assert results[0].pathway_title == "NF-kappa B signaling pathway"
+
+    assert results[1].study_count == 0 and results[1].pathway_title is None
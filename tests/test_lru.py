@@ -0,0 +1,43 @@
+"""Testing lru module."""
+
+import pytest
+
+from keggtools.lru import LRUCache
+
+
+def test_lru_cache() -> None:
+    """Testing eviction and versions of items."""
+    cache: LRUCache[str] = LRUCache(maxsize=2)
+
+    cache.put(key="a", value="A", version=1)
+    cache.put(key="b", value="B", version=1)
+
+    # Access of "a" makes "b" the least recently used item
+    assert cache.get(key="a", version=1) == "A"
+    cache.put(key="c", value="C", version=1)
+
+    assert cache.get(key="b", version=1) is None
+    assert len(cache) == 2
+
+    # Outdated items are dropped
+    assert cache.get(key="a", version=2) is None
+    assert cache.get(key="a", version=1) is None
+
+    cache.invalidate(key="c")
+    assert len(cache) == 0
+
+    assert cache.stats() == {"hits": 1, "misses": 3, "evictions": 1, "size": 0, "maxsize": 2}
+
+    cache.clear()
+    assert cache.stats()["misses"] == 0
+
+
+def test_lru_cache_disabled() -> None:
+    """Testing cache without capacity."""
+    cache: LRUCache[str] = LRUCache(maxsize=0)
+    cache.put(key="a", value="A")
+
+    assert cache.get(key="a") is None
+
+    with pytest.raises(ValueError):
+        LRUCache(maxsize=-1)
@@ -1,6 +1,9 @@
 """Testing parsing models."""
 
+import logging
 import os
+import pickle
+import timeit
 from xml.etree import ElementTree
 
 import pytest
@@ -349,11 +352,180 @@ def test_full_pathway_parsing() -> None:
     # test get gene list function
     # TODO: better checks (type, ...)
 
-    gene_list: list[str] = pathway_parsed.get_genes()
+    gene_list: tuple[str, ...] = pathway_parsed.get_genes()
 
     assert "19697" in gene_list
 
 
+def test_fast_pathway_parsing() -> None:
+    """Testing fast parser engine against pydantic-xml engine."""
+    basedir: str = os.path.dirname(__file__)
+
+    with open(os.path.join(basedir, "pathway.kgml"), encoding="utf-8") as file_obj:
+        kgml: str = file_obj.read()
+
+    # Add reaction with alt elements and group entry with components to test all models
+    kgml = kgml.replace(
+        "</pathway>",
+        """
+        <entry id="900" name="undefined" type="group">
+            <graphics fgcolor="#000000" bgcolor="#FFFFFF" type="rectangle" x="10" y="20" width="46" height="17"/>
+            <component id="901"/>
+            <component id="902"/>
+        </entry>
+        <reaction id="29" name="rn:R01274" type="irreversible">
+            <substrate id="86" name="cpd:C00154"><alt name="cpd:C00155"/></substrate>
+            <product id="87" name="cpd:C00249"/>
+            <substrate id="88" name="cpd:C00156"/>
+        </reaction>
+        </pathway>""",
+    )
+
+    parsed: Pathway = Pathway.from_xml(kgml)
+    parsed_fast: Pathway = Pathway.from_xml(kgml, engine="fast")
+
+    # Models, order of lists and set fields are identical
+    assert parsed_fast == parsed
+    assert parsed_fast.model_dump(exclude_unset=True) == parsed.model_dump(exclude_unset=True)
+    assert parsed_fast.to_xml() == parsed.to_xml()
+
+    group: Entry | None = parsed_fast.get_entry_by_id(entry_id="900")
+
+    assert group is not None and group.graphics is not None
+    assert group.graphics.x == 10 and len(group.components) == 2
+    assert parsed_fast.reactions[-1].substrates[0].alt is not None
+
+    with pytest.raises(ValueError):
+        Pathway.from_xml(kgml, engine="invalid")  # ty: ignore[invalid-argument-type]
+
+
+@pytest.mark.benchmark
+def test_fast_pathway_parsing_benchmark() -> None:
+    """Benchmark fast parser engine against pydantic-xml engine."""
+    with open(os.path.join(os.path.dirname(__file__), "pathway.kgml"), "rb") as file_obj:
+        kgml: bytes = file_obj.read()
+
+    # Best of repeated runs is least affected by other load of the machine
+    timings: dict[str, float] = {
+        engine: min(timeit.repeat(lambda engine=engine: Pathway.from_xml(kgml, engine=engine), number=10, repeat=5))
+        / 10
+        for engine in ("pydantic", "fast")
+    }
+
+    logging.getLogger(__name__).info(
+        "KGML parsing: pydantic %.2f ms, fast %.2f ms (%.1fx)",
+        timings["pydantic"] * 1000,
+        timings["fast"] * 1000,
+        timings["pydantic"] / timings["fast"],
+    )
+
+    assert timings["fast"] < timings["pydantic"]
+
+
+def test_pathway_indexes(pathway: Pathway) -> None:
+    """Testing lookup indexes of pathway."""
+    # Lookups match linear scans of entries and relations
+    for entry in pathway.entries:
+        assert pathway.get_entry_by_id(entry_id=entry.id) is next(
+            item for item in pathway.entries if item.id == entry.id
+        )
+
+    assert [item.id for item in pathway.get_entries_by_gene(gene_id="19697")] == [
+        item.id for item in pathway.entries if item.type == "gene" and "19697" in item.get_gene_id()
+    ]
+    assert pathway.get_outgoing_relations(entry_id="137") == tuple(
+        item for item in pathway.relations if item.entry1 == "137"
+    )
+    assert pathway.get_incoming_relations(entry_id="58") == tuple(
+        item for item in pathway.relations if item.entry2 == "58"
+    )
+    assert pathway.get_entries_by_gene(gene_id="invalid") == ()
+
+    # Indexes do not affect equality, copies and pickles
+    copied: Pathway = pathway.model_copy(deep=True)
+    assert copied == pathway
+    assert pickle.loads(pickle.dumps(pathway)) == pathway
+
+    # Indexes are rebuilt after lists are changed
+    pathway.entries.append(Entry(id="9999", name="mmu:1 mmu:2", type="gene"))
+    pathway.relations.append(Relation(entry1="9999", entry2="137", type="PPrel"))
+
+    assert pathway.get_entry_by_id(entry_id="9999") is pathway.entries[-1]
+    assert pathway.get_entries_by_gene(gene_id="2") == (pathway.entries[-1],)
+    assert pathway.get_incoming_relations(entry_id="137")[-1] is pathway.relations[-1]
+
+    pathway.entries = []
+    assert pathway.get_entry_by_id(entry_id="9999") is None
+
+    # Indexes are rebuilt after changes of lists that keep the length
+    removed: Entry = copied.entries[0]
+    assert copied.get_entry_by_id(entry_id=removed.id) is removed
+    copied.entries.pop(0)
+    copied.entries.append(Entry(id="9997", name="mmu:5", type="gene"))
+    assert copied.get_entry_by_id(entry_id=removed.id) is None
+    assert copied.get_entry_by_id(entry_id="9997") is copied.entries[-1]
+
+    copied.entries[0] = Entry(id="9998", name="mmu:3", type="gene")
+    assert copied.get_entry_by_id(entry_id="9998") is copied.entries[0]
+
+    relation: Relation = copied.relations[0]
+    copied.relations[0] = Relation(entry1="9998", entry2=relation.entry2, type="PPrel")
+    assert copied.get_outgoing_relations(entry_id="9998") == (copied.relations[0],)
+
+    # Attributes of entries modified in place are found after invalidation
+    copied.entries[0].id = "9996"
+    copied.invalidate_indexes()
+    assert copied.get_entry_by_id(entry_id="9996") is copied.entries[0]
+
+    # Lists of copies with updated fields are tracked
+    updated: Pathway = copied.model_copy(update={"entries": [Entry(id="1", name="mmu:1", type="gene")]})
+    assert updated.get_entry_by_id(entry_id="1") is updated.entries[0]
+    updated.entries.append(Entry(id="2", name="mmu:2", type="gene"))
+    assert updated.get_entry_by_id(entry_id="2") is updated.entries[-1]
+
+    # Lists written directly to the fields of the model are tracked on lookup
+    updated.__dict__["entries"] = [Entry(id="3", name="mmu:3", type="gene")]
+    assert updated.get_entry_by_id(entry_id="3") is updated.entries[0]
+    assert updated.get_entry_by_id(entry_id="1") is None
+
+    # Split gene ids are not shared between calls
+    genes: list[str] = copied.entries[0].get_gene_id()
+    genes.append("4")
+    assert copied.entries[0].get_gene_id() == ["3"]
+
+
+def test_pathway_get_genes(pathway: Pathway) -> None:
+    """Testing cached list of genes of pathway."""
+
+    def list_ids(entry_type: str) -> list[str]:
+        # Unique ids in order of first occurrence
+        result: list[str] = []
+        for entry in pathway.entries:
+            if entry.type == entry_type:
+                result.extend(gene_id for gene_id in entry.get_gene_id() if gene_id not in result)
+        return result
+
+    genes: tuple[str, ...] = pathway.get_genes()
+    assert list(genes) == list_ids(entry_type="gene")
+
+    # Result is cached until entries are changed
+    assert pathway.get_genes() is genes
+
+    pathway.entries.append(Entry(id="9999", name="ko:K04345 ko:K04346", type="ortholog"))
+    pathway.entries.append(Entry(id="9998", name="ec:2.7.11.1 ko:K04345", type="enzyme"))
+    pathway.entries.append(Entry(id="9997", name="mmu:1 mmu:19697", type="gene"))
+
+    assert pathway.get_genes() == (*genes, "1")
+
+    for entry_type in ("gene", "ortholog", "enzyme"):
+        assert list(pathway.get_genes(entry_type=entry_type)) == list_ids(entry_type=entry_type)
+
+    assert pathway.get_genes(entry_type="ortholog")[-2:] == ("K04345", "K04346")
+
+    with pytest.raises(ValueError):
+        pathway.get_genes(entry_type="compound")  # ty: ignore[invalid-argument-type]
+
+
 def test_kgml_to_xml(pathway: Pathway) -> None:
     """Testing generate and parsing from pathway instance."""
     # Testing KGML model to xml string
@@ -0,0 +1,38 @@
+"""Testing organism module."""
+
+from io import StringIO
+
+from keggtools.organism import Organism, OrganismIndex
+
+
+def test_organism_index() -> None:
+    """Testing lookups and prefix search of organism index."""
+    index: OrganismIndex = OrganismIndex.from_lines(
+        StringIO(
+            "T01001\thsa\tHomo sapiens (human)\tEukaryotes;Animals;Vertebrates;Mammals\n"
+            "T01002\tmmu\tMus musculus (house mouse)\tEukaryotes;Animals;Vertebrates;Mammals\n"
+            "T01005\tptr\tPan troglodytes (chimpanzee)\tEukaryotes;Animals;Vertebrates;Mammals\n"
+            "T02283\tpps\tPan paniscus (bonobo)\tEukaryotes;Animals;Vertebrates;Mammals\n"
+            "\n"
+        )
+    )
+
+    assert len(index) == 4
+    assert "hsa" in index
+    assert "abc" not in index
+    assert [item.code for item in index] == ["hsa", "mmu", "ptr", "pps"]
+
+    human: Organism = Organism(
+        tnumber="T01001", code="hsa", name="Homo sapiens (human)", lineage="Eukaryotes;Animals;Vertebrates;Mammals"
+    )
+    assert index.get("hsa") == human
+    assert index.get_by_tnumber("T01001") == human
+    assert index.get_by_name("Homo sapiens (human)") == human
+    assert index.get_by_name("homo sapiens") == human
+    assert index.get("abc") is None
+
+    # Prefix search of codes and names
+    assert [item.code for item in index.search("p")] == ["pps", "ptr"]
+    assert [item.code for item in index.search("Pan ")] == ["pps", "ptr"]
+    assert [item.code for item in index.search("mus")] == ["mmu"]
+    assert index.search("xyz") == []
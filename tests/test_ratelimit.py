@@ -0,0 +1,100 @@
+"""Testing rate limiter module."""
+
+from pathlib import Path
+
+import pytest
+
+from keggtools.ratelimit import RateLimiter, SharedRateLimiter, get_default_rate_limiter, set_default_rate_limiter
+from keggtools.resolver import Resolver
+from keggtools.storage import Storage
+
+
+def test_rate_limiter_token_bucket() -> None:
+    """Testing token bucket of rate limiter."""
+    limiter: RateLimiter = RateLimiter(rate=20.0, capacity=2)
+
+    # Burst of requests is not delayed
+    assert limiter.acquire() == 0.0
+    assert limiter.acquire() == 0.0
+
+    # Bucket is empty, next request has to wait for a new token
+    assert limiter.acquire() > 0.0
+
+    # Invalid rate
+    with pytest.raises(ValueError):
+        RateLimiter(rate=0)
+
+
+def test_rate_limiter_aimd() -> None:
+    """Testing adaptive rate of rate limiter."""
+    limiter: RateLimiter = RateLimiter(rate=4.0, min_rate=1.0, increase=0.5, decrease=0.5)
+
+    # Throttled responses decrease rate multiplicative
+    limiter.feedback(status_code=429)
+    assert limiter.rate == 2.0
+
+    limiter.feedback(status_code=503)
+    limiter.feedback(status_code=403)
+    assert limiter.rate == 1.0
+
+    # Successful responses increase rate additive
+    limiter.feedback(status_code=200)
+    assert limiter.rate == 1.5
+
+    # Other errors do not change rate
+    limiter.feedback(status_code=404)
+    assert limiter.rate == 1.5
+
+    # Rate is capped at maximal rate
+    for _ in range(10):
+        limiter.on_success()
+    assert limiter.rate == 4.0
+
+
+def test_rate_limiter_stats() -> None:
+    """Testing wait time statistics of rate limiter."""
+    limiter: RateLimiter = RateLimiter(rate=50.0, capacity=1)
+
+    limiter.acquire()
+    limiter.acquire()
+
+    stats = limiter.stats()
+
+    assert stats["acquired"] == 2
+    assert stats["delayed"] == 1
+    assert stats["max_wait"] > 0.0 and stats["mean_wait"] == stats["total_wait"] / 2
+
+
+def test_shared_rate_limiter(tmp_path: Path) -> None:
+    """Testing rate limiter shared by state file."""
+    first: SharedRateLimiter = SharedRateLimiter(rate=20.0, capacity=2, directory=str(tmp_path))
+    second: SharedRateLimiter = SharedRateLimiter(rate=20.0, capacity=2, directory=str(tmp_path))
+    other_host: SharedRateLimiter = SharedRateLimiter(
+        rate=20.0, capacity=2, host="example.com", directory=str(tmp_path)
+    )
+
+    # Both limiters consume tokens of the same bucket
+    assert first.acquire() == 0.0
+    assert second.acquire() == 0.0
+    assert first.acquire() > 0.0
+
+    # Limiters of other hosts have their own bucket
+    assert other_host.acquire() == 0.0
+
+    # Throttled responses slow down all limiters of host
+    second.feedback(status_code=429)
+    first._try_acquire()
+    assert first.rate == 10.0
+
+
+def test_default_rate_limiter(storage: Storage) -> None:
+    """Testing rate limiter of resolvers without rate limiter."""
+    assert get_default_rate_limiter() is not get_default_rate_limiter()
+
+    shared: RateLimiter = RateLimiter(rate=1.0)
+    set_default_rate_limiter(shared)
+
+    try:
+        assert Resolver(cache=storage).rate_limiter is shared
+    finally:
+        set_default_rate_limiter(None)
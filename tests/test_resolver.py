@@ -1,16 +1,29 @@
 """Testing keggtools resolver module."""
 
+import asyncio
 import os
+import pickle
+import threading
+import time
 import warnings
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
 from unittest.mock import patch
 
 import pytest
+import requests
+from requests.adapters import HTTPAdapter
 from responses import GET as HTTP_METHOD_GET
 from responses import RequestsMock
 
 from keggtools.models import Pathway
-from keggtools.resolver import Resolver, get_gene_names
-from keggtools.storage import Storage
+from keggtools.organism import Organism
+from keggtools.ratelimit import RateLimiter, set_default_rate_limiter
+from keggtools.resolver import AsyncResolver, Resolver, _get, get_gene_names
+from keggtools.storage import SQLiteStorage, Storage
+from keggtools.transport import build_session
 
 from .conftest import CACHEDIR, ORGANISM
 
@@ -40,22 +53,128 @@ def test_get_gene_names() -> None:
         # Check results are correctly parsed
         assert result_dict["mmu:11797"] == "Birc2" and result_dict["mmu:266632"] == "Irak4"
 
-    # Check Value error on too many items
-    with pytest.raises(ValueError):
-        get_gene_names(genes=["mmu:12345"] * 51)
+    # Long lists are split into chunks
+    with RequestsMock() as mocked_response:
+        mocked_response.add(
+            method=HTTP_METHOD_GET,
+            url="http://rest.kegg.jp/list/mmu:11797+mmu:266632",
+            body="mmu:11797\tBirc2, AW146227, Api1, Api2, Birc3\nmmu:266632\tIrak4, 8430405M07Rik, 9330209D03Rik\n",
+            status=200,
+        )
+        mocked_response.add(
+            method=HTTP_METHOD_GET,
+            url="http://rest.kegg.jp/list/mmu:22033",
+            body="mmu:22033\tTraf5; TNF receptor-associated factor 5\n",
+            status=200,
+        )
+
+        result_dict = get_gene_names(genes=gene_list, max_genes=2, workers=2)
+
+        assert len(mocked_response.calls) == 2
+        assert (
+            result_dict["mmu:266632"] == "Irak4"
+            and result_dict["mmu:22033"] == "Traf5; TNF receptor-associated factor 5"
+        )
+
+    # Requests share the default rate limiter
+    shared: RateLimiter = RateLimiter(rate=100.0)
+    set_default_rate_limiter(shared)
+
+    try:
+        with RequestsMock() as mocked_response, patch.object(shared, "acquire", wraps=shared.acquire) as acquire:
+            mocked_response.add(
+                method=HTTP_METHOD_GET,
+                url="http://rest.kegg.jp/list/mmu:11797",
+                body="mmu:11797\tBirc2, AW146227, Api1, Api2, Birc3\n",
+                status=200,
+            )
+
+            assert get_gene_names(genes=["mmu:11797"]) == {"mmu:11797": "Birc2"}
+            acquire.assert_called_once()
+    finally:
+        set_default_rate_limiter(None)
 
     # Check Value error if no genes are provided
     with pytest.raises(ValueError):
         get_gene_names(genes=[])
 
 
+def test_resolver_get_gene_names(resolver: Resolver) -> None:
+    """Testing caching of gene names by resolver."""
+    with RequestsMock() as mocked_response:
+        mocked_response.add(
+            method=HTTP_METHOD_GET,
+            url="http://rest.kegg.jp/list/mmu:11797+mmu:22033",
+            body="mmu:11797\tBirc2, AW146227, Api1, Api2, Birc3\n",
+            status=200,
+        )
+
+        assert resolver.get_gene_names(genes=["mmu:11797", "mmu:22033"]) == {"mmu:11797": "Birc2"}
+
+    # Resolved and unresolved genes are cached
+    assert resolver.storage.exist("gene_names_mmu.tsv")
+
+    with RequestsMock() as mocked_response:
+        mocked_response.add(
+            method=HTTP_METHOD_GET,
+            url="http://rest.kegg.jp/list/mmu:266632",
+            body="mmu:266632\tIrak4, 8430405M07Rik, 9330209D03Rik\n",
+            status=200,
+        )
+
+        # Only unknown genes are requested
+        assert resolver.get_gene_names(genes=["mmu:11797", "mmu:22033", "mmu:266632"]) == {
+            "mmu:11797": "Birc2",
+            "mmu:266632": "Irak4",
+        }
+        assert len(mocked_response.calls) == 1
+
+    with patch.object(resolver.transport, "get") as mock:
+        assert resolver.get_gene_names(genes=["mmu:266632"]) == {"mmu:266632": "Irak4"}
+        mock.assert_not_called()
+
+    def concurrent_lookup(request: Any) -> tuple[int, dict[str, str], str]:
+        # Cached names are read and written by other threads while names are requested
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            assert executor.submit(resolver.get_gene_names, genes=["mmu:11797"]).result(timeout=5) == {
+                "mmu:11797": "Birc2"
+            }
+            executor.submit(
+                resolver.storage.save,
+                filename="gene_names_mmu.tsv",
+                data=resolver.storage.load(filename="gene_names_mmu.tsv") + "mmu:12345\tOther\n",
+            ).result(timeout=5)
+
+        return 200, {}, "mmu:54321\tNew\n"
+
+    with RequestsMock() as mocked_response:
+        mocked_response.add_callback(
+            method=HTTP_METHOD_GET,
+            url="http://rest.kegg.jp/list/mmu:54321",
+            callback=concurrent_lookup,
+        )
+
+        assert resolver.get_gene_names(genes=["mmu:54321"]) == {"mmu:54321": "New"}
+
+    # Names cached by others during the request are merged
+    with patch.object(resolver.transport, "get") as mock:
+        assert resolver.get_gene_names(genes=["mmu:12345", "mmu:54321", "mmu:11797"]) == {
+            "mmu:12345": "Other",
+            "mmu:54321": "New",
+            "mmu:11797": "Birc2",
+        }
+        mock.assert_not_called()
+
+
 def test_resolver_init(storage: Storage) -> None:
     """Testing init function of resolver with different arugment types."""
-    assert Resolver(cache=None).storage.cachedir == Storage().cachedir
+    default_storage = Resolver(cache=None).storage
+    assert isinstance(default_storage, Storage) and default_storage.cachedir == Storage().cachedir
 
-    assert Resolver(cache=storage).storage.cachedir == CACHEDIR
+    assert Resolver(cache=storage).storage is storage
 
-    assert Resolver(cache=CACHEDIR).storage.cachedir == CACHEDIR
+    path_storage = Resolver(cache=CACHEDIR).storage
+    assert isinstance(path_storage, Storage) and path_storage.cachedir == CACHEDIR
 
 
 def test_resolver_cache_or_request(resolver: Resolver) -> None:
@@ -77,7 +196,7 @@ def test_resolver_cache_or_request(resolver: Resolver) -> None:
         # File should exist now
         assert resolver.storage.exist(testing_filename) is True
 
-    with patch("requests.get") as mock:
+    with patch.object(resolver.transport, "get") as mock:
         # Resolver should access file from cache
         assert resolver._cache_or_request(filename=testing_filename, url=testing_url) == testing_payload
 
@@ -85,6 +204,113 @@ def test_resolver_cache_or_request(resolver: Resolver) -> None:
         mock.assert_not_called()
 
 
+def test_resolver_single_flight(resolver: Resolver) -> None:
+    """Testing concurrent requests of the same file are coalesced."""
+    testing_url: str = "http://rest.kegg.jp/list/compound"
+
+    def slow_callback(_request: object) -> tuple[int, dict[str, str], str]:
+        time.sleep(0.2)
+        return 200, {}, "cpd:C00001\tH2O; Water\n"
+
+    with RequestsMock() as mocked_response:
+        mocked_response.add_callback(HTTP_METHOD_GET, url=testing_url, callback=slow_callback)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results: list[dict[str, str]] = list(executor.map(lambda _: resolver.get_compounds(), range(4)))
+
+        # File is only requested once, all callers get the same result
+        assert len(mocked_response.calls) == 1
+        assert all(item == {"cpd:C00001": "H2O; Water"} for item in results)
+
+
+def test_resolver_session(storage: Storage) -> None:
+    """Testing session handling of resolver."""
+    # Resolver generates own session with connection pool
+    with Resolver(cache=storage) as generated_resolver:
+        assert isinstance(generated_resolver.session, requests.Session)
+        adapter = generated_resolver.session.get_adapter("http://rest.kegg.jp")
+        assert isinstance(adapter, HTTPAdapter) and adapter.poolmanager.connection_pool_kw["maxsize"] == 10
+
+    # Passed session is used for requests
+    session: requests.Session = build_session(pool_maxsize=2)
+    assert Resolver(cache=storage, session=session).session is session
+
+
+def test_resolver_retry(storage: Storage) -> None:
+    """Testing retry of requests on transient errors."""
+    testing_url: str = "http://rest.kegg.jp/list/pathway/mmu"
+
+    resolver: Resolver = Resolver(cache=storage, retries=2, backoff_factor=0, rate_limiter=RateLimiter(rate=100.0))
+
+    with RequestsMock() as mocked_response:
+        # First requests fail with transient errors. Responses are returned in order of registration
+        mocked_response.add(HTTP_METHOD_GET, url=testing_url, status=503)
+        mocked_response.add(HTTP_METHOD_GET, url=testing_url, status=429, headers={"Retry-After": "0"})
+        mocked_response.add(HTTP_METHOD_GET, url=testing_url, body="path:mmu00010\tGlycolysis\n", status=200)
+
+        assert resolver.get_pathway_list(organism=ORGANISM) == {"path:mmu00010": "Glycolysis"}
+        assert len(mocked_response.calls) == 3
+
+    # Raise error if all retries failed
+    with RequestsMock() as mocked_response:
+        mocked_response.add(HTTP_METHOD_GET, url="http://rest.kegg.jp/list/compound", status=500)
+
+        with pytest.raises(requests.HTTPError):
+            resolver.get_compounds()
+
+        assert len(mocked_response.calls) == 3
+
+    # Client errors are not retried
+    with RequestsMock() as mocked_response:
+        mocked_response.add(HTTP_METHOD_GET, url="http://rest.kegg.jp/list/organism", status=404)
+
+        with pytest.raises(requests.HTTPError):
+            resolver.get_organism_list()
+
+        assert len(mocked_response.calls) == 1
+
+
+def test_resolver_releases_failed_responses() -> None:
+    """Testing connections of streamed error responses are returned to a blocking pool."""
+
+    class NotFoundHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            self.send_response(404)
+            self.send_header("Content-Length", "9")
+            self.end_headers()
+            self.wfile.write(b"Not Found")
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    server: ThreadingHTTPServer = ThreadingHTTPServer(("127.0.0.1", 0), NotFoundHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    session: requests.Session = build_session(pool_maxsize=2)
+    errors: list[int] = []
+
+    def request_missing() -> None:
+        # More failing requests than connections in the pool
+        for index in range(5):
+            try:
+                _get(url=f"http://127.0.0.1:{server.server_port}/get/{index}", session=session, stream=True)
+            except requests.HTTPError as error:
+                errors.append(error.response.status_code if error.response is not None else 0)
+
+    try:
+        worker: threading.Thread = threading.Thread(target=request_missing, daemon=True)
+        worker.start()
+        worker.join(timeout=10)
+
+        assert not worker.is_alive()
+        assert errors == [404] * 5
+
+    finally:
+        session.close()
+        server.shutdown()
+        server.server_close()
+
+
 def test_get_pathway_list(resolver: Resolver) -> None:
     """Testing request of pathway list."""
     with RequestsMock() as mocked_response:
@@ -102,7 +328,21 @@ def test_get_pathway_list(resolver: Resolver) -> None:
     assert result["path:mmu00020"] == "Citrate cycle (TCA cycle) - Mus musculus (house mouse)"
 
 
-def test_get_pathway(resolver: Resolver) -> None:
+# Content of mocked PNG images
+PNG_DATA: bytes = b"\x89PNG\r\n\x1a\ndata"
+
+
+class _Payload:
+    """Pickle that runs code when it is unpickled."""
+
+    loaded: bool = False
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """Set flag of class when unpickled."""
+        return (setattr, (_Payload, "loaded", True))
+
+
+def test_get_pathway(resolver: Resolver, storage: Storage) -> None:
     """Testing request of KGML pathway."""
     # Load pathway from file
     with open(os.path.join(os.path.dirname(__file__), "pathway.kgml"), encoding="utf-8") as file_obj:
@@ -118,7 +358,162 @@ def test_get_pathway(resolver: Resolver) -> None:
             status=200,
         )
 
-        assert isinstance(resolver.get_pathway(organism=ORGANISM, code="12345"), Pathway) is True
+        pathway: Pathway = resolver.get_pathway(organism=ORGANISM, code="12345")
+        assert isinstance(pathway, Pathway) is True
+
+    # Parsed pathway is kept in memory
+    assert resolver.get_pathway(organism=ORGANISM, code="12345") is pathway
+    assert resolver.pathway_cache.stats()["hits"] == 1
+
+    # Pathway is parsed again after cached file was changed
+    resolver.storage.save(
+        filename="mmu_path12345.kgml", data=response_content.replace('number="04064"', 'number="00001"')
+    )
+    mtime: float = resolver.storage.mtime(filename="mmu_path12345.kgml")
+    os.utime(storage.build_cache_path(filename="mmu_path12345.kgml"), (mtime + 1, mtime + 1))
+
+    assert resolver.get_pathway(organism=ORGANISM, code="12345").number == "00001"
+
+    # Snapshots are disabled by default
+    assert not resolver.storage.exist(filename="mmu_path12345.kgml.snapshot")
+
+    # Snapshot of parsed pathway is loaded by a new resolver without parsing the KGML file
+    Resolver(cache=resolver.storage, pathway_snapshots=True).get_pathway(organism=ORGANISM, code="12345")
+    assert resolver.storage.exist(filename="mmu_path12345.kgml.snapshot")
+
+    with patch.object(Pathway, "from_xml", side_effect=AssertionError("KGML file is parsed")):
+        assert (
+            Resolver(cache=resolver.storage, pathway_snapshots=True).get_pathway(organism=ORGANISM, code="12345").number
+            == "00001"
+        )
+
+    # Outdated snapshot is replaced
+    resolver.storage.save(filename="mmu_path12345.kgml", data=response_content)
+    assert (
+        Resolver(cache=resolver.storage, pathway_snapshots=True).get_pathway(organism=ORGANISM, code="12345").number
+        == "04064"
+    )
+
+    with patch.object(Pathway, "from_xml", side_effect=AssertionError("KGML file is parsed")):
+        assert (
+            Resolver(cache=resolver.storage, pathway_snapshots=True).get_pathway(organism=ORGANISM, code="12345").number
+            == "04064"
+        )
+
+    # Unreadable snapshot is ignored
+    resolver.storage.save_bytes(filename="mmu_path12345.kgml.snapshot", data=b"invalid")
+    assert (
+        Resolver(cache=resolver.storage, pathway_snapshots=True).get_pathway(organism=ORGANISM, code="12345").number
+        == "04064"
+    )
+
+    # Snapshots are not unpickled, so code in pickles of a shared cache is not run
+    header: bytes = resolver.storage.load_bytes(filename="mmu_path12345.kgml.snapshot").split(b"\n", 1)[0]
+    resolver.storage.save_bytes(
+        filename="mmu_path12345.kgml.snapshot", data=header + b"\n" + pickle.dumps(_Payload(), protocol=2)
+    )
+    assert (
+        Resolver(cache=resolver.storage, pathway_snapshots=True).get_pathway(organism=ORGANISM, code="12345").number
+        == "04064"
+    )
+    assert _Payload.loaded is False
+
+    # Invalid values of snapshot are rejected
+    resolver.storage.save_bytes(
+        filename="mmu_path12345.kgml.snapshot",
+        data=header + b"\n" + b'{"name": "path:mmu12345", "org": "mmu", "number": "1", "entries": [{"type": "x"}]}',
+    )
+    assert (
+        Resolver(cache=resolver.storage, pathway_snapshots=True).get_pathway(organism=ORGANISM, code="12345").number
+        == "04064"
+    )
+
+    # Snapshot is removed together with its KGML file
+    resolver.storage.remove(filename="mmu_path12345.kgml")
+    assert not resolver.storage.exist(filename="mmu_path12345.kgml.snapshot")
+
+
+def test_resolver_external_changes(resolver: Resolver, storage: Storage) -> None:
+    """Testing cached files changed or removed by other processes."""
+    compounds_url: str = "http://rest.kegg.jp/list/compound"
+
+    with RequestsMock() as mocked_response:
+        mocked_response.add(HTTP_METHOD_GET, url=compounds_url, body="cpd:C00001\tH2O; Water\n", status=200)
+        assert resolver.get_compounds() == {"cpd:C00001": "H2O; Water"}
+
+        # File removed by another process (e.g. evicted) is requested again
+        other: Storage = Storage(cachedir=storage.cachedir)
+        other.remove(filename="compound.tsv")
+
+        assert resolver.get_compounds() == {"cpd:C00001": "H2O; Water"}
+        assert list(resolver.iter_compounds()) == [("cpd:C00001", "H2O; Water")]
+        assert len(mocked_response.calls) == 2
+
+    with open(os.path.join(os.path.dirname(__file__), "pathway.kgml"), encoding="utf-8") as file_obj:
+        response_content: str = file_obj.read()
+
+    with RequestsMock() as mocked_response:
+        mocked_response.add(
+            HTTP_METHOD_GET, url="http://rest.kegg.jp/get/mmu12345/kgml", body=response_content, status=200
+        )
+        assert resolver.get_pathway(organism=ORGANISM, code="12345").number == "04064"
+
+        # Pathway rewritten by another process is parsed again
+        other.save(filename="mmu_path12345.kgml", data=response_content.replace('number="04064"', 'number="00001"'))
+        mtime: float = other.mtime(filename="mmu_path12345.kgml")
+        os.utime(other.build_cache_path(filename="mmu_path12345.kgml"), (mtime + 1, mtime + 1))
+
+        assert resolver.get_pathway(organism=ORGANISM, code="12345").number == "00001"
+
+        # Removed pathway is requested again
+        other.remove(filename="mmu_path12345.kgml")
+        assert resolver.get_pathway(organism=ORGANISM, code="12345").number == "04064"
+        assert len(mocked_response.calls) == 2
+
+
+def test_get_pathways(resolver: Resolver) -> None:
+    """Testing bulk request of KGML pathways."""
+    with open(os.path.join(os.path.dirname(__file__), "pathway.kgml"), encoding="utf-8") as file_obj:
+        response_content: str = file_obj.read()
+
+    # Pathway is already cached
+    resolver.storage.save(
+        filename="mmu_path00001.kgml", data=response_content.replace('number="04064"', 'number="00001"')
+    )
+
+    with RequestsMock() as mocked_response:
+        for code in ("00002", "00003"):
+            mocked_response.add(
+                HTTP_METHOD_GET,
+                url=f"http://rest.kegg.jp/get/mmu{code}/kgml",
+                body=response_content.replace('number="04064"', f'number="{code}"'),
+                status=200,
+            )
+
+        pathways: list[Pathway] = resolver.get_pathways(organism=ORGANISM, codes=["00003", "00001", "00002"], workers=2)
+
+        # Only missing pathways are requested
+        assert len(mocked_response.calls) == 2
+
+    # Order of codes is kept
+    assert [item.number for item in pathways] == ["00003", "00001", "00002"]
+
+    # Failing pathways abort the call by default or are skipped and reported
+    resolver.negative_ttl = None
+
+    with RequestsMock() as mocked_response:
+        mocked_response.add(HTTP_METHOD_GET, url="http://rest.kegg.jp/get/mmu00004/kgml", status=404)
+
+        with pytest.raises(requests.HTTPError):
+            resolver.get_pathways(organism=ORGANISM, codes=["00001", "00004"])
+
+    with RequestsMock() as mocked_response:
+        mocked_response.add(HTTP_METHOD_GET, url="http://rest.kegg.jp/get/mmu00004/kgml", status=404)
+
+        with pytest.warns(UserWarning, match="00004"):
+            pathways = resolver.get_pathways(organism=ORGANISM, codes=["00001", "00004", "00002"], errors="skip")
+
+    assert [item.number for item in pathways] == ["00001", "00002"]
 
 
 def test_get_organism_list(resolver: Resolver) -> None:
@@ -142,6 +537,21 @@ def test_get_organism_list(resolver: Resolver) -> None:
 
     # Testing check organism function
     assert resolver.check_organism(organism="hsa") is True
+    assert resolver.check_organism(organism="abc") is False
+
+    # Requests of unknown organisms are rejected without request
+    with RequestsMock() as mocked_response:
+        with pytest.raises(ValueError, match="abc"):
+            resolver.get_pathway(organism="abc", code="00010")
+        with pytest.raises(ValueError, match="abc"):
+            resolver.get_pathway_list(organism="abc")
+
+        assert len(mocked_response.calls) == 0
+
+    # Organism list is only parsed once
+    assert resolver.get_organism_index() is resolver.get_organism_index()
+    bonobo: Organism | None = resolver.get_organism_index().get_by_name("Pan paniscus")
+    assert bonobo is not None and bonobo.code == "pps"
 
 
 def test_get_compounds(resolver: Resolver) -> None:
@@ -161,3 +571,436 @@ def test_get_compounds(resolver: Resolver) -> None:
         result: dict[str, str] = resolver.get_compounds()
 
     assert result["cpd:C00007"] == "Oxygen; O2"
+
+    # Iterate over cached compound file line by line
+    compounds = resolver.iter_compounds()
+    assert next(compounds) == ("cpd:C00001", "H2O; Water")
+    assert len(list(compounds)) == 4
+
+
+def test_iter_pathway_list(resolver: Resolver, storage: Storage) -> None:
+    """Testing streamed download and iteration of pathway list."""
+    with RequestsMock() as mocked_response:
+        mocked_response.add(
+            HTTP_METHOD_GET,
+            url="http://rest.kegg.jp/list/pathway/mmu",
+            body="path:mmu00010\tGlycolysis\npath:mmu00020\tCitrate cycle\n",
+        )
+
+        assert list(resolver.iter_pathway_list(organism=ORGANISM)) == [
+            ("path:mmu00010", "Glycolysis"),
+            ("path:mmu00020", "Citrate cycle"),
+        ]
+
+    # No temporary files are left in cache
+    assert not any(filename.endswith(".tmp") for filename in os.listdir(storage.cachedir))
+
+
+def test_async_resolver(storage: Storage) -> None:
+    """Testing concurrent requests of async resolver."""
+    with open(os.path.join(os.path.dirname(__file__), "pathway.kgml"), encoding="utf-8") as file_obj:
+        response_content: str = file_obj.read()
+
+    async def run_requests(async_resolver: AsyncResolver) -> tuple[list[Pathway], bool]:
+        async with async_resolver:
+            pathways: list[Pathway] = await async_resolver.get_pathways(organism=ORGANISM)
+            return pathways, await async_resolver.check_organism(organism="mmu")
+
+    with RequestsMock() as mocked_response:
+        mocked_response.add(
+            HTTP_METHOD_GET,
+            url="http://rest.kegg.jp/list/pathway/mmu",
+            body="path:mmu12345\tPathway A\npath:mmu12346\tPathway B\n",
+            status=200,
+        )
+        mocked_response.add(HTTP_METHOD_GET, url="http://rest.kegg.jp/get/mmu12345/kgml", body=response_content)
+        mocked_response.add(HTTP_METHOD_GET, url="http://rest.kegg.jp/get/mmu12346/kgml", body=response_content)
+        mocked_response.add(
+            HTTP_METHOD_GET,
+            url="http://rest.kegg.jp/list/organism",
+            body="T01002\tmmu\tMus musculus (house mouse)\tEukaryotes;Animals;Vertebrates;Mammals\n",
+        )
+
+        pathways, organism_exists = asyncio.run(run_requests(AsyncResolver(cache=storage, max_concurrency=2)))
+
+    assert len(pathways) == 2 and all(isinstance(item, Pathway) for item in pathways)
+    assert organism_exists is True
+
+    # Async resolver uses the same cache files as the synchronous resolver
+    assert storage.exist("mmu_path12345.kgml") and storage.exist("mmu_path12346.kgml")
+
+    # Failing pathways are skipped and reported
+    async def run_skipping(async_resolver: AsyncResolver) -> list[Pathway]:
+        async with async_resolver:
+            return await async_resolver.get_pathways(organism=ORGANISM, codes=["12345", "12347"], errors="skip")
+
+    with RequestsMock() as mocked_response:
+        mocked_response.add(HTTP_METHOD_GET, url="http://rest.kegg.jp/get/mmu12347/kgml", status=404)
+
+        with pytest.warns(UserWarning, match="12347"):
+            pathways = asyncio.run(run_skipping(AsyncResolver(cache=storage)))
+
+    assert [item.number for item in pathways] == ["04064"]
+
+
+def test_async_resolver_close(storage: Storage) -> None:
+    """Testing async resolver is closed without blocking the event loop."""
+
+    async def close_while_ticking(async_resolver: AsyncResolver) -> int:
+        ticks: int = 0
+
+        async def tick() -> None:
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(tick())
+        await asyncio.sleep(0)
+
+        async with async_resolver:
+            pass
+
+        task.cancel()
+        return ticks
+
+    # Event loop keeps running while executor waits for running calls
+    async_resolver: AsyncResolver = AsyncResolver(cache=storage)
+    with patch.object(async_resolver._executor, "shutdown", side_effect=lambda wait: time.sleep(0.2)):
+        assert asyncio.run(close_while_ticking(async_resolver)) > 5
+
+    # Passed resolver is not closed
+    resolver: Resolver = Resolver(cache=storage)
+    with patch.object(resolver, "close") as mock:
+        asyncio.run(close_while_ticking(AsyncResolver(resolver=resolver)))
+        mock.assert_not_called()
+
+    # Created resolver is closed
+    with patch.object(Resolver, "close") as mock:
+        asyncio.run(close_while_ticking(AsyncResolver(cache=storage)))
+        mock.assert_called_once()
+
+
+def test_get_pathway_gene_sets(resolver: Resolver) -> None:
+    """Testing request of genes of all pathways from link table."""
+    with RequestsMock() as mocked_response:
+        mocked_response.add(
+            HTTP_METHOD_GET,
+            url="http://rest.kegg.jp/link/pathway/mmu",
+            body="mmu:12043\tpath:mmu04064\nmmu:18035\tpath:mmu04064\nmmu:12043\tpath:mmu04210\n",
+        )
+
+        assert resolver.get_pathway_gene_sets(organism=ORGANISM) == {
+            "04064": ["12043", "18035"],
+            "04210": ["12043"],
+        }
+
+    # Link table is cached
+    assert resolver.get_pathway_gene_sets(organism=ORGANISM)["04210"] == ["12043"]
+
+
+def test_get_conversion_table(resolver: Resolver) -> None:
+    """Testing request of id conversion tables."""
+    with RequestsMock() as mocked_response:
+        mocked_response.add(
+            HTTP_METHOD_GET,
+            url="http://rest.kegg.jp/conv/ncbi-geneid/hsa",
+            body="hsa:1\tncbi-geneid:1\nhsa:3605\tncbi-geneid:3605\n",
+        )
+        mocked_response.add(
+            HTTP_METHOD_GET,
+            url="http://rest.kegg.jp/list/hsa",
+            body="hsa:1\tCDS\t19:complement(58345178..58362751)\tA1BG, A1B, ABG; alpha-1-B glycoprotein\n"
+            "hsa:3605\tCDS\t6:52186387..52190638\tIL17A, CTLA-8, IL17; interleukin 17A\n"
+            "hsa:100\tCDS\t20:complement(44619522..44652233)\tuncharacterized protein\n",
+        )
+
+        table = resolver.get_conversion_table(organism="hsa", target="ncbi-geneid")
+        symbols = resolver.get_gene_symbols(organism="hsa")
+
+    assert table.to_dict(orient="list") == {"kegg": ["1", "3605"], "ncbi-geneid": ["1", "3605"]}
+
+    # Genes without symbol are skipped
+    assert symbols.to_dict(orient="list") == {"kegg": ["1", "3605"], "symbol": ["A1BG", "IL17A"]}
+
+    # Parsed tables are kept in memory
+    assert resolver.get_gene_symbols(organism="hsa") is symbols
+
+    # Ids of target database differ from KEGG ids
+    with RequestsMock() as mocked_response:
+        mocked_response.add(
+            HTTP_METHOD_GET,
+            url="http://rest.kegg.jp/conv/ncbi-proteinid/hsa",
+            body="hsa:1\tncbi-proteinid:NP_570602\nhsa:3605\tncbi-proteinid:NP_002181\n",
+        )
+        table = resolver.get_conversion_table(organism="hsa", target="ncbi-proteinid")
+
+    assert table.to_dict(orient="list") == {"kegg": ["1", "3605"], "ncbi-proteinid": ["NP_570602", "NP_002181"]}
+
+    # Tables cached with target ids in first column are parsed by prefix of ids
+    resolver.storage.save(filename="conv_mmu_uniprot.tsv", data="up:Q61337\tmmu:12043\n")
+    assert resolver.get_conversion_table(organism=ORGANISM, target="uniprot").to_dict(orient="list") == {
+        "kegg": ["12043"],
+        "uniprot": ["Q61337"],
+    }
+
+
+def test_resolver_compressed_storage(resolver: Resolver) -> None:
+    """Testing resolver with compressed storage."""
+    resolver.storage.compression = "zstd"
+
+    with RequestsMock() as mocked_response:
+        mocked_response.add(
+            HTTP_METHOD_GET, url="http://rest.kegg.jp/list/pathway/mmu", body="path:mmu00010\tGlycolysis\n"
+        )
+        mocked_response.add(HTTP_METHOD_GET, url="http://rest.kegg.jp/conv/uniprot/mmu", body="mmu:12043\tup:Q61337\n")
+
+        assert resolver.get_pathway_list(organism=ORGANISM) == {"path:mmu00010": "Glycolysis"}
+        assert resolver.get_conversion_table(organism=ORGANISM, target="uniprot")["uniprot"].tolist() == ["Q61337"]
+
+    # Cached files are loaded
+    assert resolver.get_pathway_list(organism=ORGANISM) == {"path:mmu00010": "Glycolysis"}
+
+
+def test_resolver_sqlite_storage(tmp_path: Path) -> None:
+    """Testing resolver with SQLite storage."""
+    storage: SQLiteStorage = SQLiteStorage(path=str(tmp_path / "cache.sqlite"))
+    resolver: Resolver = Resolver(cache=storage, rate_limiter=RateLimiter(rate=100.0))
+
+    with open(os.path.join(os.path.dirname(__file__), "pathway.kgml"), encoding="utf-8") as file_obj:
+        response_content: str = file_obj.read()
+
+    with RequestsMock() as mocked_response:
+        mocked_response.add(
+            HTTP_METHOD_GET, url="http://rest.kegg.jp/list/pathway/mmu", body="path:mmu04064\tNF-kappa B\n"
+        )
+        mocked_response.add(HTTP_METHOD_GET, url="http://rest.kegg.jp/get/mmu04064/kgml", body=response_content)
+
+        assert resolver.get_pathway_list(organism=ORGANISM) == {"path:mmu04064": "NF-kappa B"}
+        assert resolver.get_pathway(organism=ORGANISM, code="04064").number == "04064"
+
+    # Cached files are loaded from database
+    resolver.pathway_cache.clear()
+    assert resolver.get_pathway(organism=ORGANISM, code="04064").number == "04064"
+    assert storage.exist_many(filenames=["pathway_list_mmu.tsv", "mmu_path04064.kgml"]) == {
+        "pathway_list_mmu.tsv": True,
+        "mmu_path04064.kgml": True,
+    }
+
+    resolver.close()
+    storage.close()
+
+
+def test_get_pathway_image(resolver: Resolver, pathway: Pathway) -> None:
+    """Testing request and caching of prerendered pathway image."""
+    with RequestsMock() as mocked_response:
+        mocked_response.add(
+            HTTP_METHOD_GET,
+            url="http://www.kegg.jp/kegg/pathway/mmu/mmu04064.png",
+            body=PNG_DATA,
+            content_type="image/png",
+        )
+
+        assert resolver.get_pathway_image(pathway=pathway) == PNG_DATA
+
+    # Image is loaded from cache and stored as raw bytes
+    assert resolver.storage.exist("mmu04064_image.png")
+    assert resolver.get_pathway_image(pathway=pathway) == PNG_DATA
+    assert resolver.storage.load_bytes(filename="mmu04064_image.png") == PNG_DATA
+
+    # Images pickled by older versions are not loaded and are requested again
+    resolver.storage.save_dump(filename="mmu04064_image.png", data=_Payload())
+
+    with RequestsMock() as mocked_response:
+        mocked_response.add(
+            HTTP_METHOD_GET,
+            url="http://www.kegg.jp/kegg/pathway/mmu/mmu04064.png",
+            body=PNG_DATA,
+            content_type="image/png",
+        )
+
+        assert resolver.get_pathway_image(pathway=pathway) == PNG_DATA
+        assert len(mocked_response.calls) == 1
+
+    assert _Payload.loaded is False
+    assert resolver.storage.load_bytes(filename="mmu04064_image.png") == PNG_DATA
+
+    # Invalid images of pathways without image url are treated as missing
+    resolver.storage.save_bytes(filename="mmu04064_image.png", data=b"invalid")
+    with pytest.raises(ValueError):
+        resolver.get_pathway_image(pathway=pathway.model_copy(update={"image": None}))
+
+
+def test_prefetch(resolver: Resolver, storage: Storage) -> None:
+    """Testing prefetch of all resources of organism and resume of interrupted runs."""
+    with open(os.path.join(os.path.dirname(__file__), "pathway.kgml"), encoding="utf-8") as file_obj:
+        response_content: str = file_obj.read()
+
+    with RequestsMock() as mocked_response:
+        mocked_response.add(
+            HTTP_METHOD_GET,
+            url="http://rest.kegg.jp/list/pathway/mmu",
+            body="path:mmu04064\tNF-kappa B signaling pathway\npath:mmu01100\tMetabolic pathways\n",
+        )
+        mocked_response.add(HTTP_METHOD_GET, url="http://rest.kegg.jp/list/compound", body="cpd:C00001\tH2O\n")
+        mocked_response.add(HTTP_METHOD_GET, url="http://rest.kegg.jp/list/organism", body="T01002\tmmu\tMouse\n")
+        mocked_response.add(
+            HTTP_METHOD_GET, url="http://rest.kegg.jp/link/pathway/mmu", body="mmu:12043\tpath:mmu04064\n"
+        )
+        mocked_response.add(HTTP_METHOD_GET, url="http://rest.kegg.jp/get/mmu04064/kgml", body=response_content)
+        mocked_response.add(HTTP_METHOD_GET, url="http://rest.kegg.jp/get/mmu01100/kgml", status=404)
+        mocked_response.add(
+            HTTP_METHOD_GET,
+            url="http://www.kegg.jp/kegg/pathway/mmu/mmu04064.png",
+            body=PNG_DATA,
+            content_type="image/png",
+        )
+
+        manifest = resolver.prefetch(organism=ORGANISM, include_images=True)
+
+    # Failed downloads are reported in manifest
+    assert list(manifest["failed"]) == ["mmu_path01100.kgml"]
+    assert set(manifest["files"]) == {
+        "pathway_list_mmu.tsv",
+        "compound.tsv",
+        "organism.tsv",
+        "pathway_genes_mmu.tsv",
+        "mmu_path04064.kgml",
+        "mmu04064_image.png",
+    }
+    assert resolver.storage.exist("prefetch_mmu_manifest.json")
+
+    # Resume only requests missing files. Disable cache of 404 responses to request failed file again.
+    resolver.negative_ttl = None
+
+    with RequestsMock() as mocked_response:
+        mocked_response.add(HTTP_METHOD_GET, url="http://rest.kegg.jp/get/mmu01100/kgml", body=response_content)
+
+        manifest = resolver.prefetch(organism=ORGANISM)
+
+        assert len(mocked_response.calls) == 1
+
+    assert manifest["failed"] == {} and "mmu_path01100.kgml" in manifest["files"]
+
+    # Files of a warm cache without journal are kept if they match their recorded checksum
+    storage.remove(filename="prefetch_mmu.journal")
+
+    with open(storage.build_cache_path(filename="compound.tsv"), "r+b") as f_obj:
+        f_obj.truncate(5)
+
+    with RequestsMock() as mocked_response:
+        mocked_response.add(HTTP_METHOD_GET, url="http://rest.kegg.jp/list/compound", body="cpd:C00001\tH2O\n")
+        mocked_response.add(
+            HTTP_METHOD_GET,
+            url="http://www.kegg.jp/kegg/pathway/mmu/mmu04064.png",
+            body=PNG_DATA,
+            content_type="image/png",
+        )
+
+        manifest = resolver.prefetch(organism=ORGANISM, include_images=True)
+
+        # Only the truncated list and the image of the pathway fetched by the previous run are requested
+        assert [call.request.url for call in mocked_response.calls] == [
+            "http://rest.kegg.jp/list/compound",
+            "http://www.kegg.jp/kegg/pathway/mmu/mmu04064.png",
+        ]
+
+    assert manifest["failed"] == {} and {"mmu04064_image.png", "mmu01100_image.png"} <= set(manifest["files"])
+    assert resolver.get_compounds() == {"cpd:C00001": "H2O"}
+
+
+def test_resolver_repair(resolver: Resolver, storage: Storage) -> None:
+    """Testing verification and request of corrupt cached files."""
+    testing_url: str = "http://rest.kegg.jp/list/compound"
+
+    with RequestsMock() as mocked_response:
+        mocked_response.add(HTTP_METHOD_GET, url=testing_url, body="cpd:C00001\tH2O\ncpd:C00002\tATP\n")
+        assert resolver.get_compounds() == {"cpd:C00001": "H2O", "cpd:C00002": "ATP"}
+
+    # Truncate cached file
+    with open(storage.build_cache_path(filename="compound.tsv"), "r+b") as f_obj:
+        f_obj.truncate(10)
+
+    with RequestsMock() as mocked_response:
+        mocked_response.add(HTTP_METHOD_GET, url=testing_url, body="cpd:C00001\tH2O\ncpd:C00002\tATP\n")
+        report = resolver.repair()
+
+    assert report["refetched"] == ["compound.tsv"] and report["failed"] == {}
+    assert resolver.get_compounds() == {"cpd:C00001": "H2O", "cpd:C00002": "ATP"}
+    assert resolver.repair()["corrupt"] == {}
+
+
+def test_resolver_revalidation(storage: Storage) -> None:
+    """Testing expiry and conditional revalidation of cached files."""
+    testing_url: str = "http://rest.kegg.jp/list/compound"
+
+    resolver: Resolver = Resolver(cache=storage, ttl={"list": 60.0}, rate_limiter=RateLimiter(rate=100.0))
+
+    with RequestsMock() as mocked_response:
+        mocked_response.add(HTTP_METHOD_GET, url=testing_url, body="cpd:C00001\tH2O\n", headers={"ETag": '"v1"'})
+
+        assert resolver.get_compounds() == {"cpd:C00001": "H2O"}
+
+        # File is within time to live
+        assert resolver.get_compounds() == {"cpd:C00001": "H2O"}
+        assert len(mocked_response.calls) == 1
+
+    meta = storage.load_meta(filename="compound.tsv")
+    assert meta is not None and meta["etag"] == '"v1"'
+
+    # Expire cached file
+    storage.save_meta(filename="compound.tsv", meta={**meta, "fetched_at": meta["fetched_at"] - 120})
+
+    with RequestsMock() as mocked_response:
+        mocked_response.add(HTTP_METHOD_GET, url=testing_url, status=304)
+
+        # File is not modified and loaded from cache
+        assert resolver.get_compounds() == {"cpd:C00001": "H2O"}
+        assert mocked_response.calls[0].request.headers["If-None-Match"] == '"v1"'
+
+    # Time of last fetch is updated after revalidation
+    assert resolver._is_fresh(filename="compound.tsv") is True
+
+    storage.save_meta(filename="compound.tsv", meta={**meta, "fetched_at": meta["fetched_at"] - 120})
+
+    with RequestsMock() as mocked_response:
+        mocked_response.add(HTTP_METHOD_GET, url=testing_url, body="cpd:C00002\tATP\n", headers={"ETag": '"v2"'})
+
+        # Modified file is downloaded again
+        assert resolver.get_compounds() == {"cpd:C00002": "ATP"}
+
+    # Expired file is served if it could not be revalidated
+    meta = storage.load_meta(filename="compound.tsv")
+    assert meta is not None
+    storage.save_meta(filename="compound.tsv", meta={**meta, "fetched_at": meta["fetched_at"] - 120})
+
+    for error in (requests.ConnectionError("offline"), requests.HTTPError("503 Server Error")):
+        with RequestsMock() as mocked_response:
+            mocked_response.add(HTTP_METHOD_GET, url=testing_url, body=error)
+
+            with pytest.warns(UserWarning, match="expired cached copy"):
+                assert resolver.get_compounds() == {"cpd:C00002": "ATP"}
+
+        # File is revalidated again by the next call
+        assert resolver._is_fresh(filename="compound.tsv") is False
+
+    with RequestsMock() as mocked_response:
+        mocked_response.add(HTTP_METHOD_GET, url=testing_url, status=503)
+
+        with pytest.warns(UserWarning, match="expired cached copy"):
+            assert resolver.get_compounds() == {"cpd:C00002": "ATP"}
+
+
+def test_resolver_negative_cache(resolver: Resolver) -> None:
+    """Testing cache of missing resources."""
+    with RequestsMock() as mocked_response:
+        mocked_response.add(HTTP_METHOD_GET, url="http://rest.kegg.jp/get/mmu99999/kgml", status=404)
+
+        with pytest.raises(requests.HTTPError):
+            resolver.get_pathway(organism=ORGANISM, code="99999")
+
+        # Missing resource is not requested again
+        with pytest.raises(requests.HTTPError):
+            resolver.get_pathway(organism=ORGANISM, code="99999")
+
+        assert len(mocked_response.calls) == 1
@@ -1,10 +1,15 @@
 """Testing storage module."""
 
+import multiprocessing
 import os
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
-from keggtools.storage import Storage
+from keggtools.storage import BaseStorage, SQLiteStorage, Storage, detect_compression
 
 from .conftest import CACHEDIR
 
@@ -25,6 +30,10 @@ def test_storage() -> None:
     # Cleanup
     os.rmdir(CACHEDIR)
 
+    # Backends must implement the primitives of the interface
+    with pytest.raises(TypeError):
+        BaseStorage()  # ty: ignore[call-non-callable]
+
 
 def test_cachedir_default() -> None:
     """Testing storage cachedir default fallback."""
@@ -69,6 +78,13 @@ def test_cache_readwrite(storage: Storage) -> None:
     )
     assert storage.load_dump(filename=testing_filename) == testing_payload
 
+    # Testing append and removal of file
+    storage.remove(filename=testing_filename)
+    assert storage.exist(testing_filename) is False
+    storage.append(filename=testing_filename, data="hello ")
+    storage.append(filename=testing_filename, data="world!")
+    assert storage.load(filename=testing_filename) == testing_payload
+
     # Testing loading of none existing files
 
     with pytest.raises(FileNotFoundError):
@@ -76,3 +92,483 @@ def test_cache_readwrite(storage: Storage) -> None:
 
     with pytest.raises(FileNotFoundError):
         storage.load_dump("invalid.txt")
+
+
+def test_cache_lock(storage: Storage) -> None:
+    """Testing exclusive file lock of storage."""
+    events: list[str] = []
+
+    def locked_writer() -> None:
+        with storage.lock(filename="test.txt"):
+            events.append("thread")
+
+    with storage.lock(filename="test.txt"):
+        # Lock is reentrant within a thread
+        with storage.lock(filename="test.txt"):
+            thread = threading.Thread(target=locked_writer)
+            thread.start()
+            time.sleep(0.1)
+
+            # Second thread waits for the lock
+            events.append("main")
+
+    thread.join()
+    assert events == ["main", "thread"]
+
+    # Lock files are hidden in cache folder and are shared by files
+    assert storage.exist("test.txt") is False
+
+    for index in range(500):
+        with storage.lock(filename=f"file{index}.kgml"):
+            pass
+
+    lock_files: list[str] = [name for name in os.listdir(CACHEDIR) if name.endswith(".lock")]
+    assert 0 < len(lock_files) <= Storage.LOCK_STRIPES and all(name.startswith(".stripe-") for name in lock_files)
+    assert len(storage._locks) <= Storage.LOCK_STRIPES
+
+
+def test_cache_atomic_write(storage: Storage) -> None:
+    """Testing concurrent writers and lock-free readers of a file."""
+    versions: list[str] = [str(index) * 100_000 for index in range(4)]
+    storage.save(filename="test.kgml", data=versions[0])
+
+    errors: list[str] = []
+
+    def writer(data: str) -> None:
+        for _ in range(20):
+            storage.save(filename="test.kgml", data=data)
+
+    def reader() -> None:
+        for _ in range(50):
+            # Readers only see complete versions of file
+            if storage.load(filename="test.kgml") not in versions:
+                errors.append("partial read")
+
+    threads: list[threading.Thread] = [threading.Thread(target=writer, args=(data,)) for data in versions]
+    threads += [threading.Thread(target=reader) for _ in range(4)]
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+
+    # No temporary files are left
+    assert not any(filename.endswith(".tmp") for filename in os.listdir(CACHEDIR))
+
+    # Failed write keeps previous version of file
+    class Unpicklable:
+        def __reduce__(self):
+            raise TypeError("not picklable")
+
+    with pytest.raises(TypeError):
+        storage.save_dump(filename="test.kgml", data=Unpicklable())
+
+    assert storage.load(filename="test.kgml") in versions
+
+
+def test_cache_meta(storage: Storage) -> None:
+    """Testing metadata of cached files."""
+    assert storage.load_meta(filename="test.txt") is None
+
+    storage.save(filename="test.txt", data="hello world!")
+    storage.save_meta(filename="test.txt", meta={"etag": "abc"})
+
+    assert storage.load_meta(filename="test.txt") == {"etag": "abc"}
+    assert storage.mtime(filename="test.txt") > 0
+
+    # Metadata is removed with file
+    storage.remove(filename="test.txt")
+    assert storage.load_meta(filename="test.txt") is None
+
+
+def test_cache_stream(storage: Storage) -> None:
+    """Testing streamed saving and line by line loading of files."""
+    assert storage.save_stream(
+        filename="test.tsv", chunks=iter([b"key1\tva", b"lue1\nkey2\tvalue2\n"])
+    ) == os.path.join(CACHEDIR, "test.tsv")
+
+    assert list(storage.iter_lines(filename="test.tsv")) == ["key1\tvalue1", "key2\tvalue2"]
+
+    # Failed stream does not leave a file in cache
+    def failing_stream():
+        yield b"partial"
+        raise OSError("connection lost")
+
+    with pytest.raises(OSError):
+        storage.save_stream(filename="failed.tsv", chunks=failing_stream())
+
+    assert storage.exist("failed.tsv") is False
+    assert [filename for filename in os.listdir(CACHEDIR) if not filename.startswith(".")] == ["test.tsv"]
+
+    with pytest.raises(FileNotFoundError):
+        list(storage.iter_lines(filename="invalid.tsv"))
+
+
+@pytest.mark.parametrize("compression", ["gzip", "zstd"])
+def test_cache_compression(storage: Storage, compression: str) -> None:
+    """Testing transparent compression of files."""
+    storage.compression = compression
+
+    data: str = "<pathway>" + "<entry/>" * 1000 + "</pathway>"
+    storage.save(filename="test.kgml", data=data)
+
+    # File is compressed on disk
+    with open(storage.build_cache_path(filename="test.kgml"), "rb") as f_obj:
+        assert detect_compression(f_obj.read(4)) == compression
+    assert os.path.getsize(storage.build_cache_path(filename="test.kgml")) < len(data) / 10
+
+    assert storage.load(filename="test.kgml") == data
+
+    # Streams, dumps and appended lines are compressed
+    storage.save_stream(filename="stream.txt", chunks=[b"line1\n", b"line2\n"])
+    storage.append(filename="stream.txt", data="line3\n")
+    assert list(storage.iter_lines(filename="stream.txt")) == ["line1", "line2", "line3"]
+
+    storage.save_dump(filename="dump.pickle", data={"a": b"bytes"})
+    assert storage.load_dump(filename="dump.pickle") == {"a": b"bytes"}
+
+    # Uncompressed files are loaded from compressed storage
+    Storage(cachedir=CACHEDIR).save(filename="plain.txt", data="plain")
+    assert storage.load(filename="plain.txt") == "plain"
+
+    with pytest.raises(ValueError):
+        Storage(cachedir=CACHEDIR, compression="invalid")
+
+
+def test_cache_migrate(storage: Storage) -> None:
+    """Testing migration of cache to compression format."""
+    storage.save(filename="test.kgml", data="<pathway/>" * 100)
+    storage.save_meta(filename="test.kgml", meta={"status": 200})
+
+    with storage.lock(filename="test.kgml"):
+        pass
+
+    stats = storage.migrate(compression="gzip")
+
+    # Lock files are skipped
+    assert stats["files"] == 2 and stats["migrated"] == 2
+    assert stats["size_after"] < stats["size_before"]
+
+    assert storage.load(filename="test.kgml") == "<pathway/>" * 100
+    assert storage.load_meta(filename="test.kgml") == {"status": 200}
+
+    # Files in target format are not converted again
+    assert storage.migrate(compression="gzip")["migrated"] == 0
+
+    # Decompress cache
+    storage.migrate(compression=None)
+    with open(storage.build_cache_path(filename="test.kgml"), encoding="utf-8") as f_obj:
+        assert f_obj.read() == "<pathway/>" * 100
+
+
+def test_cache_manifest(storage: Storage) -> None:
+    """Testing lookups of files with manifest of cache folder."""
+    storage.save(filename="known.txt", data="known")
+
+    # Manifest is loaded on first lookup
+    assert storage.exist(filename="known.txt") is True
+
+    # Known files are looked up without access to file system
+    with patch("os.path.isfile", side_effect=AssertionError), patch("os.stat", side_effect=AssertionError):
+        assert storage.exist(filename="known.txt") is True
+        assert storage.exist_many(filenames=["known.txt"]) == {"known.txt": True}
+
+    # Time of modification is read from disk, so files changed by other processes are seen
+    mtime: float = storage.mtime(filename="known.txt")
+    os.utime(storage.build_cache_path(filename="known.txt"), (mtime + 10, mtime + 10))
+    assert storage.mtime(filename="known.txt") == mtime + 10
+
+    # Files written by other processes are found on disk
+    with open(os.path.join(CACHEDIR, "external.txt"), "w", encoding="utf-8") as f_obj:
+        f_obj.write("external")
+    assert storage.exist(filename="external.txt") is True
+
+    # Files removed by other processes are dropped from manifest when loaded
+    os.remove(os.path.join(CACHEDIR, "external.txt"))
+    assert storage.exist(filename="external.txt") is True
+    with pytest.raises(FileNotFoundError):
+        storage.load(filename="external.txt")
+    assert storage.exist(filename="external.txt") is False
+
+    storage.save(filename="external.txt", data="external")
+    os.remove(os.path.join(CACHEDIR, "external.txt"))
+    with pytest.raises(FileNotFoundError):
+        storage.mtime(filename="external.txt")
+    assert storage.exist(filename="external.txt") is False
+
+    # Manifest is reloaded from cache folder
+    os.remove(os.path.join(CACHEDIR, "known.txt"))
+    storage.refresh()
+    assert storage.exist(filename="known.txt") is False
+
+    storage.remove(filename="missing.txt")
+    assert Storage(cachedir=CACHEDIR, manifest=False).exist(filename="known.txt") is False
+
+
+@pytest.mark.parametrize("compression", [None, "zstd"])
+def test_cache_verify(storage: Storage, compression: str | None) -> None:
+    """Testing verification of files against checksums recorded at write time."""
+    storage.compression = compression
+
+    storage.save(filename="truncated.kgml", data="<pathway/>" * 100)
+    storage.save_stream(filename="damaged.tsv", chunks=[b"a\tb\n"] * 100)
+    storage.save_meta(filename="damaged.tsv", meta={"url": "http://rest.kegg.jp/list/compound"})
+    storage.save_bytes(filename="valid.png", data=b"\x89PNG", raw=True)
+    storage.append(filename="journal.txt", data="line\n")
+
+    # Damage files after they were written
+    with open(storage.build_cache_path(filename="truncated.kgml"), "r+b") as f_obj:
+        f_obj.truncate(10)
+    with open(storage.build_cache_path(filename="damaged.tsv"), "r+b") as f_obj:
+        f_obj.seek(-1, os.SEEK_END)
+        f_obj.write(b"\x00" if f_obj.read(1) != b"\x00" else b"\x01")
+
+    report = storage.verify(workers=2)
+    assert report["checked"] == 3 and report["valid"] == 1
+    assert set(report["corrupt"]) == {"truncated.kgml", "damaged.tsv"}
+    assert "Size" in report["corrupt"]["truncated.kgml"]
+    assert report["unverified"] == ["journal.txt"] and report["quarantined"] == []
+
+    # Corrupt files are moved out of the way, metadata is kept
+    report = storage.verify(quarantine=True)
+    assert sorted(report["quarantined"]) == ["damaged.tsv", "truncated.kgml"]
+    assert storage.exist(filename="damaged.tsv") is False
+    assert os.path.isfile(storage.build_cache_path(filename=".damaged.tsv.corrupt"))
+    assert storage.load_meta(filename="damaged.tsv") == {"url": "http://rest.kegg.jp/list/compound"}
+
+    # Journals of checksums are compacted
+    assert storage.verify()["corrupt"] == {}
+    journals: list[str] = sorted(name for name in os.listdir(CACHEDIR) if name.startswith(".checksums."))
+    records: list[str] = []
+    for journal in journals:
+        with open(storage.build_cache_path(filename=journal), encoding="utf-8") as f_obj:
+            records.extend(line.split("\t")[0] for line in f_obj)
+    assert records == ["valid.png"]
+
+    # Write interrupted after replacement of a file leaves the file unverified instead of corrupt
+    with patch.object(storage, "_manifest_update", side_effect=OSError("Interrupted")):
+        with pytest.raises(OSError):
+            storage.save_bytes(filename="valid.png", data=b"\x89PNG-new", raw=True)
+
+    assert storage.load_bytes(filename="valid.png") == b"\x89PNG-new"
+    report = storage.verify()
+    assert report["corrupt"] == {} and report["unverified"] == ["journal.txt", "valid.png"]
+
+
+@pytest.mark.parametrize("compression", [None, "gzip"])
+def test_cache_bytes(storage: Storage, compression: str | None) -> None:
+    """Testing binary files and read-only buffers."""
+    storage.compression = compression
+    data: bytes = b"\x89PNG\r\n\x1a\n" + bytes(range(256))
+
+    storage.save_bytes(filename="image.png", data=data)
+    assert storage.load_bytes(filename="image.png") == data
+
+    with storage.open_buffer(filename="image.png") as buffer:
+        assert buffer.readonly is True
+        assert buffer.tobytes() == data
+
+    # Raw files are stored uncompressed
+    storage.save_bytes(filename="raw.png", data=data, raw=True)
+    with open(storage.build_cache_path(filename="raw.png"), "rb") as f_obj:
+        assert f_obj.read() == data
+
+    storage.save_bytes(filename="empty.png", data=b"", raw=True)
+    with storage.open_buffer(filename="empty.png") as buffer:
+        assert len(buffer) == 0
+
+    with pytest.raises(FileNotFoundError):
+        with storage.open_buffer(filename="missing.png"):
+            pass
+
+
+def test_cache_budget(storage: Storage) -> None:
+    """Testing eviction of least recently used files if byte budget is exceeded."""
+    capped: Storage = Storage(cachedir=CACHEDIR, max_size=350)
+
+    capped.save(filename="organism.tsv", data="o" * 100)
+    capped.save(filename="a.kgml", data="a" * 100)
+    capped.save(filename="b.kgml", data="b" * 100)
+
+    # Lookup marks file as recently used
+    assert capped.exist(filename="a.kgml") is True
+    assert capped.exist(filename="missing.kgml") is False
+
+    # Least recently used file is evicted, pinned file is kept
+    capped.save(filename="c.kgml", data="c" * 100)
+    assert capped.exist_many(filenames=["organism.tsv", "a.kgml", "b.kgml", "c.kgml"]) == {
+        "organism.tsv": True,
+        "a.kgml": True,
+        "b.kgml": False,
+        "c.kgml": True,
+    }
+
+    # Files locked by other writers are skipped
+    with capped.lock(filename="a.kgml"):
+        writer: threading.Thread = threading.Thread(
+            target=capped.save, kwargs={"filename": "d.kgml", "data": "d" * 100}
+        )
+        writer.start()
+        writer.join()
+    assert capped.exist(filename="a.kgml") is True and capped.exist(filename="c.kgml") is False
+
+    stats = capped.stats()
+    assert stats["entries"] == 3 and stats["size"] == 300
+    assert stats["evictions"] == 2
+    assert stats["hits"] == 5 and stats["misses"] == 3
+    assert stats["classes"] == {"list": {"entries": 1, "size": 100}, "kgml": {"entries": 2, "size": 200}}
+
+    # Usage index of new instance is built from files in cache folder
+    assert Storage(cachedir=CACHEDIR).stats()["size"] == 300
+
+
+def test_cache_budget_per_class(storage: Storage) -> None:
+    """Testing eviction of least frequently used files with byte budget per resource class."""
+    capped: Storage = Storage(cachedir=CACHEDIR, max_size={"image": 200}, eviction="lfu")
+
+    capped.save_dump(filename="a.png", data=b"a" * 80)
+    capped.save_dump(filename="b.png", data=b"b" * 80)
+    capped.save(filename="list.tsv", data="l" * 500)
+
+    # Frequently used file is kept even if not used recently
+    for _ in range(3):
+        capped.load_dump(filename="a.png")
+    capped.load_dump(filename="b.png")
+
+    capped.save_dump(filename="c.png", data=b"c" * 80)
+    assert capped.exist(filename="a.png") is True and capped.exist(filename="b.png") is False
+    assert capped.exist(filename="list.tsv") is True
+
+    with pytest.raises(ValueError):
+        Storage(cachedir=CACHEDIR, eviction="fifo")  # type: ignore[arg-type]
+
+
+def test_cache_derived_files(storage: Storage) -> None:
+    """Testing removal of snapshots together with their KGML file."""
+    for name in ("a", "b", "c"):
+        storage.save(filename=f"{name}.kgml", data=name * 100)
+        storage.save(filename=f"{name}.kgml.snapshot", data=name * 100)
+
+    storage.remove(filename="a.kgml")
+    assert storage.exist(filename="a.kgml.snapshot") is False
+
+    # Snapshot of quarantined file is removed
+    with open(storage.build_cache_path(filename="b.kgml"), "r+b") as f_obj:
+        f_obj.truncate(10)
+    assert storage.verify(quarantine=True)["quarantined"] == ["b.kgml"]
+    assert storage.exist(filename="b.kgml.snapshot") is False
+
+    # Snapshot of evicted file is removed
+    capped: Storage = Storage(cachedir=CACHEDIR, max_size=250)
+    assert capped.exist(filename="c.kgml.snapshot") is True
+    capped.save(filename="d.kgml", data="d" * 100)
+    assert capped.exist_many(filenames=["c.kgml", "c.kgml.snapshot", "d.kgml"]) == {
+        "c.kgml": False,
+        "c.kgml.snapshot": False,
+        "d.kgml": True,
+    }
+
+    # Files without derived files are removed alone
+    storage.save(filename="d.tsv.snapshot", data="d")
+    storage.remove(filename="d.tsv")
+    assert storage.exist(filename="d.tsv.snapshot") is True
+
+
+def _sqlite_append(path: str, index: int) -> None:
+    """Append lines to file in SQLite storage from another process."""
+    storage: SQLiteStorage = SQLiteStorage(path=path)
+    for line in range(20):
+        storage.append(filename="log.txt", data=f"{index}-{line}\n")
+    storage.close()
+
+
+@pytest.mark.parametrize("compression", [None, "gzip"])
+def test_sqlite_storage(tmp_path: Path, compression: str | None) -> None:
+    """Testing storage of files in SQLite database."""
+    storage: SQLiteStorage = SQLiteStorage(path=str(tmp_path / "cache.sqlite"), compression=compression)
+
+    assert storage.exist(filename="test.txt") is False
+    with pytest.raises(FileNotFoundError):
+        storage.load(filename="test.txt")
+
+    storage.save(filename="test.txt", data="content")
+    assert storage.exist(filename="test.txt") is True
+    assert storage.load(filename="test.txt") == "content"
+    assert storage.mtime(filename="test.txt") <= time.time()
+    assert storage.size(filename="test.txt") > 0
+
+    # Streams, appended lines and dumps
+    storage.save_stream(filename="stream.txt", chunks=[b"line1\n", b"line2\n"])
+    storage.append(filename="stream.txt", data="line3\n")
+    assert list(storage.iter_lines(filename="stream.txt")) == ["line1", "line2", "line3"]
+
+    storage.save_dump(filename="dump.pickle", data={"a": b"bytes"})
+    assert storage.load_dump(filename="dump.pickle") == {"a": b"bytes"}
+
+    storage.save_bytes(filename="image.png", data=b"\x89PNG", raw=True)
+    with storage.open_buffer(filename="image.png") as buffer:
+        assert buffer.tobytes() == b"\x89PNG"
+    storage.remove(filename="image.png")
+
+    storage.save_meta(filename="test.txt", meta={"status": 200})
+    assert storage.load_meta(filename="test.txt") == {"status": 200}
+
+    # Bulk lookups
+    assert storage.stats()["entries"] == 3
+    assert storage.exist_many(filenames=["test.txt", "missing.txt"]) == {"test.txt": True, "missing.txt": False}
+    assert storage.load_many(filenames=["test.txt", "stream.txt", "missing.txt"]) == {
+        "test.txt": "content",
+        "stream.txt": "line1\nline2\nline3\n",
+    }
+
+    # Damaged entries are quarantined
+    storage._connection().execute("UPDATE files SET data = X'00' WHERE name = 'dump.pickle'")
+    report = storage.verify(quarantine=True)
+    assert report["quarantined"] == ["dump.pickle"] and report["valid"] == 2
+    assert storage.exist(filename="dump.pickle") is False
+
+    # File and metadata are removed
+    storage.save(filename="test.kgml", data="<pathway/>")
+    storage.save(filename="test.kgml.snapshot", data="{}")
+    storage.remove(filename="test.kgml")
+    assert storage.exist(filename="test.kgml.snapshot") is False
+
+    storage.remove(filename="test.txt")
+    assert storage.exist(filename="test.txt") is False and storage.load_meta(filename="test.txt") is None
+
+    # Files are persisted in database
+    storage.close()
+    reopened: SQLiteStorage = SQLiteStorage(path=storage.path)
+    assert reopened.load(filename="stream.txt") == "line1\nline2\nline3\n"
+    reopened.close()
+
+
+def test_sqlite_storage_concurrency(tmp_path: Path) -> None:
+    """Testing concurrent writers in threads and processes of SQLite storage."""
+    path: str = str(tmp_path / "cache.sqlite")
+    storage: SQLiteStorage = SQLiteStorage(path=path)
+
+    threads: list[threading.Thread] = [
+        threading.Thread(target=lambda index=index: storage.save(filename=f"file{index}", data=str(index)))
+        for index in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert storage.load_many(filenames=[f"file{index}" for index in range(8)]) == {
+        f"file{index}": str(index) for index in range(8)
+    }
+
+    # Appends of processes are serialized by file lock
+    processes = [multiprocessing.get_context("spawn").Process(target=_sqlite_append, args=(path, i)) for i in range(3)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    assert len(list(storage.iter_lines(filename="log.txt"))) == 60
+    storage.close()
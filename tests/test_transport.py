@@ -0,0 +1,130 @@
+"""Testing transport module."""
+
+import os
+from pathlib import Path
+
+import pytest
+import requests
+from responses import GET as HTTP_METHOD_GET
+from responses import RequestsMock
+
+from keggtools.models import Pathway
+from keggtools.ratelimit import RateLimiter
+from keggtools.resolver import Resolver
+from keggtools.storage import Storage
+from keggtools.transport import LocalTransport, RecordingTransport, Transport, build_response, url_to_path
+
+from .conftest import ORGANISM
+
+
+def build_fixture_tree(root: str) -> None:
+    """Build directory tree of KEGG REST urls."""
+    with open(os.path.join(os.path.dirname(__file__), "pathway.kgml"), encoding="utf-8") as file_obj:
+        kgml: str = file_obj.read()
+
+    for url, content in (
+        ("http://rest.kegg.jp/get/mmu04064/kgml", kgml),
+        ("http://rest.kegg.jp/list/pathway/mmu", "path:mmu04064\tNF-kappa B signaling pathway\n"),
+    ):
+        path: str = url_to_path(root=root, url=url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file_obj:
+            file_obj.write(content)
+
+
+def test_url_to_path() -> None:
+    """Testing mapping of url to directory tree."""
+    assert url_to_path(root="root", url="http://rest.kegg.jp/get/mmu04064/kgml") == os.path.join(
+        "root", "rest.kegg.jp", "get", "mmu04064", "kgml"
+    )
+    assert url_to_path(root="root", url="http://rest.kegg.jp/list/mmu:11797+mmu:22033") == os.path.join(
+        "root", "rest.kegg.jp", "list", "mmu%3A11797+mmu%3A22033"
+    )
+
+
+def test_build_response() -> None:
+    """Testing response generation."""
+    response: requests.Response = build_response(url="http://example.com", status_code=200, content=b"hello world!")
+
+    assert response.text == "hello world!"
+    assert b"".join(response.iter_content(chunk_size=4)) == b"hello world!"
+
+    with pytest.raises(requests.HTTPError):
+        build_response(url="http://example.com", status_code=404).raise_for_status()
+
+
+def test_transport_interface() -> None:
+    """Testing base class of transports."""
+    with pytest.raises(TypeError):
+        Transport()  # ty: ignore[call-non-callable]
+
+
+def test_local_transport(storage: Storage, tmp_path: Path) -> None:
+    """Testing resolver with local transport."""
+    root: str = str(tmp_path / "tree")
+    build_fixture_tree(root=root)
+
+    transport: LocalTransport = LocalTransport(root=root)
+    resolver: Resolver = Resolver(cache=storage, transport=transport, rate_limiter=RateLimiter(rate=100.0))
+
+    assert resolver.get_pathway_list(organism=ORGANISM) == {"path:mmu04064": "NF-kappa B signaling pathway"}
+    assert isinstance(resolver.get_pathway(organism=ORGANISM, code="04064"), Pathway)
+    assert transport.request_count == 2
+
+    # Missing files are answered with 404
+    with pytest.raises(requests.HTTPError):
+        resolver.get_compounds()
+
+    # Resolver without HTTP transport has no session
+    with pytest.raises(TypeError):
+        _ = resolver.session
+
+    with pytest.raises(NotADirectoryError):
+        LocalTransport(root=str(tmp_path / "invalid"))
+
+
+def test_local_transport_failures(storage: Storage, tmp_path: Path) -> None:
+    """Testing injected failures and latency of local transport."""
+    root: str = str(tmp_path / "tree")
+    build_fixture_tree(root=root)
+
+    rate_limiter: RateLimiter = RateLimiter(rate=100.0)
+    transport: LocalTransport = LocalTransport(root=root, failure_rate=1.0, failure_status=503, latency=0.01)
+    resolver: Resolver = Resolver(
+        cache=storage, transport=transport, retries=2, backoff_factor=0, rate_limiter=rate_limiter
+    )
+
+    # All attempts fail and throttle the rate limiter
+    with pytest.raises(requests.HTTPError):
+        resolver.get_pathway_list(organism=ORGANISM)
+
+    assert transport.request_count == 3
+    assert rate_limiter.rate < 100.0
+
+
+def test_recording_transport(storage: Storage, tmp_path: Path) -> None:
+    """Testing recording and replay of requests."""
+    root: str = str(tmp_path / "recording")
+
+    recording_resolver: Resolver = Resolver(
+        cache=str(tmp_path / "cache"),
+        transport=RecordingTransport(root=root),
+        rate_limiter=RateLimiter(rate=100.0),
+    )
+
+    with RequestsMock() as mocked_response:
+        mocked_response.add(HTTP_METHOD_GET, url="http://rest.kegg.jp/list/compound", body="cpd:C00001\tH2O\n")
+        mocked_response.add(HTTP_METHOD_GET, url="http://rest.kegg.jp/list/organism", status=404)
+
+        assert recording_resolver.get_compounds() == {"cpd:C00001": "H2O"}
+
+        with pytest.raises(requests.HTTPError):
+            recording_resolver.get_organism_list()
+
+    # Only successful responses are recorded
+    assert os.path.isfile(os.path.join(root, "rest.kegg.jp", "list", "compound"))
+    assert not os.path.isfile(os.path.join(root, "rest.kegg.jp", "list", "organism"))
+
+    # Replay recorded response
+    replay_resolver: Resolver = Resolver(cache=storage, transport=LocalTransport(root=root))
+    assert replay_resolver.get_compounds() == {"cpd:C00001": "H2O"}
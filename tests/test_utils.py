@@ -9,6 +9,8 @@ from keggtools.utils import (
     is_valid_pathway_name,
     is_valid_pathway_number,
     is_valid_pathway_org,
+    iter_tsv_pairs,
+    merge_kegg_geneid,
     msig_to_kegg_id,
     parse_tsv,
     parse_tsv_to_dict,
@@ -62,6 +64,11 @@ def test_parse_tsv() -> None:
     assert parsed_dict["header1"] == "header2"
     assert parsed_dict["item3"] == "item4"
 
+    # Test parsing line by line
+    assert list(iter_tsv_pairs(lines=["item1\titem2\titem3", "", "item4"], col_keys=0, col_values=2)) == [
+        ("item1", "item3")
+    ]
+
 
 def test_valid_pathway_org() -> None:
     """Testing org code validation function."""
@@ -75,6 +82,11 @@ def test_valid_pathway_org() -> None:
     assert is_valid_pathway_org(value="") is False
     assert is_valid_pathway_org(value="hsaa") is False
 
+    # Testing with list of known organisms
+    assert is_valid_pathway_org(value="hsa", organisms={"hsa", "mmu"})
+    assert is_valid_pathway_org(value="ko", organisms={"hsa", "mmu"})
+    assert is_valid_pathway_org(value="abc", organisms={"hsa", "mmu"}) is False
+
 
 def test_valid_pathway_name() -> None:
     """Testing validation for combined pathway name."""
@@ -135,6 +147,19 @@ def test_valid_gene_name() -> None:
 #     assert merged_df[merged_df["names"] == "IL17A"]["entrez"].values[0] == "3605"
 
 
+def test_merge_kegg_geneid() -> None:
+    """Testing merge of KEGG gene id to differential expression dataframe."""
+    diffexp_df: pd.DataFrame = pd.DataFrame({"names": ["IL17A", "A1BG", "UNKNOWN"], "logfc": [2.0, -1.0, 0.5]})
+    symbols_df: pd.DataFrame = pd.DataFrame({"kegg": ["1", "3605", "3605"], "symbol": ["A1BG", "IL17A", "IL17A"]})
+
+    merged_df: pd.DataFrame = merge_kegg_geneid(diffexp=diffexp_df, conversion=symbols_df)
+
+    assert merged_df.to_dict(orient="list") == {"names": ["IL17A", "A1BG"], "logfc": [2.0, -1.0], "kegg": ["3605", "1"]}
+
+    # Keep genes without KEGG id
+    assert len(merge_kegg_geneid(diffexp=diffexp_df, conversion=symbols_df, how="left")) == 3
+
+
 def test_msig_to_kegg_id() -> None:
     """Testing msig to kegg id."""
 